@@ -1,19 +1,88 @@
+import asyncio
+import time
 import streamlit as st
+from src.client.profile_panel import render_profile_panel, start_profile_panel
 from src.services.alumni_services import AlumniService, AlumniError
+from src.services.async_services import AsyncAlumniService, AsyncMentorshipServices
 from src.services.event_services import EventService, EventError
 from src.services.mentorship_services import MentorshipServices, MentorshipError
 
 st.set_page_config(page_title="🎓 Alumni Portal", layout="wide")
 st.title("🎓 Alumni Portal — Alumni Network System")
 
-alumni_service = AlumniService()
-event_service = EventService()
-mentorship_service = MentorshipServices()
+# Streamlit reruns this script on every interaction: build the services once per process
+# and cache list results briefly. Forms clear exactly the loader their write affects.
+LIST_TTL_SECONDS = 30
+
+
+@st.cache_resource
+def get_services():
+    alumni, events, mentorship = AlumniService(), EventService(), MentorshipServices()
+    directory = AsyncAlumniService(alumni, AsyncMentorshipServices(mentorship))
+    return alumni, events, mentorship, directory
+
+
+alumni_service, event_service, mentorship_service, directory_service = get_services()
+profiling = start_profile_panel()
+
+
+# The directory lists are cached one per loader. ``_rows`` (not part of the cache key) seeds
+# a loader with rows fetched by prefetch_directory.
+@st.cache_data(ttl=LIST_TTL_SECONDS, show_spinner=False)
+def load_alumni(_rows=None):
+    rows = alumni_service.list_alumni() if _rows is None else _rows
+    directory_fills()["alumni"] = time.monotonic()
+    return rows
+
+
+@st.cache_data(ttl=LIST_TTL_SECONDS, show_spinner=False)
+def load_events(_rows=None):
+    rows = alumni_service.search_events() if _rows is None else _rows
+    directory_fills()["events"] = time.monotonic()
+    return rows
+
+
+@st.cache_data(ttl=LIST_TTL_SECONDS, show_spinner=False)
+def load_mentors(_rows=None):
+    rows = mentorship_service.list_mentor_views() if _rows is None else _rows
+    directory_fills()["mentors"] = time.monotonic()
+    return rows
+
+
+DIRECTORY_LOADERS = {"alumni": load_alumni, "events": load_events, "mentors": load_mentors}
+
+
+# list name -> when its loader last fetched; shared by all sessions, like the caches
+@st.cache_resource
+def directory_fills():
+    return {}
+
+
+def prefetch_directory():
+    """When every directory list is cold, fetch all three in one concurrent round."""
+    fills = directory_fills()
+    now = time.monotonic()
+    if any(now - fills[name] < LIST_TTL_SECONDS for name in DIRECTORY_LOADERS if name in fills):
+        return
+    try:
+        directory = asyncio.run(directory_service.load_directory())
+    except (AlumniError, MentorshipError):
+        return  # each loader retries on its own and the page shows its error
+    for name, loader in DIRECTORY_LOADERS.items():
+        loader(directory[name])
+
+
+@st.cache_data(ttl=LIST_TTL_SECONDS, show_spinner=False)
+def load_mentees(mentor_id: int):
+    return mentorship_service.list_mentee_views(mentor_id)
+
 
 menu = st.sidebar.selectbox(
     "Select a section",
     ["Home", "Profile", "Mentorship", "Events"]
 )
+if menu != "Home":
+    prefetch_directory()
 
 # ------------------------------
 # HOME
@@ -52,13 +121,20 @@ elif menu == "Profile":
                 }
                 try:
                     alumni = alumni_service.add_alumni(payload)
+                    load_alumni.clear()
                     st.success(f"✅ Alumni registered: {alumni['name']}")
                 except AlumniError as e:
                     st.error(str(e))
 
     with tab2:
+        query = st.text_input("🔍 Search alumni", placeholder="name, industry, location, email or year")
+        if query.strip():
+            try:
+                st.table(alumni_service.search_directory(query))
+            except AlumniError as e:
+                st.info(str(e))
         try:
-            alumni_list = alumni_service.list_alumni()
+            alumni_list = load_alumni()
             if alumni_list:
                 st.selectbox("Select Alumni to View", options=[f"{a['alumni_id']} - {a['name']}" for a in alumni_list])
                 st.table(alumni_list)
@@ -75,33 +151,11 @@ elif menu == "Mentorship":
 
     tab1, tab2 = st.tabs(["Become Mentor", "View My Mentees"])
 
-    with tab1:
-        st.subheader("Register as Mentor")
-        try:
-            alumni_list = alumni_service.list_alumni()
-            alumni_options = {f"{a['alumni_id']} - {a['name']}": a['alumni_id'] for a in alumni_list}
-            selected = st.selectbox("Select Your Alumni", options=list(alumni_options.keys()))
-            alumni_id = alumni_options[selected]
-            skills = st.text_input("Skills (comma separated)")
-            if st.button("Become Mentor"):
-                mentor = mentorship_service.create_mentor(alumni_id, skills)
-                st.success(f"✅ Mentor created successfully! Mentor ID: {mentor['mentor_id']}")
-        except AlumniError as e:
-            st.error(str(e))
-        except MentorshipError as e:
-            st.error(str(e))
-
-    # Mentorship tab
-elif menu == "Mentorship":
-    st.header("🧑‍🏫 Mentorship")
-
-    tab1, tab2 = st.tabs(["Become Mentor", "View My Mentees"])
-
     # --- Become Mentor ---
     with tab1:
         st.subheader("Register as Mentor")
         try:
-            alumni_list = alumni_service.list_alumni()
+            alumni_list = load_alumni()
             if alumni_list:
                 # Dropdown for selecting your alumni ID
                 alumni_options = {f"{a['alumni_id']} - {a['name']}": a['alumni_id'] for a in alumni_list}
@@ -112,6 +166,7 @@ elif menu == "Mentorship":
                         alumni_id = alumni_options[selected_alumni]
                         try:
                             mentor = mentorship_service.create_mentor(alumni_id, skills)
+                            load_mentors.clear()
                             st.success(f"✅ Mentor created successfully! Mentor ID: {mentor['mentor_id']}")
                         except MentorshipError as e:
                             st.error(str(e))
@@ -124,16 +179,23 @@ elif menu == "Mentorship":
     with tab2:
         st.subheader("My Mentees")
         try:
-            mentors_list = mentorship_service.list_mentors()
+            mentors_list = load_mentors()
             if mentors_list:
-                mentor_options = {f"{m['mentor_id']} - Alumni {m['alumni_id']}": m['mentor_id'] for m in mentors_list}
+                mentor_options = {
+                    f"{m['mentor_id']} - {m['name'] or 'Alumni ' + str(m['alumni_id'])} ({m['active_mentees']} active)": m['mentor_id']
+                    for m in mentors_list
+                }
                 selected_mentor = st.selectbox("Select Your Mentor", list(mentor_options.keys()))
                 if selected_mentor:
                     mentor_id = mentor_options[selected_mentor]
                     if st.button("View Mentees"):
-                        mentees = mentorship_service.list_students_by_mentor(mentor_id)
+                        mentees = load_mentees(mentor_id)
                         if mentees:
-                            st.table(mentees)
+                            st.table([
+                                {k: m[k] for k in ("assignment_id", "student_id", "student_name", "student_email",
+                                                   "course", "year", "start_date", "end_date", "active")}
+                                for m in mentees
+                            ])
                         else:
                             st.info("No mentees found for this mentor.")
             else:
@@ -155,7 +217,7 @@ elif menu == "Events":
     with tab1:
         st.subheader("All Events")
         try:
-            events = alumni_service.search_events()
+            events = load_events()
             if events:
                 st.table(events)
             else:
@@ -166,18 +228,28 @@ elif menu == "Events":
     with tab2:
         st.subheader("Join Event")
         try:
-            events = alumni_service.search_events()
+            events = load_events()
             event_options = {f"{e['event_id']} - {e['event_name']}": e['event_id'] for e in events}
             selected_event = st.selectbox("Select Event", options=list(event_options.keys()))
             event_id = event_options[selected_event]
 
-            alumni_list = alumni_service.list_alumni()
+            alumni_list = load_alumni()
             alumni_options = {f"{a['alumni_id']} - {a['name']}": a['alumni_id'] for a in alumni_list}
             selected_alumni = st.selectbox("Select Yourself", options=list(alumni_options.keys()))
             alumni_id = alumni_options[selected_alumni]
 
             if st.button("Join Event"):
                 registration = alumni_service.join_event(alumni_id, event_id)
-                st.success(f"✅ Successfully joined event ID {event_id}")
+                load_events.clear()
+                if not registration.get("created"):
+                    st.info(f"You are already {registration['status']} for event ID {event_id}")
+                elif registration["status"] == "pending":
+                    st.success(f"📨 Sign-up for event ID {event_id} received, your seat is confirmed shortly")
+                elif registration["status"] == "waitlisted":
+                    st.warning(f"⏳ Event ID {event_id} is full, you are on the waitlist")
+                else:
+                    st.success(f"✅ Successfully joined event ID {event_id}")
         except AlumniError as e:
             st.error(str(e))
+
+render_profile_panel(profiling)
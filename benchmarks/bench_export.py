@@ -0,0 +1,114 @@
+# benchmarks/bench_export.py
+"""Columnar export against the CLIs' JSON output, on a datagen SQLite file.
+
+    python -m benchmarks.datagen --scale 100k --out benchmarks/data/100k.db
+    python -m benchmarks.bench_export --data benchmarks/data/100k.db
+
+Works on a copy of the file. For every table it reports the JSON dump of all rows
+(``json.dumps(rows, indent=2)``, as the list commands print them), a full columnar
+export, and an incremental export after ``--changes`` rows of each table were updated:
+time and size on disk, plus peak Python memory with ``--memory`` (tracemalloc, which
+slows everything down). It then reads one text and one integer column back from the
+memory-mapped files.
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+
+def _measure(fn: Callable, memory: bool) -> Tuple[float, str, object]:
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    if not memory:
+        return seconds, "-", result
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, f"{peak / 2 ** 20:.1f}M", result
+
+
+def _size(path: str) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total / 2 ** 20
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_export")
+    parser.add_argument("--data", required=True, help="SQLite file made by benchmarks.datagen")
+    parser.add_argument("--memory", action="store_true", help="Also report peak Python memory (slower)")
+    parser.add_argument("--changes", type=int, default=1000, help="Rows updated per table before the incremental run")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.data):
+        print(f"{args.data} not found; create it with python -m benchmarks.datagen", file=sys.stderr)
+        return 2
+
+    workdir = tempfile.mkdtemp(prefix="bench-export-")
+    db_path = os.path.join(workdir, "data.db")
+    shutil.copy(args.data, db_path)
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = db_path
+    # a fresh datagen file is stamped within seconds, which a real overlap would re-read whole
+    os.environ.setdefault("EXPORT_OVERLAP_SECONDS", "0")
+
+    from src.dao.change_feed import ChangeFeedDAO, TABLE_KEYS
+    from src.services.columnar_export import open_export
+    from src.services.export_services import ExportService
+
+    feed = ChangeFeedDAO()
+    service = ExportService(overlap=float(os.environ["EXPORT_OVERLAP_SECONDS"]))
+    out = os.path.join(workdir, "export")
+    try:
+        print(f"{'table':24} {'json s':>8} {'json MB':>8} {'json peak':>9}")
+        json_total = 0.0
+        for table in TABLE_KEYS:
+            json_path = os.path.join(workdir, f"{table}.json")
+
+            def dump():
+                with open(json_path, "w", encoding="utf-8") as f:
+                    f.write(json.dumps(list(feed.iter_changed(table)), indent=2, default=str))
+
+            seconds, peak, _ = _measure(dump, args.memory)
+            json_total += os.path.getsize(json_path) / 2 ** 20
+            print(f"{table:24} {seconds:8.2f} {os.path.getsize(json_path) / 2 ** 20:8.1f} {peak:>9}")
+
+        seconds, peak, _ = _measure(lambda: service.export(out), args.memory)
+        print(f"\nfull export        {seconds:8.2f} s  {_size(out):8.1f} MB (json {json_total:.1f} MB)  peak {peak}")
+
+        # stamps move forward in millisecond steps; make sure the updates land after the watermark
+        time.sleep(0.01)
+        conn = sqlite3.connect(db_path)
+        for table, key in TABLE_KEYS.items():
+            conn.execute(f'UPDATE "{table}" SET "{key}" = "{key}" WHERE "{key}" IN '
+                         f'(SELECT "{key}" FROM "{table}" ORDER BY random() LIMIT ?)', [args.changes])
+        conn.commit()
+        conn.close()
+        seconds, peak, result = _measure(lambda: service.export(out), args.memory)
+        fetched = sum(t["fetched"] for t in result["tables"].values())
+        print(f"incremental export {seconds:8.2f} s  {fetched} rows fetched  peak {peak}")
+
+        tables = open_export(out)
+        alumni = tables["alumni"]
+        start = time.perf_counter()
+        names = alumni.column("name").tolist()
+        years = alumni.column("graduation_year")
+        mean_year = float(years.mean()) if len(years) else 0.0
+        print(f"mmap read          {(time.perf_counter() - start) * 1000:8.1f} ms  "
+              f"{len(names)} alumni names, mean graduation year {mean_year:.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# benchmarks/bench_records.py
+"""Memory and time of list results as dicts, records and a RecordBatch.
+
+    python -m benchmarks.bench_records --rows 500000
+
+Builds ``--rows`` alumni shaped like benchmarks.datagen's, serialises them as the JSON
+body PostgREST would send, and parses that back in pages of ``--page_size``. It then
+keeps the result in three forms:
+
+* the parsed dicts, as the DAOs used to return them;
+* Alumni records (src/dao/records.py), decoded page by page;
+* a RecordBatch (src/services/record_batch.py), packed from the same page stream.
+
+For each form it reports the memory still held once the pages are dropped and the peak
+while building (tracemalloc), plus the time to build it (in a separate, untraced run) and
+to read every row's name and graduation year. A last line reads one column of the batch without building records.
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Iterator, List, Tuple
+
+from benchmarks.datagen import INDUSTRIES, LOCATIONS, SEED, _name, parse_scale
+from src.dao.records import Alumni
+from src.services.record_batch import RecordBatch
+
+
+def _wire_pages(rows: int, page_size: int) -> List[bytes]:
+    rng = random.Random(SEED)
+    pages, page = [], []
+    for i in range(1, rows + 1):
+        stamp = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:{i % 60:02d}:00.000Z"
+        page.append({"alumni_id": i, "name": _name(rng), "email": f"alum{i}@example.com",
+                     "industry": rng.choice(INDUSTRIES), "graduation_year": rng.randint(1990, 2024),
+                     "location": rng.choice(LOCATIONS), "created_at": stamp, "updated_at": stamp})
+        if len(page) == page_size:
+            pages.append(json.dumps(page).encode())
+            page = []
+    if page:
+        pages.append(json.dumps(page).encode())
+    return pages
+
+
+def _parsed(pages: List[bytes]) -> Iterator[dict]:
+    for body in pages:
+        yield from json.loads(body)
+
+
+def _measure(build: Callable) -> Tuple[object, float, float, float]:
+    # timed on its own: tracemalloc slows allocation-heavy code several times over
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, held / 2 ** 20, peak / 2 ** 20
+
+
+def _read_all(rows) -> float:
+    start = time.perf_counter()
+    total = 0
+    for row in rows:
+        total += len(row["name"]) + (row["graduation_year"] or 0)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_records")
+    parser.add_argument("--rows", type=parse_scale, default=parse_scale("100k"), help="10k, 100k, 1m or a number")
+    parser.add_argument("--page_size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    pages = _wire_pages(args.rows, args.page_size)
+    print(f"{args.rows} alumni, {sum(map(len, pages)) / 2 ** 20:.1f} MB of JSON in {len(pages)} pages\n")
+    forms = [
+        ("dicts", lambda: list(_parsed(pages))),
+        ("records", lambda: [r for body in pages for r in Alumni.decode(json.loads(body))]),
+        ("RecordBatch", lambda: RecordBatch.from_rows(Alumni, _parsed(pages))),
+    ]
+    print(f"{'form':12} {'held MB':>8} {'peak MB':>8} {'build s':>8} {'read s':>7}")
+    batch = None
+    for name, build in forms:
+        result, seconds, held, peak = _measure(build)
+        print(f"{name:12} {held:8.1f} {peak:8.1f} {seconds:8.2f} {_read_all(result):7.2f}")
+        if isinstance(result, RecordBatch):
+            batch = result
+        del result
+
+    start = time.perf_counter()
+    years = batch.column("graduation_year")
+    mean_year = float(years.mean()) if len(years) else 0.0
+    print(f"\nbatch column read {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"(mean graduation year {mean_year:.1f}); batch arrays {batch.nbytes / 2 ** 20:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
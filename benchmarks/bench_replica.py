@@ -0,0 +1,111 @@
+# benchmarks/bench_replica.py
+"""Directory lists from the local replica against the backend, on a datagen SQLite file.
+
+    python -m benchmarks.datagen --scale 100k --out benchmarks/data/100k.db
+    python -m benchmarks.bench_replica --data benchmarks/data/100k.db
+
+Works on a copy of the file. Reports the first sync into an empty replica, the load of
+that snapshot by a restarted process (what an app pays on startup), a delta sync after
+``--changes`` alumni were updated, and per-call latency of list_alumni / list_events /
+list_mentors, with and without a filter, served by the replica and by the backend.
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable
+
+
+def _ms(fn: Callable, calls: int) -> float:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_replica")
+    parser.add_argument("--data", required=True, help="SQLite file made by benchmarks.datagen")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per list (median reported)")
+    parser.add_argument("--changes", type=int, default=1000, help="Alumni updated before the delta sync")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.data):
+        print(f"{args.data} not found; create it with python -m benchmarks.datagen", file=sys.stderr)
+        return 2
+
+    workdir = tempfile.mkdtemp(prefix="bench-replica-")
+    db_path = os.path.join(workdir, "data.db")
+    shutil.copy(args.data, db_path)
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = db_path
+    # a fresh datagen file is stamped within seconds, which a real overlap would re-read whole
+    os.environ.setdefault("EXPORT_OVERLAP_SECONDS", "0")
+
+    from src.dao.alumni_dao import AlumniDAO
+    from src.dao.events_dao import EventsDAO
+    from src.dao.mentors_dao import MentorsDAO
+    from src.dao.filters import as_filter
+    from src.services.export_services import ExportService
+    from src.services.replica import LocalReplica
+
+    path = os.path.join(workdir, "replica")
+    exporter = ExportService(overlap=float(os.environ["EXPORT_OVERLAP_SECONDS"]))
+    # refreshes are driven by hand here; the thread only wakes on close
+    replica = LocalReplica(path, refresh_after=3600, max_staleness=3600, exporter=exporter)
+    try:
+        replica.start()
+        start = time.perf_counter()
+        replica.refresh()
+        print(f"first sync          {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        restarted = LocalReplica(path, refresh_after=3600, max_staleness=3600, exporter=exporter)
+        start = time.perf_counter()
+        restarted.start()
+        print(f"load on restart     {(time.perf_counter() - start) * 1000:9.1f} ms  "
+              f"{sum(t['rows'] for t in restarted.metrics()['tables'].values())} rows")
+        restarted.close()
+
+        time.sleep(0.01)
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE alumni SET location = location WHERE alumni_id IN "
+                     "(SELECT alumni_id FROM alumni ORDER BY random() LIMIT ?)", [args.changes])
+        conn.commit()
+        conn.close()
+        start = time.perf_counter()
+        replica.refresh()
+        print(f"delta sync          {(time.perf_counter() - start) * 1000:9.1f} ms  ({args.changes} alumni changed)")
+
+        alumni, events, mentors = AlumniDAO(), EventsDAO(), MentorsDAO()
+        industry = (alumni.list_alumni() or [{"industry": None}])[0]["industry"]
+        location = (events.list_events() or [{"location": None}])[0]["location"]
+        cases = [
+            ("list_alumni", lambda: replica.select("alumni"), alumni.list_alumni),
+            ("list_alumni industry", lambda: replica.select("alumni", as_filter({"industry": industry}, exact=True)),
+             lambda: alumni.list_alumni({"industry": industry})),
+            ("list_events", lambda: replica.select("events"), events.list_events),
+            ("list_events location", lambda: replica.select("events", as_filter({"location": location})),
+             lambda: events.list_events({"location": location})),
+            ("list_mentors", lambda: replica.select("mentors"), mentors.list_mentors),
+        ]
+        print(f"\n{'call':24} {'rows':>7} {'replica ms':>11} {'backend ms':>11} {'speedup':>8}")
+        for name, local, backend in cases:
+            rows = local()
+            if rows != backend():
+                print(f"{name}: replica rows differ from the backend", file=sys.stderr)
+                return 1
+            local_ms, backend_ms = _ms(local, args.calls), _ms(backend, args.calls)
+            print(f"{name:24} {len(rows):7} {local_ms:11.2f} {backend_ms:11.2f} {backend_ms / local_ms:7.1f}x")
+    finally:
+        replica.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
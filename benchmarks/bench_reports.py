@@ -0,0 +1,148 @@
+# benchmarks/bench_reports.py
+"""Timings for the admin-cli reports (src/services/reporting.py).
+
+    python -m benchmarks.bench_reports --rows 1m
+    python -m benchmarks.bench_reports --data benchmarks/data/100k.db
+
+Without ``--data`` the snapshot is built straight from random arrays, so a million-alumni
+network fits in a few seconds and memory; tables are sized like benchmarks.datagen
+(``--rows`` alumni and students, a tenth as many mentors, one assignment per student, two
+registrations per alumnus). ``--data`` instead loads the snapshot through ReportService
+from a SQLite file made by benchmarks.datagen, and reports the load time too.
+
+Every report is timed, and the alumni breakdown is also computed the straightforward way,
+with a loop over row dicts, to check the numbers and show the difference.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.datagen import COURSES, INDUSTRIES, LOCATIONS, parse_scale
+from src.services import reporting
+from src.services.reporting import Snapshot, TextColumn
+
+
+def _text(rng: np.random.Generator, choices: List[str], n: int) -> TextColumn:
+    values = np.array(sorted(choices), dtype=str)
+    return TextColumn(rng.integers(0, len(values), n).astype(np.int32), values)
+
+
+def synthetic_snapshot(rows: int, seed: int = 1) -> Snapshot:
+    rng = np.random.default_rng(seed)
+    n_mentors, n_events, n_regs = max(rows // 10, 1), max(rows // 100, 1), 2 * rows
+    dates = [f"20{y:02d}-{m:02d}-15" for y in range(20, 30) for m in range(1, 13)]
+    end_dates = [""] + dates
+    alumni_ids = np.arange(1, rows + 1, dtype=np.int64)
+    student_ids = np.arange(1, rows + 1, dtype=np.int64)
+    is_alumni = rng.random(n_regs) < 0.4
+    tables = {
+        "alumni": {"alumni_id": alumni_ids, "graduation_year": rng.integers(1990, 2025, rows),
+                   "industry": _text(rng, INDUSTRIES, rows), "location": _text(rng, LOCATIONS, rows)},
+        "students": {"student_id": student_ids, "year": rng.integers(1, 5, rows),
+                     "course": _text(rng, COURSES, rows)},
+        "mentors": {"mentor_id": np.arange(1, n_mentors + 1, dtype=np.int64),
+                    "alumni_id": rng.choice(alumni_ids, n_mentors, replace=False)},
+        "assignments": {"mentor_id": rng.integers(1, n_mentors + 1, rows),
+                        "student_id": rng.integers(1, rows + 1, rows),
+                        "end_date": _text(rng, end_dates, rows)},
+        "events": {"event_id": np.arange(1, n_events + 1, dtype=np.int64),
+                   "event_name": _text(rng, [f"Event {i}" for i in range(n_events)], n_events),
+                   "event_date": _text(rng, dates, n_events)},
+        "registrations": {"event_id": rng.integers(1, n_events + 1, n_regs),
+                          "user_id": rng.integers(1, rows + 1, n_regs),
+                          "user_type": TextColumn(np.where(is_alumni, 0, 1).astype(np.int32),
+                                                  np.array(["alumni", "student"])),
+                          "status": TextColumn(np.zeros(n_regs, dtype=np.int32), np.array(["registered"]))},
+    }
+    return Snapshot(tables, "synthetic", 0.0)
+
+
+def row_dicts(snap: Snapshot, table: str) -> List[Dict]:
+    """The table as the DAOs would hand it over, one dict per row."""
+    columns = {name: (col.values[col.codes].tolist() if isinstance(col, TextColumn) else col.tolist())
+               for name, col in snap.tables[table].items()}
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def loop_breakdown(alumni: List[Dict], mentors: List[Dict], registrations: List[Dict], by: str) -> Dict:
+    """alumni_breakdown written as a loop over row dicts, for comparison."""
+    mentor_ids = {m["alumni_id"] for m in mentors}
+    participants = {r["user_id"] for r in registrations if r["user_type"] == "alumni"}
+    total, with_mentor, active = Counter(), Counter(), Counter()
+    for a in alumni:
+        key = a[by] or reporting.NULL_LABEL
+        total[key] += 1
+        with_mentor[key] += a["alumni_id"] in mentor_ids
+        active[key] += a["alumni_id"] in participants
+    return {key: (total[key], with_mentor[key], active[key]) for key in total}
+
+
+def _time(fn: Callable, repeat: int) -> Tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_reports")
+    parser.add_argument("--rows", default="1m", help="Alumni (and students) in the synthetic snapshot, e.g. 100k, 1m")
+    parser.add_argument("--data", help="Load the snapshot from this SQLite file instead")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per report; the best is kept")
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the row-dict comparison")
+    args = parser.parse_args(argv)
+
+    if args.data:
+        if not os.path.exists(args.data):
+            print(f"{args.data} not found; create it with python -m benchmarks.datagen", file=sys.stderr)
+            return 2
+        os.environ["DB_BACKEND"] = "sqlite"
+        os.environ["SQLITE_PATH"] = args.data
+        from src.services.report_services import ReportService
+        service = ReportService()
+        load, snap = _time(lambda: service._snapshot(refresh=True), args.repeat)
+        print(f"snapshot load      {load * 1000:10.1f} ms  {sum(snap.info()['rows'].values())} rows")
+    else:
+        start = time.perf_counter()
+        snap = synthetic_snapshot(parse_scale(args.rows))
+        print(f"synthetic snapshot {(time.perf_counter() - start) * 1000:10.1f} ms  "
+              f"{sum(snap.rows(t) for t in snap.tables)} rows")
+
+    reports = {
+        "alumni by industry": lambda: reporting.alumni_breakdown(snap, "industry"),
+        "alumni by year": lambda: reporting.alumni_breakdown(snap, "graduation_year"),
+        "mentor coverage": lambda: reporting.mentor_coverage(snap),
+        "event attendance": lambda: reporting.event_attendance(snap),
+        "cohort trends": lambda: reporting.cohort_trends(snap),
+    }
+    results = {}
+    for name, fn in reports.items():
+        seconds, results[name] = _time(fn, args.repeat)
+        print(f"{name:18} {seconds * 1000:10.1f} ms")
+
+    if args.no_baseline:
+        return 0
+    start = time.perf_counter()
+    alumni, mentors, regs = (row_dicts(snap, t) for t in ("alumni", "mentors", "registrations"))
+    print(f"row dicts          {(time.perf_counter() - start) * 1000:10.1f} ms  (not counted below)")
+    seconds, expected = _time(lambda: loop_breakdown(alumni, mentors, regs, "industry"), 1)
+    print(f"{'loop by industry':18} {seconds * 1000:10.1f} ms")
+    got = {g["industry"]: (g["alumni"], g["mentors"], g["event_participants"])
+           for g in results["alumni by industry"]["groups"]}
+    if got != expected:
+        print("MISMATCH between the vectorized and the loop breakdown", file=sys.stderr)
+        return 1
+    print("vectorized and loop breakdowns agree")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# benchmarks/bench_services.py
+"""Throughput and latency percentiles for every public service method.
+
+Runs against a private copy of a database made by ``benchmarks.datagen`` (generated on
+first use), so repeated runs start from the same data. Results are written as JSON and
+can be diffed between commits with ``benchmarks.compare``:
+
+    python -m benchmarks.bench_services --scale 100k
+    python -m benchmarks.compare benchmarks/results/100000-abc1234.json benchmarks/results/100000-def5678.json
+"""
+import argparse
+import csv
+import inspect
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.datagen import SCALES, default_path, generate, parse_scale, table_sizes
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+ITER_LIMIT = 10_000  # rows consumed from iter_* methods per call
+IMPORT_ROWS = 100    # rows per file for the import_* methods
+COHORT_SIZE = 200    # students per assign_cohort dry run
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_samples) + 0.5)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def git_revision() -> Dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": "unknown", "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def copy_database(src: str) -> str:
+    fd, dst = tempfile.mkstemp(suffix=".db", prefix="bench-")
+    os.close(fd)
+    with sqlite3.connect(src) as source, sqlite3.connect(dst) as target:
+        source.backup(target)
+    return dst
+
+
+class Workload:
+    """Random arguments drawn from the generated id ranges, plus fresh ids for writes."""
+
+    def __init__(self, sizes: Dict[str, int], seed: int, tmpdir: str):
+        self.sizes = sizes
+        self.rng = random.Random(seed)
+        self.tmpdir = tmpdir
+        self._seq = itertools.count(1)
+        # rows handed out for destructive calls are never reused
+        self._doomed = {table: iter(range(sizes[table], 0, -1)) for table in sizes}
+        self._joined: Dict[str, List[Tuple[int, int]]] = {"alumni": [], "student": []}
+
+    def id(self, table: str) -> int:
+        return self.rng.randint(1, self.sizes[table])
+
+    def doomed(self, table: str) -> int:
+        return next(self._doomed[table])
+
+    def seq(self) -> int:
+        return next(self._seq)
+
+    def joined(self, registration: Dict) -> Dict:
+        """Remember a registration made by a join scenario so a leave scenario can cancel it."""
+        self._joined[registration["user_type"]].append((registration["event_id"], registration["user_id"]))
+        return registration
+
+    def registration(self, user_type: str) -> Tuple[int, int]:
+        """(event_id, user_id) of a remembered registration, which is then forgotten."""
+        return self._joined[user_type].pop()
+
+    def alumni_payload(self) -> Dict:
+        n = self.seq()
+        return {"name": f"Bench Alum {n}", "email": f"bench-alum-{n}@example.com", "industry": "Software",
+                "graduation_year": 2018, "location": "Pune"}
+
+    def csv_file(self, kind: str) -> str:
+        path = os.path.join(self.tmpdir, f"{kind}-{self.seq()}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if kind == "alumni":
+                writer.writerow(["name", "email", "industry", "graduation_year", "location"])
+                for _ in range(IMPORT_ROWS):
+                    n = self.seq()
+                    writer.writerow([f"Imported {n}", f"import-alum-{n}@example.com", "Finance", 2015, "Delhi"])
+            else:
+                writer.writerow(["name", "email", "course", "year"])
+                for _ in range(IMPORT_ROWS):
+                    n = self.seq()
+                    writer.writerow([f"Imported {n}", f"import-student-{n}@example.edu", "CSE", 2])
+        return path
+
+
+def _drain(iterator, limit: int = ITER_LIMIT) -> int:
+    return sum(1 for _ in itertools.islice(iterator, limit))
+
+
+def scenarios(alumni, students, events, mentorship, w: Workload) -> List[Tuple[str, Callable[[], object]]]:
+    """(method, call) pairs. Destructive calls come last so reads see the full data set."""
+    return [
+        # reads
+        ("AlumniService.get_alumni", lambda: alumni.get_alumni(w.id("alumni"))),
+        ("AlumniService.list_alumni", lambda: alumni.list_alumni({"industry": "Software", "location": "Pune"})),
+        ("AlumniService.iter_alumni", lambda: _drain(alumni.iter_alumni())),
+        ("AlumniService.search_alumni", lambda: alumni.search_alumni("location", "Pune")),
+        ("AlumniService.search_directory", lambda: alumni.search_directory("softwre pune")),
+        ("AlumniService.search_events", lambda: alumni.search_events({"event_name": "Hackathon"})),
+        ("AlumniService.list_my_events", lambda: alumni.list_my_events(w.id("alumni"))),
+        ("StudentService.get_student", lambda: students.get_student(w.id("students"))),
+        ("StudentService.list_students", lambda: students.list_students({"course": "CSE", "year": 2})),
+        ("StudentService.iter_students", lambda: _drain(students.iter_students())),
+        ("StudentService.search_events", lambda: students.search_events({"location": "Kochi"})),
+        ("StudentService.list_my_events", lambda: students.list_my_events(w.id("students"))),
+        ("StudentService.list_all_mentors", lambda: students.list_all_mentors()),
+        ("StudentService.iter_all_mentors", lambda: _drain(students.iter_all_mentors())),
+        ("StudentService.recommend_mentors", lambda: students.recommend_mentors(w.id("students"), 10)),
+        ("StudentService.list_my_mentors", lambda: students.list_my_mentors(w.id("students"))),
+        ("EventService.get_event", lambda: events.get_event(w.id("events"))),
+        ("EventService.list_events", lambda: events.list_events()),
+        ("EventService.iter_events", lambda: _drain(events.iter_events())),
+        ("EventService.get_registration_counts", lambda: events.get_registration_counts(
+            [w.id("events") for _ in range(50)])),
+        ("EventService.list_event_participants", lambda: events.list_event_participants(w.id("events"))),
+        ("MentorshipServices.get_mentor", lambda: mentorship.get_mentor(w.id("mentors"))),
+        ("MentorshipServices.list_mentors", lambda: mentorship.list_mentors()),
+        ("MentorshipServices.iter_mentors", lambda: _drain(mentorship.iter_mentors())),
+        ("MentorshipServices.get_mentor_view", lambda: mentorship.get_mentor_view(w.id("mentors"))),
+        ("MentorshipServices.list_mentor_views", lambda: mentorship.list_mentor_views()),
+        ("MentorshipServices.rank_mentors", lambda: mentorship.rank_mentors("Data Science", 3, 10)),
+        ("MentorshipServices.assign_cohort", lambda: mentorship.assign_cohort(
+            [w.id("students") for _ in range(COHORT_SIZE)], dry_run=True)),
+        ("MentorshipServices.get_assignment", lambda: mentorship.get_assignment(w.id("mentorship_assignments"))),
+        ("MentorshipServices.list_assignments", lambda: mentorship.list_assignments()),
+        ("MentorshipServices.iter_assignments", lambda: _drain(mentorship.iter_assignments())),
+        ("MentorshipServices.list_students_by_mentor", lambda: mentorship.list_students_by_mentor(w.id("mentors"))),
+        ("MentorshipServices.list_mentors_by_student", lambda: mentorship.list_mentors_by_student(w.id("students"))),
+        ("MentorshipServices.get_assignment_view", lambda: mentorship.get_assignment_view(w.id("mentorship_assignments"))),
+        ("MentorshipServices.list_mentee_views", lambda: mentorship.list_mentee_views(w.id("mentors"))),
+        ("MentorshipServices.list_mentor_views_by_student", lambda: mentorship.list_mentor_views_by_student(w.id("students"))),
+        # writes
+        ("AlumniService.add_alumni", lambda: alumni.add_alumni(w.alumni_payload())),
+        ("AlumniService.update_alumni", lambda: alumni.update_alumni(w.id("alumni"), {"location": "Chennai"})),
+        ("AlumniService.import_alumni", lambda: alumni.import_alumni(w.csv_file("alumni"))),
+        ("AlumniService.join_event", lambda: w.joined(alumni.join_event(w.id("alumni"), w.id("events")))),
+        ("StudentService.create_student", lambda: students.create_student(
+            "Bench Student", f"bench-student-{w.seq()}@example.edu", "IT", 1)),
+        ("StudentService.update_student", lambda: students.update_student(w.id("students"), {"year": 3})),
+        ("StudentService.import_students", lambda: students.import_students(w.csv_file("students"))),
+        ("StudentService.join_event", lambda: w.joined(students.join_event(w.id("students"), w.id("events")))),
+        ("EventService.register", lambda: w.joined(events.register(w.id("events"), w.id("students"), "student"))),
+        ("StudentService.join_mentorship", lambda: students.join_mentorship(w.id("students"), w.id("mentors"))),
+        ("EventService.add_event", lambda: events.add_event({"event_name": f"Bench {w.seq()}", "event_date": "2027-03-01"})),
+        ("EventService.update_event", lambda: events.update_event(w.id("events"), {"location": "Hall B"})),
+        ("EventService.bulk_register", lambda: events.bulk_register(
+            w.id("events"), [(w.id("students"), "student") for _ in range(100)])),
+        ("EventService.set_capacity", lambda: events.set_capacity(w.id("events"), 500)),
+        ("EventService.registration_queue", lambda: events.registration_queue()),
+        ("EventService.flush_registrations", lambda: events.flush_registrations()),
+        ("MentorshipServices.create_mentor", lambda: mentorship.create_mentor(w.id("alumni"), "python, sql")),
+        ("MentorshipServices.update_mentor", lambda: mentorship.update_mentor(w.id("mentors"), {"skills": "go"})),
+        ("MentorshipServices.assign_student", lambda: mentorship.assign_student(w.id("mentors"), w.id("students"))),
+        ("MentorshipServices.update_assignment", lambda: mentorship.update_assignment(
+            w.id("mentorship_assignments"), {"end_date": "2027-01-01"})),
+        # deletes
+        ("EventService.cancel_registration", lambda: events.cancel_registration(*w.registration("student"), "student")),
+        ("AlumniService.leave_event", lambda: alumni.leave_event(*w.registration("alumni")[::-1])),
+        ("StudentService.leave_event", lambda: students.leave_event(*w.registration("student")[::-1])),
+        ("MentorshipServices.delete_assignment", lambda: mentorship.delete_assignment(w.doomed("mentorship_assignments"))),
+        ("MentorshipServices.delete_mentor", lambda: mentorship.delete_mentor(w.doomed("mentors"))),
+        ("StudentService.delete_student", lambda: students.delete_student(w.doomed("students"))),
+        ("EventService.delete_event", lambda: events.delete_event(w.doomed("events"))),
+        ("AlumniService.remove_alumni", lambda: alumni.remove_alumni(w.doomed("alumni"))),
+    ]
+
+
+def uncovered(covered: List[str], classes) -> List[str]:
+    """Public service methods that have no scenario yet."""
+    public = {f"{cls.__name__}.{name}" for cls in classes
+              for name, _ in inspect.getmembers(cls, inspect.isfunction) if not name.startswith("_")}
+    return sorted(public - set(covered))
+
+
+def measure(call: Callable, max_calls: int, max_seconds: float, min_calls: int = 3) -> Dict:
+    samples: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    while len(samples) < max_calls:
+        t0 = time.perf_counter()
+        try:
+            call()
+        except Exception:
+            errors += 1
+        samples.append((time.perf_counter() - t0) * 1000)
+        if len(samples) >= min_calls and time.perf_counter() - started > max_seconds:
+            break
+    total = time.perf_counter() - started
+    samples.sort()
+    return {
+        "calls": len(samples),
+        "errors": errors,
+        "ops_per_sec": round(len(samples) / total, 2) if total else None,
+        "mean_ms": round(sum(samples) / len(samples), 4),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "p99_ms": round(percentile(samples, 99), 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_services")
+    parser.add_argument("--scale", type=parse_scale, default=SCALES["10k"], help="10k, 100k, 1m or a row count")
+    parser.add_argument("--data", help="Generated database to copy (default benchmarks/data/<scale>.db)")
+    parser.add_argument("--calls", type=int, default=200, help="Max calls per method")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Max time per method")
+    parser.add_argument("--only", help="Substring filter on method names")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="Result file (default benchmarks/results/<scale>-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    data = args.data or default_path(args.scale)
+    if not os.path.exists(data):
+        print(f"Generating benchmark data at {data}")
+        generate(data, args.scale)
+    db = copy_database(data)
+    tmpdir = tempfile.mkdtemp(prefix="bench-import-")
+
+    # the backend is picked from the environment when src.config is first imported
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = db
+    from src.dao.cache import get_entity_cache
+    from src.services.alumni_services import AlumniService
+    from src.services.event_services import EventService
+    from src.services.mentorship_services import MentorshipServices
+    from src.services.student_services import StudentService
+
+    classes = (AlumniService, StudentService, EventService, MentorshipServices)
+    alumni, students, events, mentorship = (cls() for cls in classes)
+    workload = Workload(table_sizes(args.scale), args.seed, tmpdir)
+    plan = scenarios(alumni, students, events, mentorship, workload)
+    missing = uncovered([name for name, _ in plan], classes)
+    if missing:
+        print("⚠️  no scenario for: " + ", ".join(missing))
+
+    results = {}
+    print(f"{'method':45} {'calls':>6} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err':>4}")
+    try:
+        for name, call in plan:
+            if args.only and args.only not in name:
+                continue
+            get_entity_cache().clear()
+            r = results[name] = measure(call, args.calls, args.seconds)
+            print(f"{name:45} {r['calls']:>6} {r['ops_per_sec']:>9} {r['p50_ms']:>9.3f} "
+                  f"{r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['errors']:>4}")
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db + suffix):
+                os.remove(db + suffix)
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            **revision,
+            "scale": args.scale,
+            "backend": "sqlite",
+            "calls": args.calls,
+            "seconds": args.seconds,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "uncovered": missing,
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{args.scale}-{revision['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# benchmarks/compare.py
+"""Compare two ``bench_services`` result files.
+
+    python -m benchmarks.compare base.json head.json --threshold 0.15
+
+Prints the change in p50/p95 latency and throughput per method and exits 1 when any
+method's p50 got slower by more than ``--threshold`` (a fraction).
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Optional
+
+
+def _load(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _change(base: Optional[float], head: Optional[float]) -> Optional[float]:
+    if not base or head is None:
+        return None
+    return (head - base) / base
+
+
+def _fmt(change: Optional[float]) -> str:
+    return "     n/a" if change is None else f"{change * 100:+7.1f}%"
+
+
+def compare(base: Dict, head: Dict, threshold: float) -> int:
+    b, h = base["results"], head["results"]
+    print(f"base {base['meta'].get('commit')} (scale {base['meta'].get('scale')})  →  "
+          f"head {head['meta'].get('commit')} (scale {head['meta'].get('scale')})")
+    if base["meta"].get("scale") != head["meta"].get("scale"):
+        print("⚠️  results were produced at different scales")
+    print(f"{'method':45} {'p50 base':>9} {'p50 head':>9} {'p50':>8} {'p95':>8} {'ops/s':>8}")
+    regressions = []
+    for name in sorted(set(b) | set(h)):
+        if name not in b or name not in h:
+            print(f"{name:45} {'only in ' + ('base' if name in b else 'head'):>28}")
+            continue
+        p50 = _change(b[name]["p50_ms"], h[name]["p50_ms"])
+        p95 = _change(b[name]["p95_ms"], h[name]["p95_ms"])
+        ops = _change(b[name]["ops_per_sec"], h[name]["ops_per_sec"])
+        flag = ""
+        if p50 is not None and p50 > threshold:
+            regressions.append(name)
+            flag = "  ▲ slower"
+        print(f"{name:45} {b[name]['p50_ms']:>9.3f} {h[name]['p50_ms']:>9.3f} {_fmt(p50)} {_fmt(p95)} {_fmt(ops)}{flag}")
+    if regressions:
+        print(f"{len(regressions)} method(s) regressed by more than {threshold:.0%} at p50")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed p50 slowdown as a fraction")
+    args = parser.parse_args(argv)
+    return compare(_load(args.base), _load(args.head), args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
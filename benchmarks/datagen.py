@@ -0,0 +1,177 @@
+# benchmarks/datagen.py
+"""Synthetic data for the service benchmarks.
+
+Fills a SQLite database (the local stand-in backend, see src/db) with deterministic
+alumni, students, events, mentors, assignments and registrations. ``--scale`` sets the
+number of alumni and students; the other tables are sized relative to it:
+
+    mentors = scale / 10, events = scale / 100,
+    assignments = scale, registrations = 2 * scale
+
+    python -m benchmarks.datagen --scale 100k --out benchmarks/data/100k.db
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterator, Tuple
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SEED = 20240601
+CHUNK = 50_000
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Rohan", "Saanvi", "Kabir", "Ananya", "Vihaan", "Priya",
+               "Arjun", "Nisha", "Dev", "Kavya", "Rahul", "Sneha", "Aditya", "Pooja", "Karan", "Riya"]
+LAST_NAMES = ["Sharma", "Reddy", "Iyer", "Patel", "Khan", "Das", "Nair", "Gupta", "Singh", "Rao",
+              "Menon", "Joshi", "Kulkarni", "Bose", "Verma"]
+INDUSTRIES = ["Software", "Finance", "Healthcare", "Education", "Manufacturing", "Consulting",
+              "Retail", "Energy", "Telecom", "Government", "Media", "Research"]
+LOCATIONS = ["Bengaluru", "Hyderabad", "Pune", "Chennai", "Mumbai", "Delhi", "Kolkata", "Ahmedabad",
+             "Kochi", "Jaipur", "London", "Singapore", "San Francisco", "Dubai", "Toronto"]
+COURSES = ["CSE", "ECE", "EEE", "Mechanical", "Civil", "IT", "MBA", "Data Science", "Chemical", "Biotech"]
+SKILLS = ["python", "java", "machine learning", "data science", "cloud", "devops", "product management",
+          "finance", "marketing", "design", "leadership", "public speaking", "sql", "react", "security"]
+EVENT_KINDS = ["Meetup", "Hackathon", "Career Fair", "Workshop", "Reunion", "Webinar", "Panel"]
+
+
+def parse_scale(value: str) -> int:
+    key = value.strip().lower()
+    if key in SCALES:
+        return SCALES[key]
+    try:
+        return int(key)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"scale must be one of {', '.join(SCALES)} or an integer")
+
+
+def table_sizes(scale: int) -> Dict[str, int]:
+    return {
+        "alumni": scale,
+        "students": scale,
+        "mentors": max(1, scale // 10),
+        "events": max(1, scale // 100),
+        "mentorship_assignments": scale,
+        "event_registrations": 2 * scale,
+    }
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _alumni(rng, n) -> Iterator[Tuple]:
+    for i in range(1, n + 1):
+        yield (i, _name(rng), f"alum{i}@example.com", rng.choice(INDUSTRIES),
+               rng.randint(1990, 2024), rng.choice(LOCATIONS))
+
+
+def _students(rng, n) -> Iterator[Tuple]:
+    for i in range(1, n + 1):
+        yield i, _name(rng), f"student{i}@example.edu", rng.choice(COURSES), rng.randint(1, 4)
+
+
+def _events(rng, n) -> Iterator[Tuple]:
+    for i in range(1, n + 1):
+        kind = rng.choice(EVENT_KINDS)
+        date = f"{rng.randint(2020, 2027)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        yield i, f"{kind} {i}", date, rng.choice(LOCATIONS), f"{kind} for the alumni network"
+
+
+def _mentors(rng, n, alumni) -> Iterator[Tuple]:
+    for i, alumni_id in enumerate(rng.sample(range(1, alumni + 1), n), start=1):
+        yield i, alumni_id, ", ".join(rng.sample(SKILLS, rng.randint(1, 4)))
+
+
+def _assignments(rng, n, mentors, students) -> Iterator[Tuple]:
+    for i in range(1, n + 1):
+        start = f"{rng.randint(2021, 2025)}-{rng.randint(1, 12):02d}-01"
+        yield i, rng.randint(1, mentors), rng.randint(1, students), start, None
+
+
+def _registrations(rng, n, events, alumni, students) -> Iterator[Tuple]:
+    seen = set()
+    while len(seen) < n:
+        user_type = "alumni" if rng.random() < 0.4 else "student"
+        key = (rng.randint(1, events), rng.randint(1, alumni if user_type == "alumni" else students), user_type)
+        if key not in seen:
+            seen.add(key)
+            yield (len(seen),) + key
+
+
+INSERTS = {
+    "alumni": "INSERT INTO alumni (alumni_id, name, email, industry, graduation_year, location) VALUES (?, ?, ?, ?, ?, ?)",
+    "students": "INSERT INTO students (student_id, name, email, course, year) VALUES (?, ?, ?, ?, ?)",
+    "events": "INSERT INTO events (event_id, event_name, event_date, location, description) VALUES (?, ?, ?, ?, ?)",
+    "mentors": "INSERT INTO mentors (mentor_id, alumni_id, skills) VALUES (?, ?, ?)",
+    "mentorship_assignments": "INSERT INTO mentorship_assignments (assignment_id, mentor_id, student_id, start_date, end_date) "
+                              "VALUES (?, ?, ?, ?, ?)",
+    "event_registrations": "INSERT INTO event_registrations (registration_id, event_id, user_id, user_type) VALUES (?, ?, ?, ?)",
+}
+
+
+def generate(path: str, scale: int, seed: int = SEED, log=print) -> Dict[str, int]:
+    """Create ``path`` (replacing it) and fill it at the given scale. Returns table sizes."""
+    from src.db.sqlite_client import SQLiteClient
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    sizes = table_sizes(scale)
+    rng = random.Random(seed)
+    rows = {
+        "alumni": _alumni(rng, sizes["alumni"]),
+        "students": _students(rng, sizes["students"]),
+        "events": _events(rng, sizes["events"]),
+        "mentors": _mentors(rng, sizes["mentors"], sizes["alumni"]),
+        "mentorship_assignments": _assignments(rng, sizes["mentorship_assignments"], sizes["mentors"], sizes["students"]),
+        "event_registrations": _registrations(rng, sizes["event_registrations"], sizes["events"],
+                                              sizes["alumni"], sizes["students"]),
+    }
+    client = SQLiteClient(path)
+    conn = client.connection
+    try:
+        for table, it in rows.items():
+            start = time.perf_counter()
+            conn.execute("BEGIN")
+            try:
+                while True:
+                    chunk = [r for _, r in zip(range(CHUNK), it)]
+                    if not chunk:
+                        break
+                    conn.executemany(INSERTS[table], chunk)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            log(f"  {table:24} {sizes[table]:>9} rows  {time.perf_counter() - start:6.1f}s")
+        # generated events have no capacity: every registration holds a seat
+        conn.execute('UPDATE events SET seats_taken = (SELECT COUNT(*) FROM event_registrations r '
+                     'WHERE r.event_id = events.event_id)')
+        conn.execute("ANALYZE")
+    finally:
+        client.close()
+    return sizes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.datagen")
+    parser.add_argument("--scale", type=parse_scale, default=SCALES["10k"], help="10k, 100k, 1m or a row count")
+    parser.add_argument("--out", help="Database file (default benchmarks/data/<scale>.db)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args(argv)
+    out = args.out or default_path(args.scale)
+    print(f"Generating scale={args.scale} into {out}")
+    generate(out, args.scale, args.seed)
+    return 0
+
+
+def default_path(scale: int) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", f"{scale}.db")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
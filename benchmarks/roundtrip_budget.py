@@ -0,0 +1,171 @@
+# benchmarks/roundtrip_budget.py
+"""Assert the maximum number of backend round trips each service method may issue.
+
+Runs every scenario against an in-memory SQLite backend with a cold entity cache and
+counts ``execute()`` calls. Exits non-zero when a method goes over its budget, so it can
+gate CI:
+
+    python -m benchmarks.roundtrip_budget
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = ":memory:"
+
+from src.config import get_client
+from src.dao.cache import get_entity_cache
+from src.services.alumni_services import AlumniService
+from src.services.async_services import AsyncStudentService
+from src.services.event_services import EventService
+from src.services.export_services import ExportService
+from src.services.mentorship_services import MentorshipServices
+from src.services.replica import LocalReplica
+from src.services.report_services import ReportService
+from src.services.student_services import StudentService
+
+
+class RoundTripBudget:
+    """Context manager counting backend round trips issued inside the block."""
+
+    def __init__(self, client, limit: int):
+        self.client = client
+        self.limit = limit
+        self.used = 0
+
+    def __enter__(self):
+        self._start = self.client.round_trips
+        return self
+
+    def __exit__(self, *exc):
+        self.used = self.client.round_trips - self._start
+        return False
+
+    @property
+    def exceeded(self) -> bool:
+        return self.used > self.limit
+
+
+def _seed(alumni: AlumniService, students: StudentService, events: EventService, mentorship: MentorshipServices):
+    seq = _seed.counter = getattr(_seed, "counter", 0) + 1
+    a = alumni.add_alumni({"name": f"Alum {seq}", "email": f"alum{seq}@example.com", "industry": "Software",
+                           "graduation_year": 2015, "location": "Pune"})
+    s = students.create_student(f"Student {seq}", f"student{seq}@example.com", "CS", 2)
+    e = events.add_event({"event_name": f"Meetup {seq}", "event_date": "2026-12-01"})
+    m = mentorship.create_mentor(a["alumni_id"], "python, data")
+    asg = mentorship.assign_student(m["mentor_id"], s["student_id"])
+    return {"alumni": a, "student": s, "event": e, "mentor": m, "assignment": asg}
+
+
+def _replica_alumni(path: str, exports: ExportService) -> AlumniService:
+    service = AlumniService()
+    service.replica = LocalReplica(path, exporter=exports)
+    service.replica.refresh()
+    return service
+
+
+def scenarios(alumni, students, events, mentorship, reports, exports):
+    """(name, budget, setup -> callable) triples; setup runs outside the measured block."""
+    # removed when the process exits
+    export_dir = tempfile.TemporaryDirectory(prefix="budget-export-")
+    return [
+        ("AlumniService.add_alumni", 1, lambda r: lambda: alumni.add_alumni(
+            {"name": "New", "email": f"new{r['alumni']['alumni_id']}@example.com", "industry": "Finance",
+             "graduation_year": 2020, "location": "Delhi"})),
+        ("AlumniService.get_alumni", 1, lambda r: lambda: alumni.get_alumni(r["alumni"]["alumni_id"])),
+        ("AlumniService.update_alumni", 1, lambda r: lambda: alumni.update_alumni(r["alumni"]["alumni_id"], {"location": "Mumbai"})),
+        ("AlumniService.remove_alumni", 1, lambda r: lambda: alumni.remove_alumni(r["alumni"]["alumni_id"])),
+        ("AlumniService.list_alumni", 1, lambda r: lambda: alumni.list_alumni({"industry": "Software"})),
+        ("AlumniService.search_events", 1, lambda r: lambda: alumni.search_events({"event_name": "meetup 1"})),
+        ("AlumniService.join_event", 1, lambda r: lambda: alumni.join_event(r["alumni"]["alumni_id"], r["event"]["event_id"])),
+        ("AlumniService.list_my_events", 1, lambda r: lambda: alumni.list_my_events(r["alumni"]["alumni_id"])),
+        ("StudentService.create_student", 1, lambda r: lambda: students.create_student(
+            "New", f"new{r['student']['student_id']}@example.com", "EE", 1)),
+        ("StudentService.update_student", 1, lambda r: lambda: students.update_student(r["student"]["student_id"], {"year": 3})),
+        ("StudentService.delete_student", 1, lambda r: lambda: students.delete_student(r["student"]["student_id"])),
+        ("StudentService.list_students", 1, lambda r: lambda: students.list_students({"course": "cs"})),
+        ("StudentService.join_event", 1, lambda r: lambda: students.join_event(r["student"]["student_id"], r["event"]["event_id"])),
+        ("StudentService.join_mentorship", 3, lambda r: lambda: students.join_mentorship(r["student"]["student_id"], r["mentor"]["mentor_id"])),
+        # same three requests, the two lookups concurrently
+        ("AsyncStudentService.join_mentorship", 3, lambda r: lambda: asyncio.run(AsyncStudentService(students).join_mentorship(
+            r["student"]["student_id"], r["mentor"]["mentor_id"]))),
+        ("StudentService.list_my_mentors", 1, lambda r: lambda: students.list_my_mentors(r["student"]["student_id"])),
+        ("EventService.get_event", 1, lambda r: lambda: events.get_event(r["event"]["event_id"])),
+        ("EventService.update_event", 1, lambda r: lambda: events.update_event(r["event"]["event_id"], {"location": "Hall B"})),
+        ("EventService.delete_event", 1, lambda r: lambda: events.delete_event(r["event"]["event_id"])),
+        ("EventService.list_events", 1, lambda r: lambda: events.list_events()),
+        ("EventService.get_registration_counts", 1, lambda r: lambda: events.get_registration_counts([r["event"]["event_id"]])),
+        ("EventService.register", 1, lambda r: lambda: events.register(r["event"]["event_id"], r["student"]["student_id"], "student")),
+        ("EventService.cancel_registration", 1, lambda r: (
+            students.join_event(r["student"]["student_id"], r["event"]["event_id"]),
+            lambda: events.cancel_registration(r["event"]["event_id"], r["student"]["student_id"], "student"),
+        )[-1]),
+        ("EventService.set_capacity", 1, lambda r: lambda: events.set_capacity(r["event"]["event_id"], 10)),
+        ("StudentService.leave_event", 1, lambda r: (
+            students.join_event(r["student"]["student_id"], r["event"]["event_id"]),
+            lambda: students.leave_event(r["student"]["student_id"], r["event"]["event_id"]),
+        )[-1]),
+        ("EventService.list_event_participants", 4, lambda r: (
+            alumni.join_event(r["alumni"]["alumni_id"], r["event"]["event_id"]),
+            students.join_event(r["student"]["student_id"], r["event"]["event_id"]),
+            lambda: events.list_event_participants(r["event"]["event_id"]),
+        )[-1]),
+        ("MentorshipServices.get_mentor", 1, lambda r: lambda: mentorship.get_mentor(r["mentor"]["mentor_id"])),
+        ("MentorshipServices.update_mentor", 1, lambda r: lambda: mentorship.update_mentor(r["mentor"]["mentor_id"], {"skills": "go"})),
+        ("MentorshipServices.delete_mentor", 1, lambda r: lambda: mentorship.delete_mentor(r["mentor"]["mentor_id"])),
+        ("MentorshipServices.assign_student", 2, lambda r: lambda: mentorship.assign_student(r["mentor"]["mentor_id"], r["student"]["student_id"])),
+        ("MentorshipServices.update_assignment", 1, lambda r: lambda: mentorship.update_assignment(
+            r["assignment"]["assignment_id"], {"end_date": "2027-01-01"})),
+        ("MentorshipServices.delete_assignment", 1, lambda r: lambda: mentorship.delete_assignment(r["assignment"]["assignment_id"])),
+        ("MentorshipServices.list_mentors", 1, lambda r: lambda: mentorship.list_mentors()),
+        ("MentorshipServices.get_mentor_view", 1, lambda r: lambda: mentorship.get_mentor_view(r["mentor"]["mentor_id"])),
+        ("MentorshipServices.list_mentor_views", 1, lambda r: lambda: mentorship.list_mentor_views()),
+        ("MentorshipServices.get_assignment_view", 1, lambda r: lambda: mentorship.get_assignment_view(
+            r["assignment"]["assignment_id"])),
+        ("MentorshipServices.list_mentee_views", 1, lambda r: lambda: mentorship.list_mentee_views(r["mentor"]["mentor_id"])),
+        ("MentorshipServices.list_mentor_views_by_student", 1, lambda r: lambda: mentorship.list_mentor_views_by_student(
+            r["student"]["student_id"])),
+        # a report snapshot reads each of its six tables once (one page each here)
+        ("ReportService.alumni_report", 6, lambda r: lambda: reports.alumni_report(refresh=True)),
+        ("ReportService.mentor_coverage_report", 6, lambda r: lambda: reports.mentor_coverage_report(refresh=True)),
+        ("ReportService.event_attendance_report", 6, lambda r: lambda: reports.event_attendance_report(refresh=True)),
+        ("ReportService.cohort_report", 6, lambda r: lambda: reports.cohort_report(refresh=True)),
+        # per table: the newest tombstone and one page of rows, or the tombstones and one page of changes
+        ("ExportService.export", 12, lambda r: lambda: exports.export(os.path.join(export_dir.name, "full"))),
+        ("ExportService.export (incremental)", 12, lambda r: (
+            exports.export(os.path.join(export_dir.name, "incremental")),
+            lambda: exports.export(os.path.join(export_dir.name, "incremental")))[-1]),
+        ("ExportService.export_info", 0, lambda r: (
+            exports.export(os.path.join(export_dir.name, "info")),
+            lambda: exports.export_info(os.path.join(export_dir.name, "info")))[-1]),
+        # a list served by a synced local replica never reaches the backend (a miss would cost 1)
+        ("AlumniService.list_alumni (replica)", 0, lambda r: _replica_alumni(
+            os.path.join(export_dir.name, "replica"), exports).list_alumni),
+    ]
+
+
+def main() -> int:
+    client = get_client()
+    cache = get_entity_cache()
+    alumni, students, events, mentorship = AlumniService(), StudentService(), EventService(), MentorshipServices()
+    reports = ReportService()
+    exports = ExportService()
+    failures = 0
+    print(f"{'method':45} {'used':>4} {'budget':>6}")
+    for name, limit, setup in scenarios(alumni, students, events, mentorship, reports, exports):
+        call = setup(_seed(alumni, students, events, mentorship))
+        cache.clear()
+        with RoundTripBudget(client, limit) as budget:
+            call()
+        status = "OVER" if budget.exceeded else "ok"
+        failures += budget.exceeded
+        print(f"{name:45} {budget.used:>4} {limit:>6}  {status}")
+    if failures:
+        print(f"{failures} method(s) exceeded their round-trip budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
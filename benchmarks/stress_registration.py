@@ -0,0 +1,191 @@
+# benchmarks/stress_registration.py
+"""Concurrency stress test for event capacity and the waitlist.
+
+    python -m benchmarks.stress_registration --users 2000 --capacity 300 --processes 4 --threads 16
+
+Creates one event with a capacity in a fresh SQLite database file and fires sign-ups at it
+from several processes (each with its own connection) and threads at once. A share of the
+users retry their sign-up and another share cancel right after signing up, so promotions
+off the waitlist race with new sign-ups. Afterwards it checks that:
+
+* no more seats were handed out than the capacity, and every seat that can be filled is;
+* ``seats_taken`` / ``waitlist_size`` and the per-type counts on the event match the
+  registrations table;
+* nobody is registered twice and every cancelled user is gone;
+* the waitlist is first come, first served (every seat holder signed up before everyone
+  still waiting).
+
+Exits 1 when an invariant is broken. ``--use-env`` runs against the backend configured by
+DB_BACKEND / SUPABASE_* instead of a scratch SQLite file. ``--write-behind`` sends the
+sign-ups through the registration journal (one journal per process), so the reported
+latencies are acknowledgement times; every worker flushes its journal before the checks.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+
+def _run_users(users: List[Tuple[int, str, bool, bool]], event_id: int, threads: int,
+               journal_dir: Optional[str] = None) -> Dict:
+    if journal_dir:
+        os.environ["REGISTRATION_WRITE_BEHIND"] = "1"
+        os.environ["REGISTRATION_JOURNAL_PATH"] = os.path.join(journal_dir, f"journal-{os.getpid()}.jsonl")
+    from src.services.event_services import EventError, EventService
+
+    service = EventService()
+
+    def one(user):
+        user_id, user_type, retry, cancel = user
+        latencies, errors = [], []
+        for attempt in range(2 if retry else 1):
+            start = time.perf_counter()
+            try:
+                service.register(event_id, user_id, user_type)
+            except EventError as e:
+                errors.append(str(e))
+            latencies.append(time.perf_counter() - start)
+        cancelled = False
+        if cancel:
+            start = time.perf_counter()
+            try:
+                service.cancel_registration(event_id, user_id, user_type)
+                cancelled = True
+            except EventError as e:
+                errors.append(str(e))
+            latencies.append(time.perf_counter() - start)
+        return latencies, errors, (user_id, user_type) if cancelled else None
+
+    result = {"latencies": [], "errors": [], "cancelled": []}
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for latencies, errors, cancelled in pool.map(one, users):
+            result["latencies"].extend(latencies)
+            result["errors"].extend(errors)
+            if cancelled:
+                result["cancelled"].append(cancelled)
+    if journal_dir:
+        start = time.perf_counter()
+        result["queue"] = service.flush_registrations(timeout=120)
+        result["drain_s"] = time.perf_counter() - start
+    return result
+
+
+def _check(event: Dict, rows: List[Dict], cancelled: set, capacity: int) -> List[str]:
+    problems = []
+    keys = [(r["user_id"], r["user_type"]) for r in rows]
+    registered = [r for r in rows if r["status"] == "registered"]
+    waitlisted = [r for r in rows if r["status"] == "waitlisted"]
+    if len(keys) != len(set(keys)):
+        problems.append(f"{len(keys) - len(set(keys))} duplicate registrations")
+    if set(keys) & cancelled:
+        problems.append(f"{len(set(keys) & cancelled)} cancelled users still registered")
+    if len(registered) > capacity:
+        problems.append(f"oversubscribed: {len(registered)} seats for capacity {capacity}")
+    if waitlisted and len(registered) < capacity:
+        problems.append(f"{capacity - len(registered)} free seats while {len(waitlisted)} users wait")
+    if event["seats_taken"] != len(registered):
+        problems.append(f"seats_taken is {event['seats_taken']} but {len(registered)} users hold a seat")
+    if event["waitlist_size"] != len(waitlisted):
+        problems.append(f"waitlist_size is {event['waitlist_size']} but {len(waitlisted)} users wait")
+    for user_type in ("alumni", "student"):
+        n = sum(1 for r in rows if r["user_type"] == user_type)
+        if event[f"{user_type}_count"] != n:
+            problems.append(f"{user_type}_count is {event[f'{user_type}_count']} but {n} {user_type} registrations exist")
+    if registered and waitlisted:
+        last_seat = max(r["registration_id"] for r in registered)
+        first_waiting = min(r["registration_id"] for r in waitlisted)
+        if last_seat > first_waiting:
+            problems.append("waitlist order violated: a later sign-up holds a seat while an earlier one waits")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stress_registration")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--capacity", type=int, default=300)
+    parser.add_argument("--processes", type=int, default=4, help="Processes, each with its own connection")
+    parser.add_argument("--threads", type=int, default=16, help="Threads per process")
+    parser.add_argument("--retry_share", type=float, default=0.2, help="Share of users who sign up twice")
+    parser.add_argument("--cancel_share", type=float, default=0.1, help="Share of users who cancel")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--use-env", action="store_true", help="Use the configured backend instead of a scratch SQLite file")
+    parser.add_argument("--write-behind", action="store_true", help="Sign up through the write-behind journal")
+    args = parser.parse_args(argv)
+
+    tmpdir = tempfile.mkdtemp(prefix="stress-registration-")
+    if not args.use_env:
+        os.environ["DB_BACKEND"] = "sqlite"
+        os.environ["SQLITE_PATH"] = os.path.join(tmpdir, "stress.db")
+
+    from src.dao.alumni_dao import AlumniDAO
+    from src.dao.cache import get_entity_cache
+    from src.dao.students_dao import StudentsDAO
+    from src.services.event_services import EventService
+
+    service = EventService()
+    event = service.add_event({"event_name": "Stress reunion", "event_date": "2030-01-01",
+                               "capacity": args.capacity})
+    event_id = event["event_id"]
+    rng = random.Random(args.seed)
+    # sign-ups are checked against the user tables, so the users have to exist
+    run = os.path.basename(tmpdir)
+    n_alumni = args.users // 2
+    alumni = AlumniDAO().create_many([{"name": f"Stress alumni {i}", "email": f"{run}-alumni-{i}@example.com"}
+                                      for i in range(n_alumni)])
+    students = StudentsDAO().create_many([{"name": f"Stress student {i}", "email": f"{run}-student-{i}@example.edu"}
+                                          for i in range(args.users - n_alumni)])
+    ids = [(a["alumni_id"], "alumni") for a in alumni] + [(s["student_id"], "student") for s in students]
+    users = [(user_id, user_type, rng.random() < args.retry_share, rng.random() < args.cancel_share)
+             for user_id, user_type in ids]
+    rng.shuffle(users)
+    shards = [users[i::args.processes] for i in range(args.processes)]
+
+    print(f"🏁 {args.users} users → event {event_id} (capacity {args.capacity}), "
+          f"{args.processes} processes × {args.threads} threads")
+    start = time.perf_counter()
+    # spawn, so every worker opens its own backend connection
+    with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+        results = pool.starmap(_run_users, [(shard, event_id, args.threads, tmpdir if args.write_behind else None)
+                                            for shard in shards])
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(l for r in results for l in r["latencies"])
+    errors = [e for r in results for e in r["errors"]]
+    cancelled = {tuple(c) for r in results for c in r["cancelled"]}
+    # the workers changed the counters, so skip this process's cached copy of the event
+    get_entity_cache().invalidate("events", event_id)
+    final = service.get_event(event_id)
+    rows = service.reg_dao.list_event_participants(event_id)
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+    print(f"   {len(latencies)} requests in {elapsed:.2f}s ({len(latencies) / elapsed:.0f}/s), "
+          f"p50 {pct(0.5):.2f} ms, p95 {pct(0.95):.2f} ms, p99 {pct(0.99):.2f} ms")
+    print(f"   seats {final['seats_taken']}/{final['capacity']}, waitlist {final['waitlist_size']}, "
+          f"cancelled {len(cancelled)}, errors {len(errors)}")
+    if args.write_behind:
+        queues = [r["queue"] for r in results]
+        print(f"   journal: {sum(q['flushed'] for q in queues)} flushed in {sum(q['flush_batches'] for q in queues)} "
+              f"batches, {sum(q['cancelled'] for q in queues)} cancelled before sending, "
+              f"slowest drain {max(r['drain_s'] for r in results):.2f}s")
+    for message in sorted(set(errors))[:5]:
+        print(f"   ⚠️ {message}")
+
+    problems = _check(final, rows, cancelled, args.capacity)
+    if errors:
+        problems.append(f"{len(errors)} requests failed")
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("✅ all invariants hold")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+-- 001: one registration per (event, user, user_type)
+-- Lets bulk registration upsert with ON CONFLICT DO NOTHING and stops duplicate sign-ups.
+
+BEGIN;
+
+-- keep the earliest registration of any duplicates already present
+DELETE FROM public.event_registrations a
+USING public.event_registrations b
+WHERE a.event_id = b.event_id
+  AND a.user_id = b.user_id
+  AND a.user_type = b.user_type
+  AND a.registration_id > b.registration_id;
+
+ALTER TABLE public.event_registrations
+    ADD CONSTRAINT event_registrations_event_user_key UNIQUE (event_id, user_id, user_type);
+
+COMMIT;
@@ -0,0 +1,176 @@
+-- 002: event capacity with an automatic waitlist
+-- Seat counts live on the event row and are kept current by the functions below, which
+-- the DAOs call over PostgREST RPC so that a sign-up or a cancellation is one request.
+-- Every function locks the event row first, so concurrent sign-ups for the same event are
+-- serialized and can never take more seats than the capacity.
+
+BEGIN;
+
+ALTER TABLE public.events
+    ADD COLUMN capacity integer CHECK (capacity IS NULL OR capacity >= 0),
+    ADD COLUMN seats_taken integer NOT NULL DEFAULT 0,
+    ADD COLUMN waitlist_size integer NOT NULL DEFAULT 0;
+
+ALTER TABLE public.event_registrations
+    ADD COLUMN status text NOT NULL DEFAULT 'registered' CHECK (status IN ('registered', 'waitlisted'));
+
+-- existing events have no capacity, so every current registration holds a seat
+UPDATE public.events e
+SET seats_taken = r.n
+FROM (SELECT event_id, count(*) AS n FROM public.event_registrations GROUP BY event_id) r
+WHERE r.event_id = e.event_id;
+
+-- promotion picks the oldest waitlisted registration of an event
+CREATE INDEX IF NOT EXISTS event_registrations_waitlist_idx
+    ON public.event_registrations (event_id, registration_id) WHERE status = 'waitlisted';
+
+
+-- Register one user. Returns the registration plus "created" (false when the user was
+-- already registered or waitlisted, which makes retries safe).
+CREATE OR REPLACE FUNCTION public.register_for_event(p_event_id bigint, p_user_id bigint, p_user_type text)
+RETURNS jsonb LANGUAGE plpgsql AS $$
+DECLARE
+    ev public.events;
+    reg public.event_registrations;
+BEGIN
+    SELECT * INTO ev FROM public.events WHERE event_id = p_event_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Event with ID % not found.', p_event_id USING ERRCODE = 'P0002';
+    END IF;
+
+    SELECT * INTO reg FROM public.event_registrations
+    WHERE event_id = p_event_id AND user_id = p_user_id AND user_type = p_user_type;
+    IF FOUND THEN
+        RETURN to_jsonb(reg) || jsonb_build_object('created', false);
+    END IF;
+
+    IF ev.capacity IS NULL OR ev.seats_taken < ev.capacity THEN
+        UPDATE public.events SET seats_taken = seats_taken + 1 WHERE event_id = p_event_id;
+        INSERT INTO public.event_registrations (event_id, user_id, user_type, status)
+        VALUES (p_event_id, p_user_id, p_user_type, 'registered') RETURNING * INTO reg;
+    ELSE
+        UPDATE public.events SET waitlist_size = waitlist_size + 1 WHERE event_id = p_event_id;
+        INSERT INTO public.event_registrations (event_id, user_id, user_type, status)
+        VALUES (p_event_id, p_user_id, p_user_type, 'waitlisted') RETURNING * INTO reg;
+    END IF;
+    RETURN to_jsonb(reg) || jsonb_build_object('created', true);
+END;
+$$;
+
+
+-- Register many users at once (bulk import). p_users is a JSON array of
+-- {"user_id": .., "user_type": ..}; returns only the newly created registrations.
+CREATE OR REPLACE FUNCTION public.register_many_for_event(p_event_id bigint, p_users jsonb)
+RETURNS jsonb LANGUAGE plpgsql AS $$
+DECLARE
+    ev public.events;
+    u jsonb;
+    reg public.event_registrations;
+    seats integer;
+    waiting integer;
+    created jsonb := '[]'::jsonb;
+BEGIN
+    SELECT * INTO ev FROM public.events WHERE event_id = p_event_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Event with ID % not found.', p_event_id USING ERRCODE = 'P0002';
+    END IF;
+    seats := ev.seats_taken;
+    waiting := ev.waitlist_size;
+
+    FOR u IN SELECT * FROM jsonb_array_elements(p_users) LOOP
+        INSERT INTO public.event_registrations (event_id, user_id, user_type, status)
+        VALUES (p_event_id, (u->>'user_id')::bigint, u->>'user_type',
+                CASE WHEN ev.capacity IS NULL OR seats < ev.capacity THEN 'registered' ELSE 'waitlisted' END)
+        ON CONFLICT (event_id, user_id, user_type) DO NOTHING
+        RETURNING * INTO reg;
+        IF FOUND THEN
+            IF reg.status = 'registered' THEN seats := seats + 1; ELSE waiting := waiting + 1; END IF;
+            created := created || to_jsonb(reg);
+        END IF;
+    END LOOP;
+
+    UPDATE public.events SET seats_taken = seats, waitlist_size = waiting WHERE event_id = p_event_id;
+    RETURN created;
+END;
+$$;
+
+
+-- Cancel one registration. A freed seat goes to the oldest waitlisted user.
+-- Returns {"cancelled": registration or null, "promoted": registration or null}.
+CREATE OR REPLACE FUNCTION public.cancel_registration(p_event_id bigint, p_user_id bigint, p_user_type text)
+RETURNS jsonb LANGUAGE plpgsql AS $$
+DECLARE
+    reg public.event_registrations;
+    promoted public.event_registrations;
+BEGIN
+    PERFORM 1 FROM public.events WHERE event_id = p_event_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Event with ID % not found.', p_event_id USING ERRCODE = 'P0002';
+    END IF;
+
+    DELETE FROM public.event_registrations
+    WHERE event_id = p_event_id AND user_id = p_user_id AND user_type = p_user_type
+    RETURNING * INTO reg;
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('cancelled', NULL, 'promoted', NULL);
+    END IF;
+
+    IF reg.status = 'waitlisted' THEN
+        UPDATE public.events SET waitlist_size = waitlist_size - 1 WHERE event_id = p_event_id;
+        RETURN jsonb_build_object('cancelled', to_jsonb(reg), 'promoted', NULL);
+    END IF;
+
+    UPDATE public.event_registrations SET status = 'registered'
+    WHERE registration_id = (
+        SELECT registration_id FROM public.event_registrations
+        WHERE event_id = p_event_id AND status = 'waitlisted'
+        ORDER BY registration_id LIMIT 1
+    )
+    RETURNING * INTO promoted;
+    IF FOUND THEN
+        UPDATE public.events SET waitlist_size = waitlist_size - 1 WHERE event_id = p_event_id;
+        RETURN jsonb_build_object('cancelled', to_jsonb(reg), 'promoted', to_jsonb(promoted));
+    END IF;
+    UPDATE public.events SET seats_taken = seats_taken - 1 WHERE event_id = p_event_id;
+    RETURN jsonb_build_object('cancelled', to_jsonb(reg), 'promoted', NULL);
+END;
+$$;
+
+
+-- Change an event's capacity (NULL = unlimited). Raising it promotes waitlisted users in
+-- sign-up order; lowering it below the seats already taken keeps those seats.
+-- Returns {"event": event, "promoted": [registrations]}.
+CREATE OR REPLACE FUNCTION public.set_event_capacity(p_event_id bigint, p_capacity integer)
+RETURNS jsonb LANGUAGE plpgsql AS $$
+DECLARE
+    ev public.events;
+    promoted jsonb;
+    n integer;
+BEGIN
+    SELECT * INTO ev FROM public.events WHERE event_id = p_event_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Event with ID % not found.', p_event_id USING ERRCODE = 'P0002';
+    END IF;
+
+    WITH next AS (
+        SELECT registration_id FROM public.event_registrations
+        WHERE event_id = p_event_id AND status = 'waitlisted'
+        ORDER BY registration_id
+        LIMIT CASE WHEN p_capacity IS NULL THEN NULL ELSE greatest(p_capacity - ev.seats_taken, 0) END
+    ), moved AS (
+        UPDATE public.event_registrations r SET status = 'registered'
+        FROM next WHERE r.registration_id = next.registration_id
+        RETURNING r.*
+    )
+    SELECT coalesce(jsonb_agg(to_jsonb(moved) ORDER BY moved.registration_id), '[]'::jsonb), count(*)
+    INTO promoted, n FROM moved;
+
+    UPDATE public.events
+    SET capacity = p_capacity, seats_taken = seats_taken + n, waitlist_size = waitlist_size - n
+    WHERE event_id = p_event_id
+    RETURNING * INTO ev;
+    RETURN jsonb_build_object('event', to_jsonb(ev), 'promoted', promoted);
+END;
+$$;
+
+COMMIT;
@@ -0,0 +1,72 @@
+-- 003: unique emails and a user check on event registrations
+-- add_alumni / create_student insert straight away and rely on these constraints instead of
+-- looking the email up first, so a duplicate comes back as a unique violation (23505) even
+-- when two requests race. Sign-ups for a user that does not exist fail with a foreign-key
+-- violation (23503).
+
+BEGIN;
+
+-- refuse to run over duplicates: they are people, so merging them is a manual decision
+DO $$
+DECLARE
+    dup_alumni integer;
+    dup_students integer;
+BEGIN
+    SELECT count(*) INTO dup_alumni FROM (SELECT email FROM public.alumni GROUP BY email HAVING count(*) > 1) d;
+    SELECT count(*) INTO dup_students FROM (SELECT email FROM public.students GROUP BY email HAVING count(*) > 1) d;
+    IF dup_alumni > 0 OR dup_students > 0 THEN
+        RAISE EXCEPTION '% alumni and % student emails are used more than once; merge those rows before applying 003',
+            dup_alumni, dup_students;
+    END IF;
+END;
+$$;
+
+ALTER TABLE public.alumni ADD CONSTRAINT alumni_email_key UNIQUE (email);
+ALTER TABLE public.students ADD CONSTRAINT students_email_key UNIQUE (email);
+
+
+-- user_id points at alumni or students depending on user_type, which a FOREIGN KEY
+-- cannot express, so a trigger enforces it with the same error code.
+CREATE OR REPLACE FUNCTION public.check_registration_user()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.user_type = 'alumni' AND NOT EXISTS (SELECT 1 FROM public.alumni WHERE alumni_id = NEW.user_id)
+       OR NEW.user_type = 'student' AND NOT EXISTS (SELECT 1 FROM public.students WHERE student_id = NEW.user_id) THEN
+        RAISE EXCEPTION '% with ID % not found.', initcap(NEW.user_type), NEW.user_id
+            USING ERRCODE = 'foreign_key_violation';
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER event_registrations_user_fkey
+    BEFORE INSERT OR UPDATE OF user_id, user_type ON public.event_registrations
+    FOR EACH ROW EXECUTE FUNCTION public.check_registration_user();
+
+
+-- The other half of the foreign key: deleting a user cancels their registrations through
+-- cancel_registration (002), so counters stay right and freed seats go to the waitlist.
+-- TG_ARGV: the user_type and the key column of the table. Events are locked in event_id
+-- order, like any other multi-event writer, to avoid deadlocks.
+CREATE OR REPLACE FUNCTION public.cancel_user_registrations()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    uid bigint := (to_jsonb(OLD) ->> TG_ARGV[1])::bigint;
+    r record;
+BEGIN
+    FOR r IN SELECT event_id FROM public.event_registrations
+             WHERE user_id = uid AND user_type = TG_ARGV[0] ORDER BY event_id LOOP
+        PERFORM public.cancel_registration(r.event_id, uid, TG_ARGV[0]);
+    END LOOP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER alumni_cancel_registrations
+    AFTER DELETE ON public.alumni
+    FOR EACH ROW EXECUTE FUNCTION public.cancel_user_registrations('alumni', 'alumni_id');
+CREATE TRIGGER students_cancel_registrations
+    AFTER DELETE ON public.students
+    FOR EACH ROW EXECUTE FUNCTION public.cancel_user_registrations('student', 'student_id');
+
+COMMIT;
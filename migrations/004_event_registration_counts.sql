@@ -0,0 +1,90 @@
+-- 004: per-event registration counts by user type
+-- alumni_count / student_count count every registration of an event (seat or waitlist), so
+-- the event list can show participation without reading event_registrations. Triggers keep
+-- them current for every write path: the registration functions, bulk imports, direct
+-- deletes and the cascade from a deleted event.
+
+BEGIN;
+
+ALTER TABLE public.events
+    ADD COLUMN alumni_count integer NOT NULL DEFAULT 0,
+    ADD COLUMN student_count integer NOT NULL DEFAULT 0;
+
+UPDATE public.events e
+SET alumni_count = c.alumni, student_count = c.students
+FROM (
+    SELECT event_id,
+           count(*) FILTER (WHERE user_type = 'alumni') AS alumni,
+           count(*) FILTER (WHERE user_type = 'student') AS students
+    FROM public.event_registrations
+    GROUP BY event_id
+) c
+WHERE c.event_id = e.event_id;
+
+
+-- Inserts and deletes are counted once per statement, so a bulk registration of a cohort
+-- is one UPDATE per event rather than one per row.
+CREATE OR REPLACE FUNCTION public.count_registrations_inserted()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE public.events e
+    SET alumni_count = e.alumni_count + c.alumni, student_count = e.student_count + c.students
+    FROM (
+        SELECT event_id,
+               count(*) FILTER (WHERE user_type = 'alumni') AS alumni,
+               count(*) FILTER (WHERE user_type = 'student') AS students
+        FROM new_rows GROUP BY event_id
+    ) c
+    WHERE c.event_id = e.event_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.count_registrations_deleted()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE public.events e
+    SET alumni_count = e.alumni_count - c.alumni, student_count = e.student_count - c.students
+    FROM (
+        SELECT event_id,
+               count(*) FILTER (WHERE user_type = 'alumni') AS alumni,
+               count(*) FILTER (WHERE user_type = 'student') AS students
+        FROM old_rows GROUP BY event_id
+    ) c
+    WHERE c.event_id = e.event_id;
+    RETURN NULL;
+END;
+$$;
+
+-- moving a registration to another event or user type is rare; handled row by row
+CREATE OR REPLACE FUNCTION public.count_registration_moved()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE public.events
+    SET alumni_count = alumni_count - (OLD.user_type = 'alumni')::int,
+        student_count = student_count - (OLD.user_type = 'student')::int
+    WHERE event_id = OLD.event_id;
+    UPDATE public.events
+    SET alumni_count = alumni_count + (NEW.user_type = 'alumni')::int,
+        student_count = student_count + (NEW.user_type = 'student')::int
+    WHERE event_id = NEW.event_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER event_registrations_count_insert
+    AFTER INSERT ON public.event_registrations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.count_registrations_inserted();
+
+CREATE TRIGGER event_registrations_count_delete
+    AFTER DELETE ON public.event_registrations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.count_registrations_deleted();
+
+CREATE TRIGGER event_registrations_count_move
+    AFTER UPDATE OF event_id, user_type ON public.event_registrations
+    FOR EACH ROW WHEN (OLD.event_id IS DISTINCT FROM NEW.event_id OR OLD.user_type IS DISTINCT FROM NEW.user_type)
+    EXECUTE FUNCTION public.count_registration_moved();
+
+COMMIT;
@@ -0,0 +1,100 @@
+-- 005: change tracking for incremental exports
+-- Every exported table gets updated_at, set on insert and on every update, and an index on
+-- (updated_at, key) so "rows changed since a watermark" is an index range scan in keyset
+-- order. Deletes leave a row in deleted_rows, so an incremental export can drop them too.
+-- The backfill rewrites each table once; run it outside peak hours on large installs.
+
+BEGIN;
+
+ALTER TABLE public.alumni ADD COLUMN updated_at timestamptz;
+ALTER TABLE public.students ADD COLUMN updated_at timestamptz;
+ALTER TABLE public.events ADD COLUMN updated_at timestamptz;
+ALTER TABLE public.mentors ADD COLUMN updated_at timestamptz;
+ALTER TABLE public.mentorship_assignments ADD COLUMN updated_at timestamptz;
+ALTER TABLE public.event_registrations ADD COLUMN updated_at timestamptz;
+
+UPDATE public.alumni SET updated_at = created_at;
+UPDATE public.students SET updated_at = created_at;
+UPDATE public.events SET updated_at = created_at;
+UPDATE public.mentors SET updated_at = created_at;
+UPDATE public.mentorship_assignments SET updated_at = created_at;
+UPDATE public.event_registrations SET updated_at = registered_at;
+
+ALTER TABLE public.alumni ALTER COLUMN updated_at SET DEFAULT now(), ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE public.students ALTER COLUMN updated_at SET DEFAULT now(), ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE public.events ALTER COLUMN updated_at SET DEFAULT now(), ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE public.mentors ALTER COLUMN updated_at SET DEFAULT now(), ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE public.mentorship_assignments ALTER COLUMN updated_at SET DEFAULT now(), ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE public.event_registrations ALTER COLUMN updated_at SET DEFAULT now(), ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE INDEX alumni_updated_at_idx ON public.alumni (updated_at, alumni_id);
+CREATE INDEX students_updated_at_idx ON public.students (updated_at, student_id);
+CREATE INDEX events_updated_at_idx ON public.events (updated_at, event_id);
+CREATE INDEX mentors_updated_at_idx ON public.mentors (updated_at, mentor_id);
+CREATE INDEX mentorship_assignments_updated_at_idx ON public.mentorship_assignments (updated_at, assignment_id);
+CREATE INDEX event_registrations_updated_at_idx ON public.event_registrations (updated_at, registration_id);
+
+
+CREATE OR REPLACE FUNCTION public.touch_updated_at()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER alumni_touch BEFORE UPDATE ON public.alumni
+    FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+CREATE TRIGGER students_touch BEFORE UPDATE ON public.students
+    FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+-- also fires for the seat and registration counters kept by 002 / 004
+CREATE TRIGGER events_touch BEFORE UPDATE ON public.events
+    FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+CREATE TRIGGER mentors_touch BEFORE UPDATE ON public.mentors
+    FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+CREATE TRIGGER mentorship_assignments_touch BEFORE UPDATE ON public.mentorship_assignments
+    FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+CREATE TRIGGER event_registrations_touch BEFORE UPDATE ON public.event_registrations
+    FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+
+
+-- Tombstones. Only the key is kept; an export needs nothing else to drop the row. Old
+-- entries can be pruned once every export has moved its watermark past them.
+CREATE TABLE public.deleted_rows (
+    deletion_id bigserial PRIMARY KEY,
+    table_name  text NOT NULL,
+    row_id      bigint NOT NULL,
+    deleted_at  timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX deleted_rows_table_idx ON public.deleted_rows (table_name, deleted_at, deletion_id);
+
+-- one INSERT per statement; TG_ARGV[0] names the table's key column
+CREATE OR REPLACE FUNCTION public.record_deleted_rows()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    EXECUTE format('INSERT INTO public.deleted_rows (table_name, row_id) SELECT %L, %I FROM old_rows',
+                   TG_TABLE_NAME, TG_ARGV[0]);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER alumni_deleted AFTER DELETE ON public.alumni
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.record_deleted_rows('alumni_id');
+CREATE TRIGGER students_deleted AFTER DELETE ON public.students
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.record_deleted_rows('student_id');
+CREATE TRIGGER events_deleted AFTER DELETE ON public.events
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.record_deleted_rows('event_id');
+CREATE TRIGGER mentors_deleted AFTER DELETE ON public.mentors
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.record_deleted_rows('mentor_id');
+CREATE TRIGGER mentorship_assignments_deleted AFTER DELETE ON public.mentorship_assignments
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.record_deleted_rows('assignment_id');
+CREATE TRIGGER event_registrations_deleted AFTER DELETE ON public.event_registrations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.record_deleted_rows('registration_id');
+
+COMMIT;
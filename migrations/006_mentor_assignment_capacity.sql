@@ -0,0 +1,48 @@
+-- 006: mentor capacity enforced when a cohort is written
+-- assign_cohort works out each mentor's free places from a snapshot of active assignments,
+-- so a second cohort run or a join_mentorship landing in between could take a mentor past
+-- their limit. The insert goes through the function below instead, which re-counts under a
+-- lock and leaves out the assignments that no longer fit.
+
+BEGIN;
+
+-- Insert the p_rows that fit. p_rows is a JSON array of mentorship_assignments rows
+-- ({"mentor_id", "student_id", "start_date", ...}); p_limits maps mentor_id to the most
+-- active assignments that mentor may have. Returns {"created": [...], "over_capacity": [...]},
+-- the latter holding the p_rows left out.
+-- The mentors are locked in mentor_id order, like events in the registration functions. A
+-- FOR UPDATE lock also waits for inserts that reference the mentor (they take KEY SHARE),
+-- so single assignments made in the meantime are counted.
+CREATE OR REPLACE FUNCTION public.assign_within_capacity(p_rows jsonb, p_limits jsonb)
+RETURNS jsonb LANGUAGE plpgsql AS $$
+DECLARE
+    r jsonb;
+    mid bigint;
+    active integer;
+    a public.mentorship_assignments;
+    created jsonb := '[]'::jsonb;
+    rejected jsonb := '[]'::jsonb;
+BEGIN
+    PERFORM 1 FROM public.mentors
+    WHERE mentor_id IN (SELECT (value ->> 'mentor_id')::bigint FROM jsonb_array_elements(p_rows))
+    ORDER BY mentor_id FOR UPDATE;
+
+    FOR r IN SELECT * FROM jsonb_array_elements(p_rows) LOOP
+        mid := (r ->> 'mentor_id')::bigint;
+        SELECT count(*) INTO active FROM public.mentorship_assignments
+        WHERE mentor_id = mid AND (end_date IS NULL OR end_date::date >= current_date);
+        IF active < coalesce((p_limits ->> mid::text)::integer, 0) THEN
+            INSERT INTO public.mentorship_assignments (mentor_id, student_id, start_date, end_date)
+            SELECT mentor_id, student_id, start_date, end_date
+            FROM jsonb_populate_record(NULL::public.mentorship_assignments, r)
+            RETURNING * INTO a;
+            created := created || to_jsonb(a);
+        ELSE
+            rejected := rejected || r;
+        END IF;
+    END LOOP;
+    RETURN jsonb_build_object('created', created, 'over_capacity', rejected);
+END;
+$$;
+
+COMMIT;
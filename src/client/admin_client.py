@@ -1,11 +1,24 @@
 # src/cli/admin_cli.py
 import argparse
 import json
-from src.services.event_services import EventService
+from src.client.output import add_profile_arguments, json_default, print_json_stream, run_command
+from src.services.bulk_import import read_records
+from src.services.columnar_export import EXPORT_TABLES
+from src.services.event_services import EventService, EventError
+from src.services.export_services import ExportService, ExportError
+from src.services.mentorship_services import DEFAULT_MENTOR_CAPACITY, MentorshipServices, MentorshipError
+from src.services.replica import get_local_replica
+from src.services.report_services import ReportService, ReportError
+from src.services.reporting import ALUMNI_GROUPINGS
+from src.services.student_services import StudentService
 
 class AdminCLI:
     def __init__(self):
         self.event_service = EventService()
+        self.mentorship_service = MentorshipServices()
+        self.student_service = StudentService()
+        self.report_service = ReportService()
+        self.export_service = ExportService()
 
     # --- EVENT COMMANDS ---
     def cmd_event_add(self, args):
@@ -13,20 +26,203 @@ class AdminCLI:
             "event_name": args.name,
             "event_date": args.date,
             "location": args.location,
-            "description": args.description
+            "description": args.description,
+            "capacity": args.capacity,
         }
         event = self.event_service.add_event(payload)
         print("✅ Event created:")
-        print(json.dumps(event, indent=2, default=str))
+        print(json.dumps(event, indent=2, default=json_default))
+
+    def cmd_event_capacity(self, args):
+        try:
+            result = self.event_service.set_capacity(args.event_id, None if args.unlimited else args.capacity)
+        except EventError as e:
+            print("❌ Error:", e)
+            return
+        event = result["event"]
+        print(f"✅ Event {args.event_id}: capacity {event['capacity'] if event['capacity'] is not None else 'unlimited'}, "
+              f"{event['seats_taken']} seats taken, {event['waitlist_size']} waitlisted, "
+              f"{len(result['promoted'])} promoted off the waitlist")
+        print(json.dumps(result, indent=2, default=json_default))
 
     def cmd_event_list(self, args):
-        events = self.event_service.list_events()
         print("📅 All Events:")
-        print(json.dumps(events, indent=2, default=str))
+        print_json_stream(self.event_service.iter_events(page_size=args.page_size))
+
+    def cmd_event_register(self, args):
+        users = []
+        try:
+            for spec in args.users or []:
+                user_id, _, user_type = spec.partition(":")
+                users.append((int(user_id), user_type or "student"))
+            if args.file:
+                for line_no, row, error in read_records(args.file):
+                    if error or row.get("user_id") in (None, ""):
+                        print(f"⚠️ Skipping line {line_no}: {error or 'missing user_id'}")
+                        continue
+                    users.append((int(row["user_id"]), row.get("user_type") or "student"))
+        except (OSError, ValueError) as e:
+            print("❌ Error:", e)
+            return
+        if not users:
+            print("❌ Error: no users given (use --users and/or --file)")
+            return
+        try:
+            report = self.event_service.bulk_register(args.event_id, users, args.batch_size)
+        except EventError as e:
+            print("❌ Error:", e)
+            return
+        print(f"✅ Event {args.event_id}: {len(report['registered'])} newly registered "
+              f"({len(report['waitlisted'])} on the waitlist), {len(report['already_registered'])} already registered")
+        print(json.dumps(report, indent=2, default=json_default))
+
+    def cmd_event_participants(self, args):
+        try:
+            participants = self.event_service.list_event_participants(args.event_id)
+        except EventError as e:
+            print("❌ Error:", e)
+            return
+        print(f"👥 {len(participants)} participants for event {args.event_id}:")
+        print(json.dumps(participants, indent=2, default=json_default))
+
+    def cmd_event_counts(self, args):
+        counts = self.event_service.get_registration_counts(args.event_ids)
+        for event_id in args.event_ids:
+            if event_id not in counts:
+                print(f"⚠️ Event {event_id} not found")
+        print("👥 Registrations per event:")
+        print(json.dumps(counts, indent=2, default=json_default))
+
+    def cmd_event_queue(self, args):
+        try:
+            metrics = self.event_service.flush_registrations(args.timeout) if args.flush else self.event_service.registration_queue()
+        except EventError as e:
+            print("❌ Error:", e)
+            return
+        if not metrics["enabled"]:
+            print("ℹ️ Write-behind registration is off (set REGISTRATION_WRITE_BEHIND=1 to enable)")
+            return
+        print(f"📨 {metrics['queue_depth']} registrations pending, {metrics['flushed']} flushed, "
+              f"{metrics['rejected']} rejected, {metrics['flush_failures']} failed flushes")
+        print(json.dumps(metrics, indent=2, default=json_default))
+
+    # --- MENTORSHIP COMMANDS ---
+    def cmd_assign_cohort(self, args):
+        try:
+            student_ids = list(args.students or [])
+            if args.file:
+                for line_no, row, error in read_records(args.file):
+                    if error or row.get("student_id") in (None, ""):
+                        print(f"⚠️ Skipping line {line_no}: {error or 'missing student_id'}")
+                        continue
+                    student_ids.append(int(row["student_id"]))
+            if args.course or args.year:
+                filters = {k: v for k, v in (("course", args.course), ("year", args.year)) if v is not None}
+                student_ids.extend(s["student_id"] for s in self.student_service.iter_students(filters))
+            capacities = {}
+            if args.capacities:
+                for line_no, row, error in read_records(args.capacities):
+                    if error or row.get("mentor_id") in (None, "") or row.get("capacity") in (None, ""):
+                        print(f"⚠️ Skipping capacity line {line_no}: {error or 'needs mentor_id and capacity'}")
+                        continue
+                    capacities[int(row["mentor_id"])] = int(row["capacity"])
+        except (OSError, ValueError) as e:
+            print("❌ Error:", e)
+            return
+        try:
+            report = self.mentorship_service.assign_cohort(
+                student_ids, args.capacity, capacities, not args.include_assigned, args.dry_run, args.start_date
+            )
+        except MentorshipError as e:
+            print("❌ Error:", e)
+            return
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, default=json_default)
+        summary = {k: v for k, v in report.items() if k != "assignments"}
+        if args.dry_run:
+            print(f"🧪 Dry run: {report['assigned']} of {report['students']} students would be assigned")
+        else:
+            print(f"✅ {report['written']} assignments written for {report['students']} students")
+            if report["over_capacity"]:
+                print(f"⚠️ {len(report['over_capacity'])} students not assigned: their mentor filled up "
+                      "while the cohort was being planned; run the cohort again to place them")
+        print(json.dumps(summary, indent=2, default=json_default))
+
+    # --- REPORT COMMANDS ---
+    def _print_report(self, title, report):
+        info = report.pop("snapshot")
+        rows = sum(info["rows"].values())
+        print(f"📊 {title} ({rows} rows loaded in {info['load_seconds']}s at {info['loaded_at']})")
+        print(json.dumps(report, indent=2, default=json_default))
+
+    def cmd_report_alumni(self, args):
+        try:
+            report = self.report_service.alumni_report(args.by, args.top, args.refresh)
+        except ReportError as e:
+            print("❌ Error:", e)
+            return
+        self._print_report(f"Alumni by {args.by}", report)
+
+    def cmd_report_mentors(self, args):
+        self._print_report("Mentor coverage", self.report_service.mentor_coverage_report(args.refresh))
+
+    def cmd_report_events(self, args):
+        self._print_report("Event attendance", self.report_service.event_attendance_report(args.top, args.refresh))
+
+    def cmd_report_cohorts(self, args):
+        self._print_report("Cohort trends", self.report_service.cohort_report(args.refresh))
+
+    # --- EXPORT COMMANDS ---
+    def cmd_export_run(self, args):
+        try:
+            result = self.export_service.export(args.out, args.tables, args.full, args.page_size)
+        except ExportError as e:
+            print("❌ Error:", e)
+            return
+        for table, info in result["tables"].items():
+            print(f"📦 {table}: {info['mode']}, {info['rows']} rows ({info['fetched']} fetched, "
+                  f"{info['deleted']} deleted) in {info['seconds']}s")
+        print(json.dumps(result, indent=2, default=json_default))
+
+    def cmd_export_info(self, args):
+        try:
+            manifest = self.export_service.export_info(args.out)
+        except ExportError as e:
+            print("❌ Error:", e)
+            return
+        print(f"📦 Export in {args.out}:")
+        print(json.dumps(manifest, indent=2, default=json_default))
+
+    def cmd_export_head(self, args):
+        try:
+            rows = self.export_service.read_export(args.out, args.table, args.columns, args.limit)
+        except ExportError as e:
+            print("❌ Error:", e)
+            return
+        print_json_stream(rows)
+
+    # --- LOCAL REPLICA ---
+    def cmd_replica(self, args):
+        replica = get_local_replica()
+        if replica is None:
+            print("ℹ️ The local replica is off (set REPLICA_ENABLED=1 to enable)")
+            return
+        if args.refresh:
+            try:
+                replica.refresh()
+            except ExportError as e:
+                print("❌ Error:", e)
+                return
+        metrics = replica.metrics()
+        for table, info in metrics["tables"].items():
+            print(f"🗂️ {table}: {info['rows']} rows, synced {info['age_seconds']}s ago")
+        print(json.dumps(metrics, indent=2, default=json_default))
 
 
 def build_admin_parser():
     parser = argparse.ArgumentParser(prog="admin-cli")
+    add_profile_arguments(parser)
     sub = parser.add_subparsers(dest="entity")
 
     cli = AdminCLI()
@@ -41,22 +237,119 @@ def build_admin_parser():
     add_e.add_argument("--date", required=True)
     add_e.add_argument("--location")
     add_e.add_argument("--description")
+    add_e.add_argument("--capacity", type=int, help="Max seats; later sign-ups go on a waitlist")
     add_e.set_defaults(func=cli.cmd_event_add)
 
     # List Events
     list_e = event_sub.add_parser("list")
+    list_e.add_argument("--page_size", type=int, default=1000)
     list_e.set_defaults(func=cli.cmd_event_list)
 
+    # Capacity
+    cap_e = event_sub.add_parser("set-capacity", help="Change capacity; raising it promotes waitlisted users")
+    cap_e.add_argument("--event_id", type=int, required=True)
+    cap_group = cap_e.add_mutually_exclusive_group(required=True)
+    cap_group.add_argument("--capacity", type=int)
+    cap_group.add_argument("--unlimited", action="store_true")
+    cap_e.set_defaults(func=cli.cmd_event_capacity)
+
+    # Bulk registration
+    reg_e = event_sub.add_parser("register", help="Register many users for an event (idempotent)")
+    reg_e.add_argument("--event_id", type=int, required=True)
+    reg_e.add_argument("--users", nargs="*", help="user_id:user_type pairs, e.g. 12:student 7:alumni")
+    reg_e.add_argument("--file", help=".csv or .ndjson file with user_id,user_type columns")
+    reg_e.add_argument("--batch_size", type=int, default=500)
+    reg_e.set_defaults(func=cli.cmd_event_register)
+
+    # Participants with names
+    part_e = event_sub.add_parser("participants", help="List an event's registered users with name and email")
+    part_e.add_argument("--event_id", type=int, required=True)
+    part_e.set_defaults(func=cli.cmd_event_participants)
+
+    # Registration counts
+    counts_e = event_sub.add_parser("counts", help="Registration counts by user type for many events")
+    counts_e.add_argument("--event_ids", nargs="+", type=int, required=True)
+    counts_e.set_defaults(func=cli.cmd_event_counts)
+
+    # Write-behind queue
+    queue_e = event_sub.add_parser("queue", help="Show the write-behind registration queue")
+    queue_e.add_argument("--flush", action="store_true", help="Send pending registrations now and wait")
+    queue_e.add_argument("--timeout", type=float, default=30.0)
+    queue_e.set_defaults(func=cli.cmd_event_queue)
+
+    # --- MENTORSHIP ---
+    mentorship_parser = sub.add_parser("mentorship")
+    mentorship_sub = mentorship_parser.add_subparsers(dest="action")
+
+    cohort = mentorship_sub.add_parser("assign-cohort", help="Assign a cohort of students to mentors within capacity")
+    cohort.add_argument("--students", nargs="*", type=int, help="Student IDs")
+    cohort.add_argument("--file", help=".csv or .ndjson file with a student_id column")
+    cohort.add_argument("--course", help="Add every student of this course")
+    cohort.add_argument("--year", type=int, help="Add every student of this year")
+    cohort.add_argument("--capacity", type=int, default=DEFAULT_MENTOR_CAPACITY, help="Max active mentees per mentor")
+    cohort.add_argument("--capacities", help=".csv or .ndjson file with mentor_id,capacity overrides")
+    cohort.add_argument("--include_assigned", action="store_true", help="Also assign students who already have a mentor")
+    cohort.add_argument("--start_date")
+    cohort.add_argument("--dry_run", action="store_true", help="Compute and report, write nothing")
+    cohort.add_argument("--report", help="Write the full report, including every assignment, to this JSON file")
+    cohort.set_defaults(func=cli.cmd_assign_cohort)
+
+    # --- REPORTS ---
+    report_parser = sub.add_parser("report")
+    report_sub = report_parser.add_subparsers(dest="action")
+
+    alumni_r = report_sub.add_parser("alumni", help="Alumni per group with mentoring and event participation")
+    alumni_r.add_argument("--by", choices=ALUMNI_GROUPINGS, default="industry")
+    alumni_r.add_argument("--top", type=int, help="Only the N largest groups")
+    alumni_r.set_defaults(func=cli.cmd_report_alumni)
+
+    mentors_r = report_sub.add_parser("mentors", help="Mentor load and student coverage")
+    mentors_r.set_defaults(func=cli.cmd_report_mentors)
+
+    events_r = report_sub.add_parser("events", help="Registrations per event and month")
+    events_r.add_argument("--top", type=int, default=20, help="Number of events to list")
+    events_r.set_defaults(func=cli.cmd_report_events)
+
+    cohorts_r = report_sub.add_parser("cohorts", help="Alumni and student cohorts by year")
+    cohorts_r.set_defaults(func=cli.cmd_report_cohorts)
+
+    for report_r in (alumni_r, mentors_r, events_r, cohorts_r):
+        report_r.add_argument("--refresh", action="store_true", help="Reload the snapshot instead of reusing it")
+
+    # --- EXPORT ---
+    export_parser = sub.add_parser("export")
+    export_sub = export_parser.add_subparsers(dest="action")
+
+    run_x = export_sub.add_parser("run", help="Export tables to columnar .npy files; incremental after the first run")
+    run_x.add_argument("--out", required=True, help="Export directory")
+    run_x.add_argument("--tables", nargs="*", choices=list(EXPORT_TABLES), help="Default: every table")
+    run_x.add_argument("--full", action="store_true", help="Re-export everything instead of the changes")
+    run_x.add_argument("--page_size", type=int, default=1000)
+    run_x.set_defaults(func=cli.cmd_export_run)
+
+    info_x = export_sub.add_parser("info", help="Tables, row counts and watermarks of an export")
+    info_x.add_argument("--out", required=True, help="Export directory")
+    info_x.set_defaults(func=cli.cmd_export_info)
+
+    head_x = export_sub.add_parser("head", help="Print rows of an exported table, read memory-mapped")
+    head_x.add_argument("--out", required=True, help="Export directory")
+    head_x.add_argument("--table", required=True, choices=list(EXPORT_TABLES))
+    head_x.add_argument("--columns", nargs="*")
+    head_x.add_argument("--limit", type=int, default=20)
+    head_x.set_defaults(func=cli.cmd_export_head)
+
+    # --- LOCAL REPLICA ---
+    replica_parser = sub.add_parser("replica", help="Show the local read replica's tables and hit counters")
+    replica_parser.add_argument("--refresh", action="store_true", help="Sync it with the backend first")
+    replica_parser.set_defaults(func=cli.cmd_replica)
+
     return parser
 
 
 def main():
     parser = build_admin_parser()
     args = parser.parse_args()
-    if hasattr(args, "func"):
-        args.func(args)
-    else:
-        parser.print_help()
+    run_command(parser, args)
 
 
 if __name__ == "__main__":
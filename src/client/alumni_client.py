@@ -1,5 +1,6 @@
 # src/cli/alumni_cli.py
 import json
+from src.client.output import add_profile_arguments, json_default, print_json_stream, run_command
 from src.services.alumni_services import AlumniService, AlumniError
 from src.services.mentorship_services import MentorshipServices, MentorshipError
 class AlumniCLI:
@@ -19,7 +20,7 @@ class AlumniCLI:
         try:
             a = self.alumni_service.add_alumni(payload)
             print("✅ Alumni added:")
-            print(json.dumps(a, indent=2, default=str))
+            print(json.dumps(a, indent=2, default=json_default))
         except AlumniError as e:
 
             print("❌ Error:", e)
@@ -34,7 +35,7 @@ class AlumniCLI:
         try:
             a = self.alumni_service.update_alumni(args.alumni_id, updates)
             print("✅ Alumni updated:")
-            print(json.dumps(a, indent=2, default=str))
+            print(json.dumps(a, indent=2, default=json_default))
         except AlumniError as e:
             print("❌ Error:", e)
 
@@ -42,43 +43,79 @@ class AlumniCLI:
         try:
             a = self.alumni_service.remove_alumni(args.alumni_id)
             print("🗑️ Alumni deleted:")
-            print(json.dumps(a, indent=2, default=str))
+            print(json.dumps(a, indent=2, default=json_default))
         except AlumniError as e:
             print("❌ Error:", e)
 
     def cmd_list_alumni(self, args):
         try:
-            a_list = self.alumni_service.list_alumni()
             print("📋 Alumni list:")
-            print(json.dumps(a_list, indent=2, default=str))
+            print_json_stream(self.alumni_service.iter_alumni(page_size=args.page_size))
         except AlumniError as e:
             print("❌ Error:", e)
 
     def cmd_search_alumni(self, args):
         try:
-            results = self.alumni_service.search_alumni(args.field, args.value)
+            if args.query:
+                results = self.alumni_service.search_directory(args.query, args.limit)
+            elif args.field and args.value:
+                results = self.alumni_service.search_alumni(args.field, args.value)
+            else:
+                print("❌ Error: use --query, or --field together with --value")
+                return
             print("🔍 Search results:")
-            print(json.dumps(results, indent=2, default=str))
+            print(json.dumps(results, indent=2, default=json_default))
+        except AlumniError as e:
+            print("❌ Error:", e)
+
+    def cmd_import_alumni(self, args):
+        def progress(report):
+            print(f"... {report.summary()}")
+        try:
+            report = self.alumni_service.import_alumni(args.file, args.batch_size, progress)
         except AlumniError as e:
             print("❌ Error:", e)
+            return
+        print(f"✅ Import finished: {report.summary()}")
+        for line_no, message in report.errors[:args.max_errors]:
+            print(f"  line {line_no}: {message}")
+        if report.failed > args.max_errors:
+            print(f"  ... and {report.failed - args.max_errors} more errors")
 
     # Event commands for alumni
     def cmd_search_events(self, args):
         filters = {}
-        if args.name: filters["name"] = args.name
+        if args.name: filters["event_name"] = args.name
         if args.event_date: filters["event_date"] = args.event_date
         try:
             events = self.alumni_service.search_events(filters if filters else None)
             print("📅 Events:")
-            print(json.dumps(events, indent=2, default=str))
+            print(json.dumps(events, indent=2, default=json_default))
         except AlumniError as e:
             print("❌ Error:", e)
 
     def cmd_join_event(self, args):
         try:
             reg = self.alumni_service.join_event(args.alumni_id, args.event_id)
-            print(f"🎉 Alumni {args.alumni_id} joined event {args.event_id}:")
-            print(json.dumps(reg, indent=2, default=str))
+            if not reg.get("created"):
+                print(f"ℹ️ Alumni {args.alumni_id} is already {reg['status']} for event {args.event_id}:")
+            elif reg["status"] == "pending":
+                print(f"📨 Sign-up of alumni {args.alumni_id} for event {args.event_id} received, confirmation follows:")
+            elif reg["status"] == "waitlisted":
+                print(f"⏳ Event {args.event_id} is full, alumni {args.alumni_id} is on the waitlist:")
+            else:
+                print(f"🎉 Alumni {args.alumni_id} joined event {args.event_id}:")
+            print(json.dumps(reg, indent=2, default=json_default))
+        except AlumniError as e:
+            print("❌ Error:", e)
+
+    def cmd_leave_event(self, args):
+        try:
+            result = self.alumni_service.leave_event(args.alumni_id, args.event_id)
+            print(f"👋 Alumni {args.alumni_id} left event {args.event_id}")
+            if result.get("promoted"):
+                promoted = result["promoted"]
+                print(f"⬆️ {promoted['user_type']} {promoted['user_id']} moved off the waitlist")
         except AlumniError as e:
             print("❌ Error:", e)
 
@@ -86,7 +123,7 @@ class AlumniCLI:
         try:
             events = self.alumni_service.list_my_events(args.alumni_id)
             print(f"📌 Events for alumni {args.alumni_id}:")
-            print(json.dumps(events, indent=2, default=str))
+            print(json.dumps(events, indent=2, default=json_default))
         except AlumniError as e:
             print("❌ Error:", e)
     def cmd_become_mentor(self, args):
@@ -103,7 +140,7 @@ class AlumniCLI:
             # Register as mentor
             mentor = self.mentor_service.create_mentor(alumni_id, skills)
             print("✅ Alumni registered as mentor successfully:")
-            print(json.dumps(mentor, indent=2, default=str))
+            print(json.dumps(mentor, indent=2, default=json_default))
 
         except MentorshipError as e:
             print("❌ Error:", e)
@@ -113,6 +150,7 @@ def build_parser():
     import argparse
     cli = AlumniCLI()
     parser = argparse.ArgumentParser(prog="alumni-cli")
+    add_profile_arguments(parser)
     sub = parser.add_subparsers(dest="command")
 
     # --- Alumni commands ---
@@ -138,13 +176,22 @@ def build_parser():
     deletep.set_defaults(func=cli.cmd_delete_alumni)
 
     listp = sub.add_parser("list")
+    listp.add_argument("--page_size", type=int, default=1000, help="Rows fetched per request while streaming")
     listp.set_defaults(func=cli.cmd_list_alumni)
 
     searchp = sub.add_parser("search")
-    searchp.add_argument("--field", required=True, help="Field to search by (name, email, industry, location)")
-    searchp.add_argument("--value", required=True, help="Value to search for")
+    searchp.add_argument("--query", help="Free-text directory search (partial words and typos allowed)")
+    searchp.add_argument("--limit", type=int, default=20, help="Max results for --query")
+    searchp.add_argument("--field", help="Exact match: field to search by (name, email, industry, location)")
+    searchp.add_argument("--value", help="Exact match: value to search for")
     searchp.set_defaults(func=cli.cmd_search_alumni)
 
+    importp = sub.add_parser("import", help="Bulk import alumni from a .csv or .ndjson file")
+    importp.add_argument("--file", required=True)
+    importp.add_argument("--batch_size", type=int, default=500)
+    importp.add_argument("--max_errors", type=int, default=20, help="How many row errors to print")
+    importp.set_defaults(func=cli.cmd_import_alumni)
+
     # --- Event commands ---
     ev_search = sub.add_parser("events-search")
     ev_search.add_argument("--name")
@@ -156,6 +203,11 @@ def build_parser():
     ev_join.add_argument("--event_id", type=int, required=True)
     ev_join.set_defaults(func=cli.cmd_join_event)
 
+    ev_leave = sub.add_parser("leave-event", help="Cancel a registration; frees the seat for the waitlist")
+    ev_leave.add_argument("--alumni_id", type=int, required=True)
+    ev_leave.add_argument("--event_id", type=int, required=True)
+    ev_leave.set_defaults(func=cli.cmd_leave_event)
+
     ev_list = sub.add_parser("my-events")
     ev_list.add_argument("--alumni_id", type=int, required=True)
     ev_list.set_defaults(func=cli.cmd_list_my_events)
@@ -166,10 +218,7 @@ def build_parser():
 def main():
     parser = build_parser()
     args = parser.parse_args()
-    if hasattr(args, "func"):
-        args.func(args)
-    else:
-        parser.print_help()
+    run_command(parser, args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+# src/client/output.py
+import json
+import sys
+import textwrap
+from typing import Any, Iterable
+
+from src.dao.records import Record
+from src.services.record_batch import RecordBatch
+from src.tracing import get_tracer
+
+
+def json_default(value: Any):
+    """``default`` for json.dumps: records and batches as JSON rows, anything else as str."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, RecordBatch):
+        return value.to_dicts()
+    return str(value)
+
+
+def print_json_stream(records: Iterable, out=None) -> int:
+    """Print records as an indented JSON array while they are still being fetched."""
+    out = out or sys.stdout
+    count = 0
+    out.write("[")
+    for record in records:
+        out.write("\n" if count == 0 else ",\n")
+        out.write(textwrap.indent(json.dumps(record, indent=2, default=json_default), "  "))
+        count += 1
+        if count % 1000 == 0:
+            out.flush()
+    out.write("\n]\n" if count else "]\n")
+    out.flush()
+    return count
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--profile", action="store_true", help="Trace every backend call and print a per-method summary")
+    parser.add_argument("--profile-out", dest="profile_out", help="Append the raw spans to this JSON-lines file")
+
+
+def run_command(parser, args):
+    """Run the selected sub-command, wrapped in query tracing when --profile is given."""
+    if not hasattr(args, "func"):
+        parser.print_help()
+        return
+    tracer = get_tracer()
+    profiling = args.profile or bool(args.profile_out)
+    if profiling:
+        tracer.clear()
+        tracer.enable()
+    try:
+        args.func(args)
+    finally:
+        if profiling:
+            tracer.disable()
+            print("\n⏱  Query profile:", file=sys.stderr)
+            print(tracer.report(), file=sys.stderr)
+            if args.profile_out:
+                n = tracer.dump_jsonl(args.profile_out)
+                print(f"📝 {n} spans written to {args.profile_out}", file=sys.stderr)
@@ -0,0 +1,39 @@
+# src/client/profile_panel.py
+"""Optional query-profile panel for the Streamlit portals.
+
+The tracer is process-wide, so with several sessions open the panel shows every
+session's backend calls for the current rerun; it is meant for local debugging.
+"""
+import json
+
+import streamlit as st
+
+from src.tracing import get_tracer
+
+
+def start_profile_panel() -> bool:
+    """Sidebar toggle; when on, tracing is reset and enabled for this rerun."""
+    enabled = st.sidebar.checkbox("🔍 Query profile", value=False,
+                                  help="Trace backend calls made while rendering this page")
+    tracer = get_tracer()
+    if enabled:
+        tracer.clear()
+        tracer.enable()
+    else:
+        tracer.disable()
+    return enabled
+
+
+def render_profile_panel(enabled: bool):
+    if not enabled:
+        return
+    tracer = get_tracer()
+    spans = tracer.spans()
+    with st.sidebar.expander(f"Backend calls this run ({len(spans)})", expanded=True):
+        if not spans:
+            st.caption("No backend calls — everything came from cache.")
+            return
+        st.dataframe(tracer.summary(), hide_index=True)
+        st.dataframe([{**s, "filters": "; ".join(s["filters"])} for s in spans], hide_index=True)
+        jsonl = "\n".join(json.dumps(s, default=str) for s in spans) + "\n"
+        st.download_button("Download spans (.jsonl)", jsonl, file_name="query_profile.jsonl")
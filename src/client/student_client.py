@@ -1,6 +1,7 @@
 # src/cli/student_cli.py
 import json
 import argparse
+from src.client.output import add_profile_arguments, json_default, print_json_stream, run_command
 from src.services.student_services import StudentService, StudentError
 class StudentCLI:
     def __init__(self):
@@ -10,7 +11,7 @@ class StudentCLI:
         try:
             student = self.service.create_student(args.name, args.email, args.course, args.year)
             print("Student added:")
-            print(json.dumps(student, indent=2, default=str))
+            print(json.dumps(student, indent=2, default=json_default))
         except StudentError as e:
             print("Error:", e)
 
@@ -23,7 +24,7 @@ class StudentCLI:
         try:
             student = self.service.update_student(args.student_id, updates)
             print("Student updated:")
-            print(json.dumps(student, indent=2, default=str))
+            print(json.dumps(student, indent=2, default=json_default))
         except StudentError as e:
             print("Error:", e)
 
@@ -31,7 +32,7 @@ class StudentCLI:
         try:
             student = self.service.delete_student(args.student_id)
             print("Student deleted:")
-            print(json.dumps(student, indent=2, default=str))
+            print(json.dumps(student, indent=2, default=json_default))
         except StudentError as e:
             print("Error:", e)
 
@@ -42,9 +43,22 @@ class StudentCLI:
         if args.course: filters["course"] = args.course
         if args.year: filters["year"] = args.year
 
-        students = self.service.list_students(filters if filters else None)
         print("Student list:")
-        print(json.dumps(students, indent=2, default=str))
+        print_json_stream(self.service.iter_students(filters if filters else None, page_size=args.page_size))
+    def cmd_import_students(self, args):
+        def progress(report):
+            print(f"... {report.summary()}")
+        try:
+            report = self.service.import_students(args.file, args.batch_size, progress)
+        except StudentError as e:
+            print("Error:", e)
+            return
+        print(f"Import finished: {report.summary()}")
+        for line_no, message in report.errors[:args.max_errors]:
+            print(f"  line {line_no}: {message}")
+        if report.failed > args.max_errors:
+            print(f"  ... and {report.failed - args.max_errors} more errors")
+
     # --- Event commands ---
     def cmd_search_events(self, args):
         filters = {}
@@ -53,15 +67,32 @@ class StudentCLI:
         try:
             events = self.service.search_events(filters if filters else None)
             print("📅 Events:")
-            print(json.dumps(events, indent=2, default=str))
+            print(json.dumps(events, indent=2, default=json_default))
         except StudentError as e:
             print("❌ Error:", e)
 
     def cmd_join_event(self, args):
         try:
             reg = self.service.join_event(args.student_id, args.event_id)
-            print(f"🎉 Student {args.student_id} joined event {args.event_id}:")
-            print(json.dumps(reg, indent=2, default=str))
+            if not reg.get("created"):
+                print(f"ℹ️ Student {args.student_id} is already {reg['status']} for event {args.event_id}:")
+            elif reg["status"] == "pending":
+                print(f"📨 Sign-up of student {args.student_id} for event {args.event_id} received, confirmation follows:")
+            elif reg["status"] == "waitlisted":
+                print(f"⏳ Event {args.event_id} is full, student {args.student_id} is on the waitlist:")
+            else:
+                print(f"🎉 Student {args.student_id} joined event {args.event_id}:")
+            print(json.dumps(reg, indent=2, default=json_default))
+        except StudentError as e:
+            print("❌ Error:", e)
+
+    def cmd_leave_event(self, args):
+        try:
+            result = self.service.leave_event(args.student_id, args.event_id)
+            print(f"👋 Student {args.student_id} left event {args.event_id}")
+            if result.get("promoted"):
+                promoted = result["promoted"]
+                print(f"⬆️ {promoted['user_type']} {promoted['user_id']} moved off the waitlist")
         except StudentError as e:
             print("❌ Error:", e)
 
@@ -69,16 +100,15 @@ class StudentCLI:
         try:
             events = self.service.list_my_events(args.student_id)
             print(f"📌 Events for student {args.student_id}:")
-            print(json.dumps(events, indent=2, default=str))
+            print(json.dumps(events, indent=2, default=json_default))
         except StudentError as e:
             print("❌ Error:", e)
 
     
     def cmd_list_mentors(self, args):
         try:
-            mentors = self.service.list_mentors()  # use StudentService
             print("📋 Mentors list:")
-            print(json.dumps(mentors, indent=2, default=str))
+            print_json_stream(self.service.iter_all_mentors(page_size=args.page_size))
         except StudentError as e:
             print("❌ Error:", e)
 
@@ -88,7 +118,18 @@ class StudentCLI:
                 args.student_id, args.mentor_id, args.start_date, args.end_date
             )
             print(f"✅ Student {args.student_id} assigned to mentor {args.mentor_id}:")
-            print(json.dumps(assignment, indent=2, default=str))
+            print(json.dumps(assignment, indent=2, default=json_default))
+        except StudentError as e:
+            print("❌ Error:", e)
+
+    def cmd_recommend_mentors(self, args):
+        try:
+            mentors = self.service.recommend_mentors(args.student_id, args.k)
+            if not mentors:
+                print(f"ℹ️ No matching mentors for student {args.student_id}")
+                return
+            print(f"🎯 Recommended mentors for student {args.student_id}:")
+            print(json.dumps(mentors, indent=2, default=json_default))
         except StudentError as e:
             print("❌ Error:", e)
 
@@ -96,7 +137,7 @@ class StudentCLI:
         try:
             assignments = self.service.list_my_mentors(args.student_id)
             print(f"📌 Mentors for student {args.student_id}:")
-            print(json.dumps(assignments, indent=2, default=str))
+            print(json.dumps(assignments, indent=2, default=json_default))
         except StudentError as e:
             print("❌ Error:", e)
     
@@ -104,6 +145,7 @@ class StudentCLI:
 def build_parser():
     cli = StudentCLI()
     parser = argparse.ArgumentParser(prog="student-cli")
+    add_profile_arguments(parser)
     sub = parser.add_subparsers(dest="command")
 
     # Add student
@@ -134,7 +176,15 @@ def build_parser():
     listp.add_argument("--email", default=None)
     listp.add_argument("--course", default=None)
     listp.add_argument("--year", type=int, default=None)
+    listp.add_argument("--page_size", type=int, default=1000)
     listp.set_defaults(func=cli.cmd_list_students)
+    # Bulk import
+    importp = sub.add_parser("import", help="Bulk import students from a .csv or .ndjson file")
+    importp.add_argument("--file", required=True)
+    importp.add_argument("--batch_size", type=int, default=500)
+    importp.add_argument("--max_errors", type=int, default=20, help="How many row errors to print")
+    importp.set_defaults(func=cli.cmd_import_students)
+
     # Event commands
     ev_search = sub.add_parser("events-search")
     ev_search.add_argument("--name")
@@ -146,13 +196,24 @@ def build_parser():
     ev_join.add_argument("--event_id", type=int, required=True)
     ev_join.set_defaults(func=cli.cmd_join_event)
 
+    ev_leave = sub.add_parser("leave-event", help="Cancel a registration; frees the seat for the waitlist")
+    ev_leave.add_argument("--student_id", type=int, required=True)
+    ev_leave.add_argument("--event_id", type=int, required=True)
+    ev_leave.set_defaults(func=cli.cmd_leave_event)
+
     ev_list = sub.add_parser("my-events")
     ev_list.add_argument("--student_id", type=int, required=True)
     ev_list.set_defaults(func=cli.cmd_list_my_events)
 
     mentors_list = sub.add_parser("mentors-list")
+    mentors_list.add_argument("--page_size", type=int, default=1000)
     mentors_list.set_defaults(func=cli.cmd_list_mentors)
 
+    recommend = sub.add_parser("mentors-recommend", help="Rank mentors by skill match for a student")
+    recommend.add_argument("--student_id", type=int, required=True)
+    recommend.add_argument("--k", type=int, default=5, help="Number of mentors to return")
+    recommend.set_defaults(func=cli.cmd_recommend_mentors)
+
     join_mentorship = sub.add_parser("join-mentorship")
     join_mentorship.add_argument("--student_id", type=int, required=True)
     join_mentorship.add_argument("--mentor_id", type=int, required=True)
@@ -170,10 +231,7 @@ def build_parser():
 def main():
     parser = build_parser()
     args = parser.parse_args()
-    if hasattr(args, "func"):
-        args.func(args)
-    else:
-        parser.print_help()
+    run_command(parser, args)
 
 if __name__ == "__main__":
     main()
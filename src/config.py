@@ -1,10 +1,163 @@
 import os
+import threading
+from typing import Dict, Optional
+
+import httpx
 from dotenv import load_dotenv
-from supabase import Client,create_client
+from supabase import Client, ClientOptions, create_client
+
+from src.db.sqlite_client import SQLiteClient
+from src.tracing import TracedClient, note_response
 load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-def get_supabase()->Client:
+# HTTP keep-alive pool shared by every DAO in the process
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "10"))
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "60"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "30"))
+# Storage backend for the DAOs: "supabase" (default) or "sqlite"
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "alumni_network.db")
+
+
+class ConnectionStats:
+    """Thread-safe counters for requests sent and TCP connections opened."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": max(self.requests - self.connections_opened, 0),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.connections_opened = 0
+
+
+class ClientRegistry:
+    """Hands out pooled Supabase clients: one shared per process, or one per thread."""
+
+    def __init__(self, url: str, key: str, pool_size: int = SUPABASE_POOL_SIZE):
+        self.url = url
+        self.key = key
+        self.pool_size = pool_size
+        self.stats = ConnectionStats()
+        self._lock = threading.Lock()
+        self._shared: Optional[Client] = None
+        self._local = threading.local()
+        self._http_clients = []
+
+    # Shared client, safe to use from any thread (httpx.Client is thread-safe)
+    def shared(self) -> Client:
+        if self._shared is None:
+            with self._lock:
+                if self._shared is None:
+                    self._shared = self._build()
+        return self._shared
+
+    # Dedicated client for the calling thread, e.g. inside a worker pool
+    def for_thread(self) -> Client:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            with self._lock:
+                client = self._build()
+            self._local.client = client
+        return client
+
+    def close(self):
+        with self._lock:
+            for http in self._http_clients:
+                http.close()
+            self._http_clients = []
+            self._shared = None
+            self._local = threading.local()
+
+    def _build(self) -> Client:
+        http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY,
+            ),
+            timeout=SUPABASE_TIMEOUT,
+            follow_redirects=True,
+            http2=True,
+            event_hooks={"request": [self._on_request], "response": [note_response]},
+        )
+        self._http_clients.append(http)
+        return create_client(self.url, self.key, options=ClientOptions(httpx_client=http))
+
+    def _on_request(self, request: httpx.Request):
+        self.stats.record_request()
+        request.extensions["trace"] = self._on_trace
+
+    def _on_trace(self, event_name: str, info: Dict):
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.record_connect()
+
+
+_registry: Optional[ClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ClientRegistry:
+    global _registry
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be set in environment (.env)")
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ClientRegistry(SUPABASE_URL, SUPABASE_KEY)
+    return _registry
+
+
+def get_supabase()->Client:
+    return get_registry().shared()
+
+
+def get_thread_supabase() -> Client:
+    return get_registry().for_thread()
+
+
+_sqlite_clients: Dict[str, SQLiteClient] = {}
+
+
+def get_sqlite(path: Optional[str] = None) -> SQLiteClient:
+    path = path or SQLITE_PATH
+    with _registry_lock:
+        if path not in _sqlite_clients:
+            _sqlite_clients[path] = SQLiteClient(path)
+        return _sqlite_clients[path]
+
+
+# Client used by every DAO, chosen by DB_BACKEND; traced when src.tracing is enabled
+def get_client():
+    if DB_BACKEND == "sqlite":
+        return TracedClient(get_sqlite())
+    if DB_BACKEND != "supabase":
+        raise RuntimeError(f"Unknown DB_BACKEND '{DB_BACKEND}' (expected 'supabase' or 'sqlite')")
+    return TracedClient(get_supabase())
+
+
+def connection_stats() -> Dict[str, int]:
+    return get_registry().stats.snapshot()
@@ -1,33 +1,75 @@
-from src.config import get_supabase
-from typing import Dict, List, Optional
+from src.config import get_client
+from src.dao.batching import DEFAULT_CHUNK_SIZE, fetch_many
+from src.dao.cache import get_entity_cache
+from src.dao.filters import FilterLike, apply_residual, as_filter, push_down
+from src.dao.pagination import DEFAULT_PAGE_SIZE, iter_rows
+from src.dao.records import Alumni
+from typing import Dict, Iterable, Iterator, List, Optional, Set
 
 class AlumniDAO:
     def __init__(self):
-        self._sb = get_supabase()
+        self._sb = get_client()
+        self._cache = get_entity_cache()
 
     # Create a new alumni record
     def create_alumni(self, payload: Dict) -> Optional[Dict]:
         resp = self._sb.table("alumni").insert(payload).execute()
-        return resp.data[0] if resp.data else None
+        alumni = resp.data[0] if resp.data else None
+        if alumni:
+            self._cache.put("alumni", alumni["alumni_id"], alumni)
+        return alumni
 
     # Update any field(s) of an alumni
     def update_alumni(self, alumni_id: int, updates: Dict) -> Optional[Dict]:
+        if not updates:
+            return self.get_alumni_by_id(alumni_id)
+        self._cache.invalidate("alumni", alumni_id)
         resp = self._sb.table("alumni").update(updates).eq("alumni_id", alumni_id).execute()
-        return resp.data[0] if resp.data else None
+        alumni = resp.data[0] if resp.data else None
+        self._cache.put("alumni", alumni_id, alumni)
+        return alumni
 
-    # Get alumni by ID
+    # Get alumni by ID (served from the entity cache when possible)
     def get_alumni_by_id(self, alumni_id: int) -> Optional[Dict]:
+        alumni = self._cache.get("alumni", alumni_id)
+        if alumni is not None:
+            return alumni
         resp = self._sb.table("alumni").select("*").eq("alumni_id", alumni_id).execute()
-        return resp.data[0] if resp.data else None
+        alumni = resp.data[0] if resp.data else None
+        self._cache.put("alumni", alumni_id, alumni)
+        return alumni
+
+    # Many alumni by ID in input order (None where missing), one IN query per chunk
+    def get_many(self, alumni_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Optional[Dict]]:
+        return fetch_many(self._sb, self._cache, "alumni", "alumni_id", alumni_ids, chunk_size)
 
-    # List all alumni (optionally with filters)
-    def list_alumni(self, filters: Dict = None) -> List[Dict]:
-        query = self._sb.table("alumni").select("*")
-        if filters:
-            for key, value in filters.items():
-                query = query.eq(key, value)
+    # List all alumni (optionally with filters; dicts match exactly)
+    def list_alumni(self, filters: FilterLike = None) -> List[Alumni]:
+        query, residual = push_down(self._sb.table("alumni").select("*"), filters, exact=True)
         resp = query.execute()
-        return resp.data if resp.data else []
+        return Alumni.decode(apply_residual(resp.data, residual)) if resp.data else []
+
+    # Stream all alumni page by page (keyset on alumni_id); narrowed selects stay plain dicts
+    def iter_alumni(self, filters: FilterLike = None, page_size: int = DEFAULT_PAGE_SIZE,
+                    prefetch: bool = False, columns: str = "*") -> Iterator[Alumni]:
+        return iter_rows(lambda: self._sb.table("alumni").select(columns), "alumni_id",
+                         as_filter(filters, exact=True), page_size=page_size, prefetch=prefetch,
+                         record_type=Alumni if columns == "*" else None)
+
+    # Insert many alumni in one request
+    def create_many(self, rows: List[Dict]) -> List[Dict]:
+        if not rows:
+            return []
+        resp = self._sb.table("alumni").insert(rows).execute()
+        return resp.data or []
+
+    # Which of these emails are already registered (one IN query per chunk)
+    def find_existing_emails(self, emails: List[str], chunk_size: int = 200) -> Set[str]:
+        found = set()
+        for i in range(0, len(emails), chunk_size):
+            resp = self._sb.table("alumni").select("email").in_("email", emails[i:i + chunk_size]).execute()
+            found.update(r["email"] for r in resp.data or [])
+        return found
 
     # Search alumni by any single field
     def search_alumni(self, field: str, value) -> List[Dict]:
@@ -37,4 +79,9 @@ class AlumniDAO:
     # Delete an alumni by ID
     def delete_alumni(self, alumni_id: int) -> Optional[Dict]:
         resp = self._sb.table("alumni").delete().eq("alumni_id", alumni_id).execute()
+        self._cache.invalidate("alumni", alumni_id)
+        # mentor rows cascade with the alumni
+        self._cache.invalidate_table("mentors")
+        # so are their registrations, which moves event counters
+        self._cache.invalidate_table("events")
         return resp.data[0] if resp.data else None
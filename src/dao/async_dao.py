@@ -0,0 +1,97 @@
+# src/dao/async_dao.py
+"""Async counterparts of the DAOs.
+
+Each async DAO delegates to its synchronous twin on a shared, bounded thread pool. The
+sync DAOs already share one pooled backend client (see src.config), so concurrent
+coroutines reuse the same keep-alive connections, and the pool size caps how many
+requests are in flight at once.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.config import SUPABASE_POOL_SIZE
+from src.dao.alumni_dao import AlumniDAO
+from src.dao.batching import BatchLoader
+from src.dao.event_registrations import EventRegistrationsDAO
+from src.dao.events_dao import EventsDAO
+from src.dao.mentors_dao import MentorsDAO
+from src.dao.mentorship_assignment_dao import MentorshipAssignmentsDAO
+from src.dao.students_dao import StudentsDAO
+
+# Max backend calls in flight from async code; defaults to the HTTP pool size
+ASYNC_MAX_CONCURRENCY = int(os.getenv("ASYNC_MAX_CONCURRENCY", str(SUPABASE_POOL_SIZE)))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=ASYNC_MAX_CONCURRENCY, thread_name_prefix="async-dao")
+    return _executor
+
+
+async def run_sync(fn: Callable, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    # carry the caller's context so traced spans keep their service method
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+class AsyncDAO:
+    """Exposes every public method of the wrapped DAO as a coroutine function.
+
+    ``iter_*`` generators are not wrapped; use the ``list_*`` methods from async code.
+    """
+
+    sync_class = None
+
+    def __init__(self, sync_dao=None):
+        self.sync = sync_dao or self.sync_class()
+
+    def loader(self) -> BatchLoader:
+        """A fresh per-request loader whose ``load(id)`` calls are batched into ``get_many``."""
+        return BatchLoader(self.get_many)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.sync, name)
+        if name.startswith("_") or name.startswith("iter_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await run_sync(attr, *args, **kwargs)
+
+        return method
+
+
+class AsyncAlumniDAO(AsyncDAO):
+    sync_class = AlumniDAO
+
+
+class AsyncStudentsDAO(AsyncDAO):
+    sync_class = StudentsDAO
+
+
+class AsyncEventsDAO(AsyncDAO):
+    sync_class = EventsDAO
+
+
+class AsyncMentorsDAO(AsyncDAO):
+    sync_class = MentorsDAO
+
+
+class AsyncMentorshipAssignmentsDAO(AsyncDAO):
+    sync_class = MentorshipAssignmentsDAO
+
+
+class AsyncEventRegistrationsDAO(AsyncDAO):
+    sync_class = EventRegistrationsDAO
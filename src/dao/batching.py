@@ -0,0 +1,105 @@
+# src/dao/batching.py
+"""Batched lookups by primary key.
+
+``fetch_many`` resolves a list of ids with one ``in`` query per chunk. It serves what it can
+from the entity cache and returns rows in input order, with None for ids that do not exist.
+Every DAO exposes it as ``get_many``.
+
+``BatchLoader`` is the per-request layer on top, for async code. ``await loader.load(id)``
+calls made in the same event-loop tick are coalesced into a single ``get_many``, and each id
+is fetched at most once for the loader's lifetime:
+
+    loader = AsyncMentorsDAO().loader()
+    mentors = await asyncio.gather(*(loader.load(m) for m in mentor_ids))
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+def fetch_many(sb, cache, table: str, key: str, ids: Iterable[Hashable],
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Optional[Dict]]:
+    ids = list(ids)
+    found: Dict[Hashable, Dict] = {}
+    missing = []
+    for i in dict.fromkeys(ids):
+        row = cache.get(table, i) if cache is not None else None
+        if row is not None:
+            found[i] = row
+        else:
+            missing.append(i)
+    for start in range(0, len(missing), chunk_size):
+        resp = sb.table(table).select("*").in_(key, missing[start:start + chunk_size]).execute()
+        for row in resp.data or []:
+            found[row[key]] = row
+            if cache is not None:
+                cache.put(table, row[key], row)
+    return [found.get(i) for i in ids]
+
+
+class BatchLoader:
+    """Coalesces ``load`` calls into batched ``batch_fn(keys)`` calls; one instance per request.
+
+    ``batch_fn`` is a coroutine function returning one row (or None) per key, in key order,
+    e.g. an async DAO's ``get_many``. A result of any other length fails the whole batch.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Awaitable[List[Optional[Dict]]]]):
+        self._batch_fn = batch_fn
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+        self._scheduled = False
+        # running dispatches; the loop keeps only weak references to tasks
+        self._tasks = set()
+        self.batches = 0
+
+    def load(self, key: Hashable) -> "asyncio.Future":
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if not self._scheduled:
+                # dispatch once everything already runnable in this tick has queued its keys
+                self._scheduled = True
+                loop.call_soon(self._start_dispatch, loop)
+        return future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Optional[Dict]]:
+        return list(await asyncio.gather(*(self.load(k) for k in keys)))
+
+    def prime(self, key: Hashable, row: Optional[Dict]):
+        if key not in self._futures:
+            future = self._futures[key] = asyncio.get_running_loop().create_future()
+            future.set_result(row)
+
+    def clear(self, key: Optional[Hashable] = None):
+        if key is None:
+            self._futures = {k: f for k, f in self._futures.items() if not f.done()}
+        elif key in self._futures and self._futures[key].done():
+            del self._futures[key]
+
+    def _start_dispatch(self, loop: asyncio.AbstractEventLoop):
+        task = loop.create_task(self._dispatch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self):
+        keys, self._queue, self._scheduled = self._queue, [], False
+        self.batches += 1
+        try:
+            rows = list(await self._batch_fn(keys))
+            if len(rows) != len(keys):
+                raise ValueError(f"batch_fn returned {len(rows)} rows for {len(keys)} keys")
+        except Exception as exc:
+            # failed keys are forgotten so a later load retries them
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key, row in zip(keys, rows):
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(row)
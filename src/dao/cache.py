@@ -0,0 +1,105 @@
+# src/dao/cache.py
+"""Process-wide read-through cache for single rows, keyed by (table, primary key).
+
+DAOs look rows up here before going to the backend and keep it current on every
+mutation, so repeated ``get_*_by_id`` calls inside one service operation (or across
+Streamlit reruns) are served from memory.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "10000"))
+ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", "60"))
+
+_MISSING = object()
+
+
+class EntityCache:
+    """Size-bounded LRU with per-entry TTL. Thread-safe."""
+
+    def __init__(self, max_size: int = ENTITY_CACHE_SIZE, ttl: float = ENTITY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, table: str, key: Hashable) -> Optional[Dict]:
+        """Return a copy of the cached row, or None on miss/expiry."""
+        if self.max_size <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((table, key), _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return None
+            expires, row = entry
+            if expires < now:
+                del self._entries[(table, key)]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end((table, key))
+            self.hits += 1
+            return dict(row)
+
+    def put(self, table: str, key: Hashable, row: Optional[Dict]):
+        if row is None or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[(table, key)] = (time.monotonic() + self.ttl, dict(row))
+            self._entries.move_to_end((table, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, table: str, key: Hashable):
+        with self._lock:
+            if self._entries.pop((table, key), None) is not None:
+                self.invalidations += 1
+
+    def invalidate_table(self, table: str):
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == table]:
+                del self._entries[cache_key]
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache: Optional[EntityCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_entity_cache() -> EntityCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EntityCache()
+    return _cache
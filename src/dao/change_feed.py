@@ -0,0 +1,61 @@
+# src/dao/change_feed.py
+"""Rows changed or deleted since a watermark (migration 005).
+
+Changed rows are listed in ``(updated_at, key)`` keyset order over the index of that name,
+so a row updated while the listing runs moves ahead of the cursor and is read again
+rather than missed. Deletes come from the ``deleted_rows`` tombstones in the same way.
+Watermarks are the server's own ``updated_at`` / ``deleted_at`` strings.
+"""
+from src.config import get_client
+from src.dao.filters import Eq, Range
+from src.dao.pagination import DEFAULT_PAGE_SIZE, iter_rows
+from typing import Dict, Iterator, Optional
+
+# key column of every table with change tracking
+TABLE_KEYS = {
+    "alumni": "alumni_id",
+    "students": "student_id",
+    "events": "event_id",
+    "mentors": "mentor_id",
+    "mentorship_assignments": "assignment_id",
+    "event_registrations": "registration_id",
+}
+
+
+class ChangeFeedDAO:
+    def __init__(self):
+        self._sb = get_client()
+
+    # Rows updated at or after `since` (every row when None), oldest change first
+    def iter_changed(self, table: str, since: Optional[str] = None, columns: str = "*",
+                     page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = False) -> Iterator[Dict]:
+        key = TABLE_KEYS[table]
+        select = columns
+        if columns != "*":
+            # the keyset cursor needs the key and updated_at
+            wanted = [c.strip() for c in columns.split(",")]
+            select = ", ".join([c for c in (key, "updated_at") if c not in wanted] + wanted)
+        return iter_rows(lambda: self._sb.table(table).select(select), key,
+                         Range("updated_at", since) if since else None, order_column="updated_at",
+                         page_size=page_size, prefetch=prefetch)
+
+    # Keys of the table's rows deleted at or after `since`, oldest first
+    def iter_deleted(self, table: str, since: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE,
+                     prefetch: bool = False) -> Iterator[Dict]:
+        flt = Eq("table_name", table)
+        if since:
+            flt = flt & Range("deleted_at", since)
+        return iter_rows(lambda: self._sb.table("deleted_rows").select("deletion_id, row_id, deleted_at"),
+                         "deletion_id", flt, order_column="deleted_at", page_size=page_size, prefetch=prefetch)
+
+    # deleted_at of the table's newest tombstone, the delete watermark of a full read
+    def latest_deletion(self, table: str) -> Optional[str]:
+        resp = (
+            self._sb.table("deleted_rows")
+            .select("deleted_at")
+            .eq("table_name", table)
+            .order("deleted_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        return resp.data[0]["deleted_at"] if resp.data else None
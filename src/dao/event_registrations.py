@@ -1,30 +1,115 @@
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from typing import Optional, Iterable, Iterator, List, Dict, Tuple
+from src.config import get_client
+from src.dao.batching import DEFAULT_CHUNK_SIZE, fetch_many
+from src.dao.cache import get_entity_cache
+from src.dao.pagination import DEFAULT_PAGE_SIZE, iter_rows
+from src.dao.records import Registration
+from src.dao.registration_journal import REGISTRATION_WRITE_BEHIND, get_registration_journal
 
 class EventRegistrationsDAO:
-    def __init__(self):
-        self._sb = get_supabase()
+    def __init__(self, write_behind: Optional[bool] = None):
+        self._sb = get_client()
+        # registrations change the event's seat counters, so cached events are dropped
+        self._cache = get_entity_cache()
+        if REGISTRATION_WRITE_BEHIND if write_behind is None else write_behind:
+            self.journal = get_registration_journal(self._apply_journal_batch)
+        else:
+            self.journal = None
 
     def register_user(self, event_id: int, user_id: int, user_type: str) -> Optional[Dict]:
-        payload = {"event_id": event_id, "user_id": user_id, "user_type": user_type}
-        resp = self._sb.table("event_registrations").insert(payload).execute()
-        return resp.data[0] if resp.data else None
+        """Take a seat, or a waitlist slot when the event is full, in one atomic RPC.
+
+        Returns the registration with ``status`` and ``created`` (False when the user was
+        already registered). Raises APIError P0002 when the event does not exist.
+
+        In write-behind mode the sign-up is only journaled and comes back with status
+        ``pending``; seat or waitlist is decided when the journal is flushed.
+        """
+        if self.journal is not None:
+            return self.journal.append(event_id, user_id, user_type)
+        params = {"p_event_id": event_id, "p_user_id": user_id, "p_user_type": user_type}
+        resp = self._sb.rpc("register_for_event", params).execute()
+        self._cache.invalidate("events", event_id)
+        return resp.data or None
+
+    def register_many(self, event_id: int, users: List[Tuple[int, str]], chunk_size: int = 500) -> List[Dict]:
+        """Idempotently register users; returns only the rows that were newly inserted."""
+        inserted = []
+        for i in range(0, len(users), chunk_size):
+            payload = [{"user_id": user_id, "user_type": user_type} for user_id, user_type in users[i:i + chunk_size]]
+            resp = self._sb.rpc("register_many_for_event", {"p_event_id": event_id, "p_users": payload}).execute()
+            inserted.extend(resp.data or [])
+        self._cache.invalidate("events", event_id)
+        return inserted
+
+    def cancel_registration(self, event_id: int, user_id: int, user_type: str) -> Dict:
+        """Remove a registration, promoting the oldest waitlisted user into a freed seat.
+
+        Returns ``{"cancelled": row or None, "promoted": row or None}``. A sign-up still
+        waiting in the write-behind journal is dropped from it; the backend is asked as well,
+        since a repeated sign-up can be queued while the first one already landed.
+        """
+        dropped = self.journal.discard(event_id, user_id, user_type) if self.journal is not None else None
+        params = {"p_event_id": event_id, "p_user_id": user_id, "p_user_type": user_type}
+        resp = self._sb.rpc("cancel_registration", params).execute()
+        self._cache.invalidate("events", event_id)
+        result = resp.data or {"cancelled": None, "promoted": None}
+        if dropped and not result.get("cancelled"):
+            result = {"cancelled": dropped, "promoted": None}
+        return result
+
+    # Flusher callback for the write-behind journal
+    def _apply_journal_batch(self, event_id: int, users: List[Tuple[int, str]]) -> List[Dict]:
+        payload = [{"user_id": user_id, "user_type": user_type} for user_id, user_type in users]
+        resp = self._sb.rpc("register_many_for_event", {"p_event_id": event_id, "p_users": payload}).execute()
+        self._cache.invalidate("events", event_id)
+        return resp.data or []
+
+    # registrations are not kept in the entity cache
+    def get_many(self, registration_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Optional[Dict]]:
+        return fetch_many(self._sb, None, "event_registrations", "registration_id", registration_ids, chunk_size)
+
+    # Every registration, streamed in registration_id order (registration_id is always selected)
+    def iter_registrations(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = False,
+                           columns: str = "*") -> Iterator[Registration]:
+        select = columns if columns == "*" else f"registration_id, {columns}"
+        return iter_rows(lambda: self._sb.table("event_registrations").select(select), "registration_id",
+                         page_size=page_size, prefetch=prefetch, record_type=Registration if columns == "*" else None)
 
     def list_user_events(self, user_id: int, user_type: str) -> List[Dict]:
         resp = (
             self._sb.table("event_registrations")
-            .select("event_id(*), registered_at")
+            .select("event_id(*), status, registered_at")
             .eq("user_id", user_id)
             .eq("user_type", user_type)
             .execute()
         )
-        return resp.data or []
+        rows = resp.data or []
+        if self.journal is not None:
+            rows.extend(self._pending_user_events(rows, user_id, user_type))
+        return rows
+
+    def _pending_user_events(self, rows: List[Dict], user_id: int, user_type: str) -> List[Dict]:
+        joined = {r["event_id"]["event_id"] for r in rows if r.get("event_id")}
+        pending = [p for p in self.journal.pending(user_id=user_id, user_type=user_type) if p["event_id"] not in joined]
+        if not pending:
+            return []
+        events = fetch_many(self._sb, self._cache, "events", "event_id", [p["event_id"] for p in pending])
+        return [{"event_id": event, "status": "pending", "registered_at": p["queued_at"]}
+                for p, event in zip(pending, events) if event]
 
     def list_event_participants(self, event_id: int) -> List[Dict]:
         resp = (
             self._sb.table("event_registrations")
-            .select("user_id, user_type, registered_at")
+            .select("registration_id, user_id, user_type, status, registered_at")
             .eq("event_id", event_id)
             .execute()
         )
-        return resp.data or []
+        rows = resp.data or []
+        if self.journal is not None:
+            registered = {(r["user_id"], r["user_type"]) for r in rows}
+            rows.extend({"registration_id": None, "user_id": p["user_id"], "user_type": p["user_type"],
+                         "status": "pending", "registered_at": p["queued_at"]}
+                        for p in self.journal.pending(event_id=event_id)
+                        if (p["user_id"], p["user_type"]) not in registered)
+        return rows
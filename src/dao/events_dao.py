@@ -1,30 +1,86 @@
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from typing import Optional, Iterable, Iterator, List, Dict
+from src.config import get_client
+from src.dao.batching import DEFAULT_CHUNK_SIZE, fetch_many
+from src.dao.cache import get_entity_cache
+from src.dao.filters import FilterLike, apply_residual, push_down
+from src.dao.pagination import DEFAULT_PAGE_SIZE, iter_rows
+from src.dao.records import Event
+
+# participation counters on the event row, kept current by triggers on event_registrations
+COUNT_COLUMNS = "event_id, capacity, seats_taken, waitlist_size, alumni_count, student_count"
 
 class EventsDAO:
     def __init__(self):
-        self._sb = get_supabase()
+        self._sb = get_client()
+        self._cache = get_entity_cache()
 
     def create_event(self, payload: Dict) -> Optional[Dict]:
         resp = self._sb.table("events").insert(payload).execute()
-        return resp.data[0] if resp.data else None
+        event = resp.data[0] if resp.data else None
+        if event:
+            self._cache.put("events", event["event_id"], event)
+        return event
 
-    def get_event_by_id(self, event_id: int) -> Optional[Dict]:
-        resp = self._sb.table("events").select("*").eq("event_id", event_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+    # Registrations in any process move the counters, so a cached event gets COUNT_COLUMNS
+    # re-read; fresh_counts=False serves the cached row as is, for existence checks
+    def get_event_by_id(self, event_id: int, fresh_counts: bool = True) -> Optional[Dict]:
+        event = self._cache.get("events", event_id)
+        if event is None:
+            resp = self._sb.table("events").select("*").eq("event_id", event_id).limit(1).execute()
+            event = resp.data[0] if resp.data else None
+            self._cache.put("events", event_id, event)
+            return event
+        if fresh_counts:
+            resp = self._sb.table("events").select(COUNT_COLUMNS).eq("event_id", event_id).limit(1).execute()
+            if not resp.data:
+                # deleted by someone else
+                self._cache.invalidate("events", event_id)
+                return None
+            event.update(resp.data[0])
+        return event
+
+    def get_many(self, event_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Optional[Dict]]:
+        return fetch_many(self._sb, self._cache, "events", "event_id", event_ids, chunk_size)
+
+    # Counters for many events, one IN query per chunk; read fresh, never from the cache
+    def get_counts(self, event_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict]:
+        event_ids = list(dict.fromkeys(event_ids))
+        rows = []
+        for i in range(0, len(event_ids), chunk_size):
+            resp = self._sb.table("events").select(COUNT_COLUMNS).in_("event_id", event_ids[i:i + chunk_size]).execute()
+            rows.extend(resp.data or [])
+        return rows
 
-    def list_events(self) -> List[Dict]:
-        resp = self._sb.table("events").select("*").order("event_date", desc=False).execute()
-        return resp.data or []
+    def list_events(self, filters: FilterLike = None) -> List[Event]:
+        query, residual = push_down(self._sb.table("events").select("*"), filters)
+        resp = query.order("event_date", desc=False).execute()
+        return Event.decode(apply_residual(resp.data or [], residual))
+
+    def iter_events(self, filters: FilterLike = None, page_size: int = DEFAULT_PAGE_SIZE,
+                    prefetch: bool = False, columns: str = "*") -> Iterator[Event]:
+        return iter_rows(lambda: self._sb.table("events").select(columns), "event_id", filters,
+                         order_column="event_date", page_size=page_size, prefetch=prefetch,
+                         record_type=Event if columns == "*" else None)
 
     def update_event(self, event_id: int, fields: Dict) -> Optional[Dict]:
-        self._sb.table("events").update(fields).eq("event_id", event_id).execute()
-        resp = self._sb.table("events").select("*").eq("event_id", event_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        if not fields:
+            return self.get_event_by_id(event_id)
+        self._cache.invalidate("events", event_id)
+        # PostgREST returns the updated representation, no follow-up SELECT needed
+        resp = self._sb.table("events").update(fields).eq("event_id", event_id).execute()
+        event = resp.data[0] if resp.data else None
+        self._cache.put("events", event_id, event)
+        return event
+
+    # capacity changes go through an RPC so that waitlisted users are promoted atomically
+    def set_capacity(self, event_id: int, capacity: Optional[int]) -> Dict:
+        resp = self._sb.rpc("set_event_capacity", {"p_event_id": event_id, "p_capacity": capacity}).execute()
+        result = resp.data or {}
+        if result.get("event"):
+            self._cache.put("events", event_id, result["event"])
+        return result
 
     def delete_event(self, event_id: int) -> Optional[Dict]:
-        resp_before = self._sb.table("events").select("*").eq("event_id", event_id).limit(1).execute()
-        event = resp_before.data[0] if resp_before.data else None
-        if event:
-            self._sb.table("events").delete().eq("event_id", event_id).execute()
-        return event
+        resp = self._sb.table("events").delete().eq("event_id", event_id).execute()
+        self._cache.invalidate("events", event_id)
+        return resp.data[0] if resp.data else None
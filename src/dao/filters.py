@@ -0,0 +1,248 @@
+# src/dao/filters.py
+"""Small filter expression layer that pushes predicates down to the backend.
+
+Filters compile to PostgREST query-builder calls (``eq``, ``ilike``, ``in_``, ``or_`` ...),
+which the SQLite backend understands as well. Anything the server can't evaluate is
+returned as a residual filter and checked locally on the (already reduced) result.
+
+    flt = IMatch("course", "cs") & Range("year", 2, 4)
+    query, residual = push_down(client.table("students").select("*"), flt)
+"""
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+_PLAIN_VALUE = re.compile(r"-?\d+(\.\d+)?|\d{4}-\d{2}-\d{2}([T ][\d:.]+)?")
+_RESERVED = set(',.:()"\\ ')
+
+
+def _is_text(value: Any) -> bool:
+    # numbers and dates can't take ILIKE on the server, they compare with eq instead
+    return isinstance(value, str) and not _PLAIN_VALUE.fullmatch(value)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def quote_value(value: Any) -> str:
+    text = "null" if value is None else str(value).lower() if isinstance(value, bool) else str(value)
+    if any(ch in _RESERVED for ch in text):
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return text
+
+
+class Filter:
+    """Base class; subclasses implement server compilation and local evaluation."""
+
+    # True when the predicate can run on the server
+    server_side = True
+
+    def apply(self, query):
+        raise NotImplementedError
+
+    def to_logic(self) -> str:
+        raise NotImplementedError
+
+    def matches(self, row: Dict) -> bool:
+        raise NotImplementedError
+
+    def __and__(self, other: "Filter") -> "And":
+        return And(self, other)
+
+    def __or__(self, other: "Filter") -> "Or":
+        return Or(self, other)
+
+
+class Eq(Filter):
+    def __init__(self, column: str, value: Any):
+        self.column = column
+        self.value = value
+
+    def apply(self, query):
+        if self.value is None:
+            return query.is_(self.column, "null")
+        return query.eq(self.column, self.value)
+
+    def to_logic(self) -> str:
+        op = "is" if self.value is None else "eq"
+        return f"{self.column}.{op}.{quote_value(self.value)}"
+
+    def matches(self, row: Dict) -> bool:
+        return row.get(self.column) == self.value
+
+
+class IMatch(Filter):
+    """Case-insensitive equality (``str(a).lower() == str(b).lower()``)."""
+
+    def __init__(self, column: str, value: Any):
+        self.column = column
+        self.value = value
+        # '*' is a wildcard in PostgREST patterns and can't be escaped
+        self.server_side = not (isinstance(value, str) and "*" in value)
+
+    def apply(self, query):
+        if _is_text(self.value):
+            return query.ilike(self.column, _escape_like(self.value))
+        return query.eq(self.column, self.value)
+
+    def to_logic(self) -> str:
+        if _is_text(self.value):
+            return f"{self.column}.ilike.{quote_value(_escape_like(self.value))}"
+        return f"{self.column}.eq.{quote_value(self.value)}"
+
+    def matches(self, row: Dict) -> bool:
+        return str(row.get(self.column)).lower() == str(self.value).lower()
+
+
+class Prefix(Filter):
+    """Case-insensitive prefix match on a text column."""
+
+    def __init__(self, column: str, prefix: str):
+        self.column = column
+        self.prefix = str(prefix)
+        self.server_side = "*" not in self.prefix
+
+    def apply(self, query):
+        return query.ilike(self.column, _escape_like(self.prefix) + "*")
+
+    def to_logic(self) -> str:
+        return f"{self.column}.ilike.{quote_value(_escape_like(self.prefix) + '*')}"
+
+    def matches(self, row: Dict) -> bool:
+        value = row.get(self.column)
+        return value is not None and str(value).lower().startswith(self.prefix.lower())
+
+
+class Range(Filter):
+    """Inclusive range; either bound may be None, not both."""
+
+    def __init__(self, column: str, low: Any = None, high: Any = None):
+        if low is None and high is None:
+            # nothing for to_logic to send, and it could not match NULLs the way apply would
+            raise ValueError(f"Range on {column} needs a low or a high bound")
+        self.column = column
+        self.low = low
+        self.high = high
+
+    def apply(self, query):
+        if self.low is not None:
+            query = query.gte(self.column, self.low)
+        if self.high is not None:
+            query = query.lte(self.column, self.high)
+        return query
+
+    def to_logic(self) -> str:
+        parts = []
+        if self.low is not None:
+            parts.append(f"{self.column}.gte.{quote_value(self.low)}")
+        if self.high is not None:
+            parts.append(f"{self.column}.lte.{quote_value(self.high)}")
+        return f"and({','.join(parts)})"
+
+    def matches(self, row: Dict) -> bool:
+        value = row.get(self.column)
+        if value is None:
+            return False
+        if self.low is not None and value < self.low:
+            return False
+        if self.high is not None and value > self.high:
+            return False
+        return True
+
+
+class In(Filter):
+    def __init__(self, column: str, values: Iterable):
+        self.column = column
+        self.values = list(values)
+
+    def apply(self, query):
+        return query.in_(self.column, self.values)
+
+    def to_logic(self) -> str:
+        return f"{self.column}.in.({','.join(quote_value(v) for v in self.values)})"
+
+    def matches(self, row: Dict) -> bool:
+        return row.get(self.column) in self.values
+
+
+class And(Filter):
+    def __init__(self, *filters: Filter):
+        self.filters = [g for f in filters for g in (f.filters if isinstance(f, And) else [f])]
+        self.server_side = all(f.server_side for f in self.filters)
+
+    def apply(self, query):
+        for f in self.filters:
+            query = f.apply(query)
+        return query
+
+    def to_logic(self) -> str:
+        return f"and({','.join(f.to_logic() for f in self.filters)})"
+
+    def matches(self, row: Dict) -> bool:
+        return all(f.matches(row) for f in self.filters)
+
+
+class Or(Filter):
+    def __init__(self, *filters: Filter):
+        self.filters = [g for f in filters for g in (f.filters if isinstance(f, Or) else [f])]
+        self.server_side = all(f.server_side for f in self.filters)
+
+    def apply(self, query):
+        return query.or_(",".join(f.to_logic() for f in self.filters))
+
+    def to_logic(self) -> str:
+        return f"or({','.join(f.to_logic() for f in self.filters)})"
+
+    def matches(self, row: Dict) -> bool:
+        return any(f.matches(row) for f in self.filters)
+
+
+class Where(Filter):
+    """Arbitrary Python predicate; always evaluated locally."""
+
+    server_side = False
+
+    def __init__(self, predicate: Callable[[Dict], bool]):
+        self.predicate = predicate
+
+    def matches(self, row: Dict) -> bool:
+        return bool(self.predicate(row))
+
+
+FilterLike = Union[Filter, Dict, None]
+
+
+def as_filter(filters: FilterLike, exact: bool = False) -> Optional[Filter]:
+    """Turn the legacy ``{column: value}`` dicts into a filter (IMatch, or Eq when exact)."""
+    if filters is None or isinstance(filters, Filter):
+        return filters
+    if not filters:
+        return None
+    cls = Eq if exact else IMatch
+    predicates = [cls(k, v) for k, v in filters.items()]
+    # a lone predicate skips And's per-row generator in local evaluation
+    return predicates[0] if len(predicates) == 1 else And(*predicates)
+
+
+def push_down(query, filters: FilterLike, exact: bool = False) -> Tuple[Any, Optional[Filter]]:
+    """Apply every server-capable predicate to the query; return (query, residual)."""
+    flt = as_filter(filters, exact)
+    if flt is None:
+        return query, None
+    if flt.server_side:
+        return flt.apply(query), None
+    if isinstance(flt, And):
+        residual: List[Filter] = []
+        for f in flt.filters:
+            if f.server_side:
+                query = f.apply(query)
+            else:
+                residual.append(f)
+        return query, And(*residual)
+    return query, flt
+
+
+def apply_residual(rows: List[Dict], residual: Optional[Filter]) -> List[Dict]:
+    if residual is None:
+        return rows
+    return [r for r in rows if residual.matches(r)]
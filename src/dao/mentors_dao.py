@@ -1,31 +1,86 @@
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from datetime import date
+from typing import Optional, Iterable, Iterator, List, Dict
+from src.config import get_client
+from src.dao.batching import DEFAULT_CHUNK_SIZE, fetch_many
+from src.dao.cache import get_entity_cache
+from src.dao.pagination import DEFAULT_PAGE_SIZE, iter_rows
+from src.dao.records import Mentor
+
+PROFILE_COLUMNS = "mentor_id, alumni_id, skills, alumni(name, industry)"
+# mentor row + alumni profile + active mentee count, resolved by PostgREST in one request
+VIEW_COLUMNS = "*, alumni(name, email, industry, location, graduation_year), mentorship_assignments(count)"
 
 class MentorsDAO:
     def __init__(self):
-        self._sb = get_supabase()
+        self._sb = get_client()
+        self._cache = get_entity_cache()
 
     def create_mentor(self, alumni_id: int, skills: str = None) -> Optional[Dict]:
         payload = {"alumni_id": alumni_id, "skills": skills}
         resp = self._sb.table("mentors").insert(payload).execute()
-        return resp.data[0] if resp.data else None
+        mentor = resp.data[0] if resp.data else None
+        if mentor:
+            self._cache.put("mentors", mentor["mentor_id"], mentor)
+        return mentor
 
     def get_mentor_by_id(self, mentor_id: int) -> Optional[Dict]:
+        mentor = self._cache.get("mentors", mentor_id)
+        if mentor is not None:
+            return mentor
         resp = self._sb.table("mentors").select("*").eq("mentor_id", mentor_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        mentor = resp.data[0] if resp.data else None
+        self._cache.put("mentors", mentor_id, mentor)
+        return mentor
 
-    def list_mentors(self) -> List[Dict]:
+    def get_many(self, mentor_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Optional[Dict]]:
+        return fetch_many(self._sb, self._cache, "mentors", "mentor_id", mentor_ids, chunk_size)
+
+    def list_mentors(self) -> List[Mentor]:
         resp = self._sb.table("mentors").select("*").order("mentor_id", desc=False).execute()
+        return Mentor.decode(resp.data or [])
+
+    def iter_mentors(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = False,
+                     columns: str = "*") -> Iterator[Mentor]:
+        return iter_rows(lambda: self._sb.table("mentors").select(columns), "mentor_id",
+                         page_size=page_size, prefetch=prefetch, record_type=Mentor if columns == "*" else None)
+
+    # mentor rows with the linked alumni's name and industry, used for matching
+    def iter_mentor_profiles(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = False) -> Iterator[Dict]:
+        return iter_rows(lambda: self._sb.table("mentors").select(PROFILE_COLUMNS), "mentor_id",
+                         page_size=page_size, prefetch=prefetch)
+
+    def list_mentor_profiles(self, mentor_ids: List[int]) -> List[Dict]:
+        if not mentor_ids:
+            return []
+        resp = self._sb.table("mentors").select(PROFILE_COLUMNS).in_("mentor_id", list(mentor_ids)).execute()
         return resp.data or []
 
-    def update_mentor(self, mentor_id: int, fields: Dict) -> Optional[Dict]:
-        self._sb.table("mentors").update(fields).eq("mentor_id", mentor_id).execute()
-        resp = self._sb.table("mentors").select("*").eq("mentor_id", mentor_id).limit(1).execute()
+    # only assignments that have not ended are counted
+    def _view_query(self):
+        today = date.today().isoformat()
+        return (self._sb.table("mentors").select(VIEW_COLUMNS)
+                .or_(f"end_date.is.null,end_date.gte.{today}", reference_table="mentorship_assignments"))
+
+    def get_mentor_view(self, mentor_id: int) -> Optional[Dict]:
+        resp = self._view_query().eq("mentor_id", mentor_id).limit(1).execute()
         return resp.data[0] if resp.data else None
 
-    def delete_mentor(self, mentor_id: int) -> Optional[Dict]:
-        resp_before = self._sb.table("mentors").select("*").eq("mentor_id", mentor_id).limit(1).execute()
-        mentor = resp_before.data[0] if resp_before.data else None
-        if mentor:
-            self._sb.table("mentors").delete().eq("mentor_id", mentor_id).execute()
+    def list_mentor_views(self) -> List[Dict]:
+        resp = self._view_query().order("mentor_id", desc=False).execute()
+        return resp.data or []
+
+    def update_mentor(self, mentor_id: int, fields: Dict) -> Optional[Dict]:
+        if not fields:
+            return self.get_mentor_by_id(mentor_id)
+        self._cache.invalidate("mentors", mentor_id)
+        # PostgREST returns the updated representation, no follow-up SELECT needed
+        resp = self._sb.table("mentors").update(fields).eq("mentor_id", mentor_id).execute()
+        mentor = resp.data[0] if resp.data else None
+        self._cache.put("mentors", mentor_id, mentor)
         return mentor
+
+    def delete_mentor(self, mentor_id: int) -> Optional[Dict]:
+        resp = self._sb.table("mentors").delete().eq("mentor_id", mentor_id).execute()
+        self._cache.invalidate("mentors", mentor_id)
+        self._cache.invalidate_table("mentorship_assignments")
+        return resp.data[0] if resp.data else None
@@ -1,9 +1,18 @@
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from typing import Optional, Iterable, Iterator, List, Dict
+from src.config import get_client
+from src.dao.batching import DEFAULT_CHUNK_SIZE, fetch_many
+from src.dao.cache import get_entity_cache
+from src.dao.pagination import DEFAULT_PAGE_SIZE, iter_rows
+from src.dao.records import Assignment
+
+# assignment row + student profile + mentor profile (through mentors -> alumni) in one request
+VIEW_COLUMNS = ("*, students(name, email, course, year), "
+                "mentors(alumni_id, skills, alumni(name, email, industry))")
 
 class MentorshipAssignmentsDAO:
     def __init__(self):
-        self._sb = get_supabase()
+        self._sb = get_client()
+        self._cache = get_entity_cache()
 
     def assign_student(self, mentor_id: int, student_id: int, start_date=None, end_date=None) -> Optional[Dict]:
         payload = {
@@ -13,32 +22,90 @@ class MentorshipAssignmentsDAO:
             "end_date": end_date
         }
         resp = self._sb.table("mentorship_assignments").insert(payload).execute()
-        return resp.data[0] if resp.data else None
+        assignment = resp.data[0] if resp.data else None
+        if assignment:
+            self._cache.put("mentorship_assignments", assignment["assignment_id"], assignment)
+        return assignment
+
+    def assign_many(self, rows: List[Dict], chunk_size: int = 5000) -> List[Dict]:
+        """Insert many assignments with one request per chunk; returns the created rows."""
+        created = []
+        for i in range(0, len(rows), chunk_size):
+            resp = self._sb.table("mentorship_assignments").insert(rows[i:i + chunk_size]).execute()
+            for assignment in resp.data or []:
+                self._cache.put("mentorship_assignments", assignment["assignment_id"], assignment)
+                created.append(assignment)
+        return created
+
+    # like assign_many, but a mentor whose active assignments have reached limits[mentor_id]
+    # gets no more; counted under a lock on the mentors, so concurrent writers can't overshoot
+    def assign_within_capacity(self, rows: List[Dict], limits: Dict[int, int]) -> Dict[str, List[Dict]]:
+        """Returns ``{"created": [...], "over_capacity": [rows left out]}``."""
+        params = {"p_rows": rows, "p_limits": {str(m): n for m, n in limits.items()}}
+        result = self._sb.rpc("assign_within_capacity", params).execute().data
+        for assignment in result["created"]:
+            self._cache.put("mentorship_assignments", assignment["assignment_id"], assignment)
+        return result
 
     def get_assignment_by_id(self, assignment_id: int) -> Optional[Dict]:
+        assignment = self._cache.get("mentorship_assignments", assignment_id)
+        if assignment is not None:
+            return assignment
         resp = self._sb.table("mentorship_assignments").select("*").eq("assignment_id", assignment_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        assignment = resp.data[0] if resp.data else None
+        self._cache.put("mentorship_assignments", assignment_id, assignment)
+        return assignment
+
+    def get_many(self, assignment_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Optional[Dict]]:
+        return fetch_many(self._sb, self._cache, "mentorship_assignments", "assignment_id", assignment_ids, chunk_size)
 
-    def list_assignments(self) -> List[Dict]:
+    def list_assignments(self) -> List[Assignment]:
         resp = self._sb.table("mentorship_assignments").select("*").order("created_at", desc=False).execute()
-        return resp.data or []
+        return Assignment.decode(resp.data or [])
+
+    def iter_assignments(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = False) -> Iterator[Assignment]:
+        return iter_rows(lambda: self._sb.table("mentorship_assignments").select("*"), "assignment_id",
+                         order_column="created_at", page_size=page_size, prefetch=prefetch, record_type=Assignment)
+
+    # just the columns needed to work out mentor load and who already has a mentor
+    def iter_assignment_links(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Dict]:
+        return iter_rows(lambda: self._sb.table("mentorship_assignments").select("assignment_id, mentor_id, student_id, end_date"),
+                         "assignment_id", page_size=page_size, prefetch=prefetch)
 
-    def list_students_by_mentor(self, mentor_id: int) -> List[Dict]:
+    def list_students_by_mentor(self, mentor_id: int) -> List[Assignment]:
         resp = self._sb.table("mentorship_assignments").select("*").eq("mentor_id", mentor_id).execute()
-        return resp.data or []
+        return Assignment.decode(resp.data or [])
 
-    def list_mentors_by_student(self, student_id: int) -> List[Dict]:
+    def list_mentors_by_student(self, student_id: int) -> List[Assignment]:
         resp = self._sb.table("mentorship_assignments").select("*").eq("student_id", student_id).execute()
+        return Assignment.decode(resp.data or [])
+
+    def get_assignment_view(self, assignment_id: int) -> Optional[Dict]:
+        resp = (self._sb.table("mentorship_assignments").select(VIEW_COLUMNS)
+                .eq("assignment_id", assignment_id).limit(1).execute())
+        return resp.data[0] if resp.data else None
+
+    def list_assignment_views_by_mentor(self, mentor_id: int) -> List[Dict]:
+        resp = (self._sb.table("mentorship_assignments").select(VIEW_COLUMNS)
+                .eq("mentor_id", mentor_id).order("assignment_id", desc=False).execute())
+        return resp.data or []
+
+    def list_assignment_views_by_student(self, student_id: int) -> List[Dict]:
+        resp = (self._sb.table("mentorship_assignments").select(VIEW_COLUMNS)
+                .eq("student_id", student_id).order("assignment_id", desc=False).execute())
         return resp.data or []
 
     def update_assignment(self, assignment_id: int, fields: Dict) -> Optional[Dict]:
-        self._sb.table("mentorship_assignments").update(fields).eq("assignment_id", assignment_id).execute()
-        resp = self._sb.table("mentorship_assignments").select("*").eq("assignment_id", assignment_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        if not fields:
+            return self.get_assignment_by_id(assignment_id)
+        self._cache.invalidate("mentorship_assignments", assignment_id)
+        # PostgREST returns the updated representation, no follow-up SELECT needed
+        resp = self._sb.table("mentorship_assignments").update(fields).eq("assignment_id", assignment_id).execute()
+        assignment = resp.data[0] if resp.data else None
+        self._cache.put("mentorship_assignments", assignment_id, assignment)
+        return assignment
 
     def delete_assignment(self, assignment_id: int) -> Optional[Dict]:
-        resp_before = self._sb.table("mentorship_assignments").select("*").eq("assignment_id", assignment_id).limit(1).execute()
-        assignment = resp_before.data[0] if resp_before.data else None
-        if assignment:
-            self._sb.table("mentorship_assignments").delete().eq("assignment_id", assignment_id).execute()
-        return assignment
\ No newline at end of file
+        resp = self._sb.table("mentorship_assignments").delete().eq("assignment_id", assignment_id).execute()
+        self._cache.invalidate("mentorship_assignments", assignment_id)
+        return resp.data[0] if resp.data else None
@@ -0,0 +1,84 @@
+# src/dao/pagination.py
+"""Keyset pagination shared by the ``iter_*`` DAO methods.
+
+Pages are fetched with ``key > last_key`` (or ``(order_col, key) > (last_order, last_key)``
+when the table is listed by a non-unique column), so every page is an index range scan
+and memory stays bounded by ``page_size`` no matter how large the table is.
+"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from src.dao.filters import FilterLike, apply_residual, push_down, quote_value
+from src.dao.records import Record
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+def _fetch_page(make_query: Callable, filters: FilterLike, key: str, order_column: Optional[str],
+                cursor: Optional[Dict], page_size: int) -> Tuple[List[Dict], Optional[Dict], int]:
+    query, residual = push_down(make_query(), filters)
+    if cursor is not None:
+        if order_column:
+            last_order = quote_value(cursor[order_column])
+            last_key = quote_value(cursor[key])
+            query = query.or_(
+                f"{order_column}.gt.{last_order},"
+                f"and({order_column}.eq.{last_order},{key}.gt.{last_key})"
+            )
+        else:
+            query = query.gt(key, cursor[key])
+    if order_column:
+        query = query.order(order_column, desc=False)
+    query = query.order(key, desc=False).limit(page_size)
+    rows = query.execute().data or []
+    # the cursor must come from the last row returned by the server, not the filtered page
+    cursor = None
+    if rows:
+        cursor = {key: rows[-1][key]}
+        if order_column:
+            cursor[order_column] = rows[-1][order_column]
+    return apply_residual(rows, residual), cursor, len(rows)
+
+
+def iter_pages(make_query: Callable, key: str, filters: FilterLike = None,
+               order_column: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE,
+               prefetch: bool = False) -> Iterator[List[Dict]]:
+    """Yield pages of rows. ``make_query`` returns a fresh ``table(...).select(...)`` builder.
+
+    With ``prefetch`` the next page is requested in a background thread while the caller
+    consumes the current one.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+
+    def fetch(cursor):
+        return _fetch_page(make_query, filters, key, order_column, cursor, page_size)
+
+    if not prefetch:
+        cursor = None
+        while True:
+            rows, cursor, fetched = fetch(cursor)
+            if rows:
+                yield rows
+            if fetched < page_size:
+                return
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        rows, cursor, fetched = fetch(None)
+        while True:
+            # copy the context so traced spans stay attributed to the calling service method
+            pending = pool.submit(contextvars.copy_context().run, fetch, cursor) if fetched == page_size else None
+            if rows:
+                yield rows
+            if pending is None:
+                return
+            rows, cursor, fetched = pending.result()
+
+
+def iter_rows(make_query: Callable, key: str, filters: FilterLike = None,
+              order_column: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE,
+              prefetch: bool = False, record_type: Optional[Type[Record]] = None) -> Iterator[Dict]:
+    """Rows of every page; decoded a page at a time into ``record_type`` when given."""
+    for page in iter_pages(make_query, key, filters, order_column, page_size, prefetch):
+        yield from record_type.decode(page) if record_type is not None else page
@@ -0,0 +1,248 @@
+# src/dao/records.py
+"""Typed rows for the DAO list and stream results.
+
+A dict per row costs about as much again as the values it holds. Records keep one
+slot per column (``__slots__``) and read like the dicts they replace:
+``row["name"]``, ``row.get(...)``, ``dict(row)``, ``{**row}``, ``==`` against a dict, and
+item assignment. The few distinct values of columns like industry or location are
+shared between rows rather than held once per row. Columns a record type doesn't
+declare (a column added to the schema before the class) are kept in a per-row overflow
+dict. Columns a narrowed select left out are absent, as they would be from the dict.
+
+``from_row`` takes a row as the client parsed it from the response and fills the slots
+of the columns it has.
+"""
+from collections.abc import MutableMapping
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Type, TypeVar, get_type_hints
+
+# distinct values of the SHARED columns kept for reuse; a column with more than this many
+# only loses some of the sharing
+SHARED_VALUES_CACHE = 4096
+
+R = TypeVar("R", bound="Record")
+
+# table name -> record type, filled by @record
+RECORD_TYPES: Dict[str, Type["Record"]] = {}
+
+
+def _rebuild(cls: Type[R], row: Dict) -> R:
+    return cls.from_row(row)
+
+
+@lru_cache(maxsize=SHARED_VALUES_CACHE)
+def _shared(value: str) -> str:
+    # the first equal string seen, while it stays in the cache
+    return value
+
+
+class Record(MutableMapping):
+    """Base of the row types; see the module docstring."""
+
+    __slots__ = ("_extra",)
+
+    # set by @record on every subclass
+    TABLE: ClassVar[str] = ""
+    FIELDS: ClassVar[Tuple[str, ...]] = ()
+    INT_FIELDS: ClassVar[Tuple[str, ...]] = ()
+    # declared by subclasses: text columns with few distinct values
+    SHARED: ClassVar[Tuple[str, ...]] = ()
+
+    def __init__(self, *values: Any, _extra: Optional[Dict] = None):
+        """Columns in ``FIELDS`` order; trailing ones may be left out."""
+        if len(values) > len(self.FIELDS):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.FIELDS)} values")
+        for name, value in zip(self.FIELDS, values):
+            setattr(self, name, value)
+        self._extra = _extra
+
+    @classmethod
+    def from_row(cls: Type[R], row: Mapping) -> R:
+        """A record holding ``row``'s columns."""
+        record = cls.__new__(cls)
+        record._extra = None
+        fields, shared = cls._field_set, cls._shared_set
+        for key, value in row.items():
+            if key in fields:
+                if key in shared and value.__class__ is str:
+                    value = _shared(value)
+                setattr(record, key, value)
+            elif record._extra is None:
+                record._extra = {key: value}
+            else:
+                record._extra[key] = value
+        return record
+
+    @classmethod
+    def decode(cls: Type[R], rows: Iterable[Mapping]) -> List[R]:
+        from_row = cls.from_row
+        return [from_row(row) for row in rows]
+
+    def to_dict(self) -> Dict[str, Any]:
+        try:
+            row = dict(zip(self.FIELDS, self._attrs(self)))
+        except AttributeError:
+            row = {name: getattr(self, name) for name in self.FIELDS if hasattr(self, name)}
+        if self._extra:
+            row.update(self._extra)
+        return row
+
+    def copy(self: R) -> R:
+        new = self.__new__(type(self))
+        try:
+            values = zip(self.FIELDS, self._attrs(self))
+        except AttributeError:
+            # some columns unset (a narrowed select)
+            values = ((name, getattr(self, name)) for name in self.FIELDS if hasattr(self, name))
+        for name, value in values:
+            setattr(new, name, value)
+        new._extra = dict(self._extra) if self._extra else None
+        return new
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._field_set:
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self._field_set:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(hasattr(self, name) for name in self.FIELDS) + len(self._extra or ())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.items())})"
+
+    # pickled (st.cache_data, copy.copy) as the row dict; unset slots have no state to save
+    def __reduce__(self):
+        return _rebuild, (type(self), self.to_dict())
+
+
+def record(table: str):
+    """Rebuild the decorated class with one slot per annotated column, for ``table``."""
+    def wrap(cls: Type[R]) -> Type[R]:
+        names = tuple(cls.__annotations__)
+        namespace = {k: v for k, v in cls.__dict__.items() if k not in ("__dict__", "__weakref__")}
+        namespace["__slots__"] = names
+        cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+        hints = get_type_hints(cls)
+        cls.TABLE = table
+        cls.FIELDS = names
+        cls.INT_FIELDS = tuple(n for n in names if hints[n] in (int, Optional[int]))
+        cls._field_set = frozenset(names)
+        cls._shared_set = frozenset(cls.SHARED)
+        cls._values = itemgetter(*names)
+        cls._attrs = attrgetter(*names)
+        RECORD_TYPES[table] = cls
+        return cls
+    return wrap
+
+
+# Timestamps and dates stay the ISO strings the backend sends.
+
+@record("alumni")
+class Alumni(Record):
+    SHARED = ("industry", "location")
+
+    alumni_id: int
+    name: str
+    email: str
+    industry: Optional[str]
+    graduation_year: Optional[int]
+    location: Optional[str]
+    created_at: str
+    updated_at: str
+
+
+@record("students")
+class Student(Record):
+    SHARED = ("course",)
+
+    student_id: int
+    name: str
+    email: str
+    course: Optional[str]
+    year: Optional[int]
+    created_at: str
+    updated_at: str
+
+
+@record("events")
+class Event(Record):
+    SHARED = ("location",)
+
+    event_id: int
+    event_name: str
+    event_date: str
+    location: Optional[str]
+    description: Optional[str]
+    capacity: Optional[int]
+    seats_taken: int
+    waitlist_size: int
+    alumni_count: int
+    student_count: int
+    created_at: str
+    updated_at: str
+
+
+@record("mentors")
+class Mentor(Record):
+    mentor_id: int
+    alumni_id: int
+    skills: Optional[str]
+    created_at: str
+    updated_at: str
+
+
+@record("mentorship_assignments")
+class Assignment(Record):
+    assignment_id: int
+    mentor_id: int
+    student_id: int
+    start_date: Optional[str]
+    end_date: Optional[str]
+    created_at: str
+    updated_at: str
+
+
+@record("event_registrations")
+class Registration(Record):
+    SHARED = ("user_type", "status")
+
+    registration_id: int
+    event_id: int
+    user_id: int
+    user_type: str
+    status: str
+    registered_at: str
+    updated_at: str
+
@@ -0,0 +1,429 @@
+# src/dao/registration_journal.py
+"""Write-behind queue for event registrations, backed by a durable local journal.
+
+With ``REGISTRATION_WRITE_BEHIND=1`` a sign-up is appended to a JSON-lines journal,
+fsynced and acknowledged with ``status: "pending"`` without waiting for the backend. A
+background thread drains the queue in batches, one ``register_many_for_event`` call per
+event, retrying with exponential backoff while the backend is unreachable. Whether a user
+gets a seat or a waitlist slot is decided when the batch lands, in sign-up order.
+
+The journal holds ``register`` records and ``done`` markers for records that were flushed,
+rejected or cancelled before they were sent. On start-up every record without a marker is
+queued again. Replay is idempotent because ``register_many_for_event`` skips users who
+are already registered, so a crash between a flush and its marker costs nothing.
+
+    journal = get_registration_journal(sink)
+    journal.append(event_id, user_id, "student")   # returns at once
+    journal.flush(timeout=10)                      # wait for the backend
+    print(journal.metrics())
+
+One process owns a journal file at a time; give each process its own path.
+"""
+import atexit
+import datetime
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+REGISTRATION_WRITE_BEHIND = os.getenv("REGISTRATION_WRITE_BEHIND", "0").lower() in ("1", "true", "yes", "on")
+REGISTRATION_JOURNAL_PATH = os.getenv("REGISTRATION_JOURNAL_PATH", "registration_journal.jsonl")
+REGISTRATION_FLUSH_INTERVAL = float(os.getenv("REGISTRATION_FLUSH_INTERVAL", "0.2"))
+REGISTRATION_FLUSH_BATCH = int(os.getenv("REGISTRATION_FLUSH_BATCH", "500"))
+REGISTRATION_JOURNAL_FSYNC = os.getenv("REGISTRATION_JOURNAL_FSYNC", "1").lower() in ("1", "true", "yes", "on")
+# the journal is rewritten without its finished records once it grows past this
+JOURNAL_COMPACT_BYTES = 1 << 20
+MAX_RETRY_DELAY = 30.0
+CLOSE_TIMEOUT = 5.0
+_LATENCY_WINDOW = 1000
+
+# invalid data, an unknown event or user: retrying cannot help, so the records are dropped
+_PERMANENT_CODES = ("P0002", "22", "23")
+
+Key = Tuple[int, int, str]
+Sink = Callable[[int, List[Tuple[int, str]]], List[Dict]]
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(p * len(values)))], 3)
+
+
+class RegistrationJournal:
+    """Durable write-behind queue; ``sink(event_id, [(user_id, user_type), ...])`` does the writes."""
+
+    def __init__(self, path: str, sink: Sink, flush_interval: float = REGISTRATION_FLUSH_INTERVAL,
+                 batch_size: int = REGISTRATION_FLUSH_BATCH, fsync: bool = REGISTRATION_JOURNAL_FSYNC):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self._sink = sink
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._sync_lock = threading.Lock()
+        self._queue: "OrderedDict[int, Dict]" = OrderedDict()
+        self._in_flight: Dict[int, Dict] = {}
+        self._keys: Dict[Key, int] = {}
+        self._seq = 0
+        self._written = 0
+        self._synced = 0
+        self._flush_requested = False
+        # bumped by every flush() call; ends a retry backoff early
+        self._flush_calls = 0
+        self._closing = False
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+        self._append_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._flush_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._rejected: Deque[Dict] = deque(maxlen=100)
+        self.counters = {"appended": 0, "replayed": 0, "flushed": 0, "rejected": 0, "cancelled": 0,
+                         "flush_batches": 0, "flush_failures": 0, "fsyncs": 0}
+        self._failures = 0
+        self._last_error: Optional[str] = None
+
+    # Replay unfinished records and start the flusher thread
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            pending = self._read_pending()
+            for record in pending:
+                self._enqueue(record)
+            self.counters["replayed"] = len(pending)
+            self._rewrite(pending)
+            self._thread = threading.Thread(target=self._run, name="registration-journal", daemon=True)
+            self._thread.start()
+
+    def append(self, event_id: int, user_id: int, user_type: str) -> Dict:
+        """Journal a sign-up and acknowledge it; ``created`` is False if it is already queued."""
+        start = time.perf_counter()
+        key = (int(event_id), int(user_id), user_type)
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("Registration journal is closed.")
+            seq = self._keys.get(key)
+            if seq is not None:
+                return self._ack(self._queue.get(seq) or self._in_flight[seq], created=False)
+            self._seq += 1
+            record = {"op": "register", "seq": self._seq, "event_id": key[0], "user_id": key[1],
+                      "user_type": user_type, "queued_at": _now()}
+            self._write(record)
+            self._enqueue(record)
+            self.counters["appended"] += 1
+            upto = self._written
+            self._changed.notify_all()
+        self._sync(upto)
+        self._append_ms.append((time.perf_counter() - start) * 1000)
+        return self._ack(record, created=True)
+
+    def pending(self, event_id: Optional[int] = None, user_id: Optional[int] = None,
+                user_type: Optional[str] = None) -> List[Dict]:
+        """Queued and in-flight registrations, oldest first, optionally filtered."""
+        with self._lock:
+            records = sorted(list(self._queue.values()) + list(self._in_flight.values()), key=lambda r: r["seq"])
+        return [self._ack(r, created=True) for r in records
+                if (event_id is None or r["event_id"] == event_id)
+                and (user_id is None or r["user_id"] == user_id)
+                and (user_type is None or r["user_type"] == user_type)]
+
+    def discard(self, event_id: int, user_id: int, user_type: str) -> Optional[Dict]:
+        """Take a not-yet-sent registration back out of the queue.
+
+        Returns the dropped registration, or None when there is nothing queued for the user.
+        A registration that is being sent right now is waited for first, so the caller can
+        then cancel it on the backend.
+        """
+        key = (int(event_id), int(user_id), user_type)
+        with self._lock:
+            while self._keys.get(key) in self._in_flight:
+                self._changed.wait()
+            seq = self._keys.get(key)
+            if seq is None:
+                return None
+            record = self._queue.pop(seq)
+            del self._keys[key]
+            self._write({"op": "done", "seqs": [seq], "outcome": "cancelled"})
+            self.counters["cancelled"] += 1
+            upto = self._written
+            self._changed.notify_all()
+        self._sync(upto)
+        return self._ack(record, created=True)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Send everything queued now and wait; False if records are still pending at the timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._flush_requested = True
+            self._flush_calls += 1
+            self._changed.notify_all()
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+            return True
+
+    def close(self, timeout: float = CLOSE_TIMEOUT):
+        """Try to flush, then stop; anything still queued is replayed on the next start."""
+        if self._thread is None or self._closing:
+            return
+        self.flush(timeout)
+        with self._lock:
+            self._closing = True
+            self._changed.notify_all()
+        self._thread.join(timeout)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            queued = list(self._queue.values()) + list(self._in_flight.values())
+            counters = dict(self.counters)
+            rejected = list(self._rejected)
+            in_flight = len(self._in_flight)
+        oldest = min((r["queued_at"] for r in queued), default=None)
+        age = None
+        if oldest is not None:
+            age = (datetime.datetime.now(datetime.timezone.utc) - datetime.datetime.fromisoformat(oldest)).total_seconds()
+        flush_ms, append_ms = list(self._flush_ms), list(self._append_ms)
+        return {
+            "enabled": True,
+            "path": self.path,
+            "queue_depth": len(queued),
+            "in_flight": in_flight,
+            "oldest_pending_s": round(age, 3) if age is not None else None,
+            **counters,
+            "consecutive_failures": self._failures,
+            "last_error": self._last_error,
+            "append_ms": {"p50": _percentile(append_ms, 0.5), "p95": _percentile(append_ms, 0.95)},
+            "flush_ms": {"last": round(flush_ms[-1], 3) if flush_ms else None,
+                         "p50": _percentile(flush_ms, 0.5), "p95": _percentile(flush_ms, 0.95),
+                         "max": round(max(flush_ms), 3) if flush_ms else None},
+            "journal_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "recent_rejections": rejected,
+        }
+
+    @staticmethod
+    def _ack(record: Dict, created: bool) -> Dict:
+        return {"event_id": record["event_id"], "user_id": record["user_id"], "user_type": record["user_type"],
+                "status": "pending", "created": created, "queued_at": record["queued_at"],
+                "journal_seq": record["seq"]}
+
+    # --- flusher ---
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._queue and not self._closing:
+                    self._changed.wait()
+                if self._closing:
+                    return
+                # let a burst of sign-ups gather into one batch
+                deadline = time.monotonic() + self.flush_interval
+                while not (self._flush_requested or self._closing) and len(self._queue) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                if self._closing:
+                    return
+                batch = self._take_batch()
+            if self._send(batch):
+                self._failures = 0
+                continue
+            self._failures += 1
+            self._back_off(min(MAX_RETRY_DELAY, self.flush_interval * 2 ** self._failures))
+
+    def _back_off(self, delay: float):
+        # appends and finished records notify the same condition, so wait out the whole delay;
+        # only close() or a new flush() call cuts it short
+        deadline = time.monotonic() + delay
+        with self._lock:
+            flush_calls = self._flush_calls
+            while not self._closing and self._flush_calls == flush_calls:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._changed.wait(remaining)
+
+    def _take_batch(self) -> List[Dict]:
+        batch = []
+        while self._queue and len(batch) < self.batch_size:
+            seq, record = self._queue.popitem(last=False)
+            self._in_flight[seq] = record
+            batch.append(record)
+        if not self._queue:
+            self._flush_requested = False
+        return batch
+
+    def _send(self, batch: List[Dict]) -> bool:
+        groups: "OrderedDict[int, List[Dict]]" = OrderedDict()
+        for record in batch:
+            groups.setdefault(record["event_id"], []).append(record)
+        ok = True
+        for event_id, records in groups.items():
+            if not ok:
+                self._finish(records, None)
+                continue
+            start = time.perf_counter()
+            try:
+                self._sink(event_id, [(r["user_id"], r["user_type"]) for r in records])
+            except APIError as e:
+                if e.code and e.code.startswith(_PERMANENT_CODES):
+                    ok = self._isolate(event_id, records, e)
+                    continue
+                ok = self._failed(records, f"{e.code}: {e.message}")
+                continue
+            except Exception as e:
+                ok = self._failed(records, f"{type(e).__name__}: {e}")
+                continue
+            self._flush_ms.append((time.perf_counter() - start) * 1000)
+            self._finish(records, "flushed")
+        return ok
+
+    def _isolate(self, event_id: int, records: List[Dict], error: APIError) -> bool:
+        """Resend a rejected group one record at a time so only the bad ones are dropped."""
+        if len(records) == 1:
+            self._finish(records, "rejected", f"{error.code}: {error.message}")
+            return True
+        for i, record in enumerate(records):
+            try:
+                self._sink(event_id, [(record["user_id"], record["user_type"])])
+            except APIError as e:
+                if not (e.code and e.code.startswith(_PERMANENT_CODES)):
+                    return self._failed(records[i:], f"{e.code}: {e.message}")
+                self._finish([record], "rejected", f"{e.code}: {e.message}")
+            except Exception as e:
+                return self._failed(records[i:], f"{type(e).__name__}: {e}")
+            else:
+                self._finish([record], "flushed")
+        return True
+
+    def _failed(self, records: List[Dict], error: str) -> bool:
+        self._last_error = error
+        self.counters["flush_failures"] += 1
+        self._finish(records, None)
+        return False
+
+    def _finish(self, records: List[Dict], outcome: Optional[str], error: Optional[str] = None):
+        """Mark records done with ``outcome``, or put them back at the front of the queue (None)."""
+        seqs = [r["seq"] for r in records]
+        with self._lock:
+            for seq in seqs:
+                self._in_flight.pop(seq, None)
+            if outcome is None:
+                self._queue = OrderedDict([(r["seq"], r) for r in records] + list(self._queue.items()))
+            else:
+                for r in records:
+                    del self._keys[(r["event_id"], r["user_id"], r["user_type"])]
+                self._write({"op": "done", "seqs": seqs, "outcome": outcome})
+                if outcome == "flushed":
+                    self.counters["flushed"] += len(records)
+                    self.counters["flush_batches"] += 1
+                else:
+                    self.counters["rejected"] += len(records)
+                    self._rejected.extend({**self._ack(r, created=True), "error": error} for r in records)
+            upto = self._written
+            self._compact()
+            self._changed.notify_all()
+        self._sync(upto)
+
+    # --- journal file ---
+    def _enqueue(self, record: Dict):
+        self._queue[record["seq"]] = record
+        self._keys[(record["event_id"], record["user_id"], record["user_type"])] = record["seq"]
+
+    def _read_pending(self) -> List[Dict]:
+        if not os.path.exists(self.path):
+            return []
+        records: "OrderedDict[int, Dict]" = OrderedDict()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue    # torn last line from a crash mid-append
+                if entry.get("op") == "register":
+                    records[entry["seq"]] = entry
+                    self._seq = max(self._seq, entry["seq"])
+                elif entry.get("op") == "done":
+                    for seq in entry["seqs"]:
+                        records.pop(seq, None)
+        return list(records.values())
+
+    def _write(self, entry: Dict):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        self._written += 1
+
+    def _sync(self, upto: int):
+        # group commit: one fsync covers every line written before it started
+        if not self.fsync:
+            return
+        with self._sync_lock:
+            if self._synced >= upto:
+                return
+            with self._lock:
+                target = self._written
+                # a duplicate, so a concurrent rewrite can close the journal meanwhile
+                fd = os.dup(self._file.fileno()) if self._file is not None else None
+            if fd is not None:
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                self.counters["fsyncs"] += 1
+            self._synced = max(self._synced, target)
+
+    def _compact(self):
+        if self._queue or self._in_flight:
+            if self._file is None or self._file.tell() < JOURNAL_COMPACT_BYTES:
+                return
+        elif self._file is None or self._file.tell() == 0:
+            return
+        self._rewrite(sorted(list(self._queue.values()) + list(self._in_flight.values()), key=lambda r: r["seq"]))
+
+    def _rewrite(self, records: List[Dict]):
+        """Atomically replace the journal with just ``records``; caller holds the lock."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._synced = max(self._synced, self._written)
+
+
+_journals: Dict[str, RegistrationJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_registration_journal(sink: Sink, path: Optional[str] = None) -> RegistrationJournal:
+    """Process-wide journal for ``path``, started on first use and flushed at exit."""
+    path = path or REGISTRATION_JOURNAL_PATH
+    with _journals_lock:
+        journal = _journals.get(path)
+        if journal is None:
+            journal = _journals[path] = RegistrationJournal(path, sink)
+            journal.start()
+            atexit.register(journal.close)
+        return journal
@@ -1,36 +1,81 @@
 # src/dao/students_dao.py
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from typing import Optional, Iterable, Iterator, List, Dict, Set
+from src.config import get_client
+from src.dao.batching import DEFAULT_CHUNK_SIZE, fetch_many
+from src.dao.cache import get_entity_cache
+from src.dao.filters import FilterLike, apply_residual, push_down
+from src.dao.pagination import DEFAULT_PAGE_SIZE, iter_rows
+from src.dao.records import Student
 
 class StudentsDAO:
     def __init__(self):
-        self._sb = get_supabase()
+        self._sb = get_client()
+        self._cache = get_entity_cache()
 
     def create_student(self, name: str, email: str, course: str = None, year: int = None) -> Optional[Dict]:
         payload = {"name": name, "email": email, "course": course, "year": year}
         resp = self._sb.table("students").insert(payload).execute()
-        return resp.data[0] if resp.data else None
+        student = resp.data[0] if resp.data else None
+        if student:
+            self._cache.put("students", student["student_id"], student)
+        return student
+
+    def create_many(self, rows: List[Dict]) -> List[Dict]:
+        if not rows:
+            return []
+        resp = self._sb.table("students").insert(rows).execute()
+        return resp.data or []
+
+    def find_existing_emails(self, emails: List[str], chunk_size: int = 200) -> Set[str]:
+        found = set()
+        for i in range(0, len(emails), chunk_size):
+            resp = self._sb.table("students").select("email").in_("email", emails[i:i + chunk_size]).execute()
+            found.update(r["email"] for r in resp.data or [])
+        return found
 
     def get_student_by_id(self, student_id: int) -> Optional[Dict]:
+        student = self._cache.get("students", student_id)
+        if student is not None:
+            return student
         resp = self._sb.table("students").select("*").eq("student_id", student_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        student = resp.data[0] if resp.data else None
+        self._cache.put("students", student_id, student)
+        return student
+
+    def get_many(self, student_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Optional[Dict]]:
+        return fetch_many(self._sb, self._cache, "students", "student_id", student_ids, chunk_size)
 
     def get_student_by_email(self, email: str) -> Optional[Dict]:
         resp = self._sb.table("students").select("*").eq("email", email).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        student = resp.data[0] if resp.data else None
+        if student:
+            self._cache.put("students", student["student_id"], student)
+        return student
 
-    def list_students(self) -> List[Dict]:
-        resp = self._sb.table("students").select("*").order("student_id", desc=False).execute()
-        return resp.data or []
+    def list_students(self, filters: FilterLike = None) -> List[Student]:
+        query, residual = push_down(self._sb.table("students").select("*"), filters)
+        resp = query.order("student_id", desc=False).execute()
+        return Student.decode(apply_residual(resp.data or [], residual))
+
+    def iter_students(self, filters: FilterLike = None, page_size: int = DEFAULT_PAGE_SIZE,
+                      prefetch: bool = False, columns: str = "*") -> Iterator[Student]:
+        return iter_rows(lambda: self._sb.table("students").select(columns), "student_id", filters,
+                         page_size=page_size, prefetch=prefetch, record_type=Student if columns == "*" else None)
 
     def update_student(self, student_id: int, fields: Dict) -> Optional[Dict]:
-        self._sb.table("students").update(fields).eq("student_id", student_id).execute()
-        resp = self._sb.table("students").select("*").eq("student_id", student_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        if not fields:
+            return self.get_student_by_id(student_id)
+        self._cache.invalidate("students", student_id)
+        # PostgREST returns the updated representation, no follow-up SELECT needed
+        resp = self._sb.table("students").update(fields).eq("student_id", student_id).execute()
+        student = resp.data[0] if resp.data else None
+        self._cache.put("students", student_id, student)
+        return student
 
     def delete_student(self, student_id: int) -> Optional[Dict]:
-        resp_before = self._sb.table("students").select("*").eq("student_id", student_id).limit(1).execute()
-        student = resp_before.data[0] if resp_before.data else None
-        if student:
-            self._sb.table("students").delete().eq("student_id", student_id).execute()
-        return student
+        resp = self._sb.table("students").delete().eq("student_id", student_id).execute()
+        self._cache.invalidate("students", student_id)
+        self._cache.invalidate_table("mentorship_assignments")
+        # the student's registrations are cancelled with it, which moves event counters
+        self._cache.invalidate_table("events")
+        return resp.data[0] if resp.data else None
@@ -0,0 +1,704 @@
+# src/db/sqlite_client.py
+"""Embedded SQLite backend exposing the subset of the Supabase query-builder API used by the DAOs.
+
+The DAOs only ever talk to ``client.table(name).<builder calls>.execute()``, so this module
+implements the same chainable builder on top of ``sqlite3``. Responses carry ``.data`` (and
+``.count`` when requested) just like ``postgrest.APIResponse``, and integrity errors are raised
+as ``postgrest.APIError`` with the matching Postgres SQLSTATE so callers handle both backends
+the same way.
+"""
+import os
+import sqlite3
+import threading
+import warnings
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "sqlite_schema.sql")
+# the timestamp format of the schema's defaults
+_NOW = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+_OPERATORS = {
+    "eq": "=",
+    "neq": "<>",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+}
+
+
+class SQLiteResponse:
+    def __init__(self, data: List[Dict], count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def _api_error(exc: sqlite3.Error) -> APIError:
+    message = str(exc)
+    if "UNIQUE constraint failed" in message:
+        code = "23505"
+    elif "FOREIGN KEY constraint failed" in message:
+        code = "23503"
+    elif "NOT NULL constraint failed" in message:
+        code = "23502"
+    elif "CHECK constraint failed" in message:
+        code = "23514"
+    elif "no such column" in message:
+        code = "42703"
+    else:
+        code = "SQLITE"
+    return APIError({"message": message, "code": code, "hint": None, "details": None})
+
+
+# --- PostgREST logic-tree parsing (used by or_) ---
+def _split_top_level(text: str) -> List[str]:
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and ch == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    if current:
+        parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+def _parse_logic(text: str) -> Tuple:
+    """Parse ``a.eq.1,and(b.gt.2,c.is.null)`` into a condition tree."""
+    nodes = []
+    for part in _split_top_level(text):
+        negate = False
+        if part.startswith("not."):
+            negate, part = True, part[4:]
+        for joiner in ("and", "or"):
+            if part.startswith(joiner + "(") and part.endswith(")"):
+                node = (joiner, _parse_logic(part[len(joiner) + 1:-1]))
+                break
+        else:
+            column, op, value = part.split(".", 2)
+            if op == "not":
+                negate = not negate
+                op, value = value.split(".", 1)
+            if op == "in":
+                value = [_unquote(v) for v in _split_top_level(value.strip()[1:-1])]
+            elif op == "is":
+                value = {"null": None, "true": True, "false": False}[value.lower()]
+            else:
+                value = _unquote(value)
+            node = ("cond", column, op, value)
+        nodes.append(("not", node) if negate else node)
+    return tuple(nodes)
+
+
+def _like_pattern(pattern: str) -> str:
+    return str(pattern).replace("*", "%")
+
+
+def _condition_sql(column: str, op: str, value: Any) -> Tuple[str, List]:
+    col = f'"{column}"'
+    if op in _OPERATORS:
+        return f"{col} {_OPERATORS[op]} ?", [value]
+    if op == "ilike":
+        return f"{col} LIKE ? ESCAPE '\\'", [_like_pattern(value)]
+    if op == "like":
+        return f"{col} GLOB ?", [_like_pattern(value).replace("%", "*").replace("_", "?")]
+    if op == "is":
+        if value is None:
+            return f"{col} IS NULL", []
+        return f"{col} IS ?", [1 if value else 0]
+    if op == "in":
+        values = list(value)
+        if not values:
+            return "0", []
+        return f"{col} IN ({', '.join('?' for _ in values)})", values
+    raise APIError({"message": f"Unsupported operator: {op}", "code": "PGRST100", "hint": None, "details": None})
+
+
+def _tree_sql(node: Tuple) -> Tuple[str, List]:
+    kind = node[0]
+    if kind == "cond":
+        return _condition_sql(node[1], node[2], node[3])
+    if kind == "not":
+        sql, params = _tree_sql(node[1])
+        return f"NOT ({sql})", params
+    parts, params = [], []
+    for child in node[1]:
+        sql, child_params = _tree_sql(child)
+        parts.append(f"({sql})")
+        params.extend(child_params)
+    return (" AND " if kind == "and" else " OR ").join(parts) or "1", params
+
+
+# --- select parsing ---
+def _parse_select(columns: str) -> List[Tuple]:
+    """Parse a PostgREST select string into ("star",), ("col", name, alias),
+    ("count", alias) and ("embed", name, alias, sub_spec) items."""
+    spec = []
+    for item in _split_top_level(columns or "*"):
+        alias = None
+        if ":" in item.split("(", 1)[0]:
+            alias, item = item.split(":", 1)
+            alias = alias.strip()
+            item = item.strip()
+        if item == "*":
+            spec.append(("star",))
+        elif "(" in item and item.endswith(")"):
+            name, inner = item.split("(", 1)
+            name = name.split("!", 1)[0].strip()
+            spec.append(("embed", name, alias or name, _parse_select(inner[:-1])))
+        elif item == "count":
+            spec.append(("count", alias or "count"))
+        else:
+            spec.append(("col", item, alias or item))
+    return spec
+
+
+class SQLiteQueryBuilder:
+    def __init__(self, client: "SQLiteClient", table: str):
+        self._client = client
+        self._table = table
+        self._action = "select"
+        self._columns = "*"
+        self._count = None
+        self._payload = None
+        self._on_conflict: Optional[Tuple[str, bool]] = None
+        self._where: List[Tuple] = []
+        self._embed_where: Dict[str, List[Tuple]] = {}
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+
+    # --- actions ---
+    def select(self, *columns: str, count: Optional[str] = None) -> "SQLiteQueryBuilder":
+        self._action = "select"
+        self._columns = ",".join(columns) if columns else "*"
+        self._count = count
+        return self
+
+    def insert(self, payload, **_) -> "SQLiteQueryBuilder":
+        self._action = "insert"
+        self._payload = payload
+        return self
+
+    def upsert(self, payload, *, on_conflict: str = "", ignore_duplicates: bool = False, **_) -> "SQLiteQueryBuilder":
+        self._action = "insert"
+        self._payload = payload
+        self._on_conflict = (on_conflict, ignore_duplicates)
+        return self
+
+    def update(self, payload: Dict, **_) -> "SQLiteQueryBuilder":
+        self._action = "update"
+        self._payload = payload
+        return self
+
+    def delete(self, **_) -> "SQLiteQueryBuilder":
+        self._action = "delete"
+        return self
+
+    # --- filters ---
+    def _filter(self, column: str, op: str, value: Any) -> "SQLiteQueryBuilder":
+        self._where.append(("cond", column, op, value))
+        return self
+
+    def eq(self, column: str, value: Any):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any):
+        return self._filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str):
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str):
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any):
+        if isinstance(value, str):
+            value = {"null": None, "true": True, "false": False}[value.lower()]
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: Iterable):
+        return self._filter(column, "in", list(values))
+
+    def or_(self, filters: str, reference_table: Optional[str] = None):
+        if reference_table:
+            # filters the embedded rows (and their counts), not the parent rows
+            self._embed_where.setdefault(reference_table, []).append(("or", _parse_logic(filters)))
+        else:
+            self._where.append(("or", _parse_logic(filters)))
+        return self
+
+    # --- modifiers ---
+    def order(self, column: str, *, desc: bool = False, **_):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size: int, **_):
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **_):
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    # --- execution ---
+    def _where_sql(self) -> Tuple[str, List]:
+        if not self._where:
+            return "", []
+        sql, params = _tree_sql(("and", tuple(self._where)))
+        return f" WHERE {sql}", params
+
+    def execute(self) -> SQLiteResponse:
+        try:
+            with self._client.lock:
+                self._client.round_trips += 1
+                return getattr(self, f"_execute_{self._action}")()
+        except sqlite3.Error as exc:
+            raise _api_error(exc) from exc
+
+    def _execute_select(self) -> SQLiteResponse:
+        conn = self._client.connection
+        where, params = self._where_sql()
+        sql = f'SELECT * FROM "{self._table}"{where}'
+        if self._order:
+            sql += " ORDER BY " + ", ".join(f'"{c}" {"DESC" if d else "ASC"}' for c, d in self._order)
+        if self._limit is not None or self._offset is not None:
+            sql += f" LIMIT {int(self._limit if self._limit is not None else -1)}"
+            if self._offset:
+                sql += f" OFFSET {int(self._offset)}"
+        rows = [dict(r) for r in conn.execute(sql, params)]
+        count = None
+        if self._count:
+            count = conn.execute(f'SELECT COUNT(*) FROM "{self._table}"{where}', params).fetchone()[0]
+        spec = _parse_select(self._columns)
+        return SQLiteResponse(self._client.materialize(self._table, rows, spec, self._embed_where), count)
+
+    def _execute_insert(self) -> SQLiteResponse:
+        conn = self._client.connection
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        inserted = []
+        conn.execute("BEGIN")
+        try:
+            for row in rows:
+                columns = ", ".join(f'"{c}"' for c in row)
+                marks = ", ".join("?" for _ in row)
+                sql = f'INSERT INTO "{self._table}" ({columns}) VALUES ({marks})'
+                if not row:
+                    sql = f'INSERT INTO "{self._table}" DEFAULT VALUES'
+                sql += self._conflict_sql(row) + " RETURNING *"
+                # DO NOTHING on conflict returns no row, matching PostgREST's ignore-duplicates
+                inserted.extend(dict(r) for r in conn.execute(sql, list(row.values())))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return SQLiteResponse(inserted)
+
+    def _conflict_sql(self, row: Dict) -> str:
+        if self._on_conflict is None:
+            return ""
+        target, ignore = self._on_conflict
+        if not target:
+            target = self._client.primary_key(self._table)
+        target_sql = ", ".join(f'"{c.strip()}"' for c in target.split(","))
+        updates = [c for c in row if c not in {t.strip() for t in target.split(",")}]
+        if ignore or not updates:
+            return f" ON CONFLICT ({target_sql}) DO NOTHING"
+        sets = [f'"{c}" = excluded."{c}"' for c in updates]
+        if "updated_at" not in row and self._client.has_column(self._table, "updated_at"):
+            sets.append(f'"updated_at" = {_NOW}')
+        return f" ON CONFLICT ({target_sql}) DO UPDATE SET " + ", ".join(sets)
+
+    def _execute_update(self) -> SQLiteResponse:
+        where, params = self._where_sql()
+        assignments = ", ".join(f'"{c}" = ?' for c in self._payload)
+        # set here rather than by the touch trigger, so RETURNING shows the new value as
+        # the BEFORE UPDATE trigger of migration 005 does
+        if "updated_at" not in self._payload and self._client.has_column(self._table, "updated_at"):
+            assignments += f', "updated_at" = {_NOW}'
+        sql = f'UPDATE "{self._table}" SET {assignments}{where} RETURNING *'
+        return SQLiteResponse(self._client.write(sql, list(self._payload.values()) + params))
+
+    def _execute_delete(self) -> SQLiteResponse:
+        where, params = self._where_sql()
+        return SQLiteResponse(self._client.write(f'DELETE FROM "{self._table}"{where} RETURNING *', params))
+
+
+# --- RPC functions (SQLite versions of migrations/002_event_capacity_waitlist.sql and 006) ---
+def _event_not_found(event_id) -> APIError:
+    return APIError({"message": f"Event with ID {event_id} not found.", "code": "P0002", "hint": None, "details": None})
+
+
+def _locked_event(conn: sqlite3.Connection, event_id) -> Dict:
+    # the caller holds the write transaction, which is what FOR UPDATE gives in Postgres
+    row = conn.execute('SELECT * FROM "events" WHERE "event_id" = ?', [event_id]).fetchone()
+    if row is None:
+        raise _event_not_found(event_id)
+    return dict(row)
+
+
+def _has_seat(event: Dict, seats_taken: int) -> bool:
+    return event["capacity"] is None or seats_taken < event["capacity"]
+
+
+def _rpc_register_for_event(conn, p_event_id, p_user_id, p_user_type):
+    event = _locked_event(conn, p_event_id)
+    existing = conn.execute(
+        'SELECT * FROM "event_registrations" WHERE "event_id" = ? AND "user_id" = ? AND "user_type" = ?',
+        [p_event_id, p_user_id, p_user_type],
+    ).fetchone()
+    if existing is not None:
+        return {**dict(existing), "created": False}
+    if _has_seat(event, event["seats_taken"]):
+        status, counter = "registered", "seats_taken"
+    else:
+        status, counter = "waitlisted", "waitlist_size"
+    conn.execute(f'UPDATE "events" SET "{counter}" = "{counter}" + 1 WHERE "event_id" = ?', [p_event_id])
+    reg = conn.execute(
+        'INSERT INTO "event_registrations" ("event_id", "user_id", "user_type", "status") VALUES (?, ?, ?, ?) RETURNING *',
+        [p_event_id, p_user_id, p_user_type, status],
+    ).fetchone()
+    return {**dict(reg), "created": True}
+
+
+def _rpc_register_many_for_event(conn, p_event_id, p_users):
+    event = _locked_event(conn, p_event_id)
+    seats, waiting = event["seats_taken"], event["waitlist_size"]
+    created = []
+    for user in p_users:
+        status = "registered" if _has_seat(event, seats) else "waitlisted"
+        reg = conn.execute(
+            'INSERT INTO "event_registrations" ("event_id", "user_id", "user_type", "status") VALUES (?, ?, ?, ?) '
+            'ON CONFLICT ("event_id", "user_id", "user_type") DO NOTHING RETURNING *',
+            [p_event_id, user["user_id"], user["user_type"], status],
+        ).fetchone()
+        if reg is not None:
+            seats, waiting = (seats + 1, waiting) if status == "registered" else (seats, waiting + 1)
+            created.append(dict(reg))
+    conn.execute('UPDATE "events" SET "seats_taken" = ?, "waitlist_size" = ? WHERE "event_id" = ?',
+                 [seats, waiting, p_event_id])
+    return created
+
+
+def _rpc_cancel_registration(conn, p_event_id, p_user_id, p_user_type):
+    _locked_event(conn, p_event_id)
+    reg = conn.execute(
+        'DELETE FROM "event_registrations" WHERE "event_id" = ? AND "user_id" = ? AND "user_type" = ? RETURNING *',
+        [p_event_id, p_user_id, p_user_type],
+    ).fetchone()
+    if reg is None:
+        return {"cancelled": None, "promoted": None}
+    reg = dict(reg)
+    promoted = None
+    if reg["status"] == "registered":
+        promoted = conn.execute(
+            f'UPDATE "event_registrations" SET "status" = \'registered\', "updated_at" = {_NOW} WHERE "registration_id" = ('
+            'SELECT "registration_id" FROM "event_registrations" WHERE "event_id" = ? AND "status" = \'waitlisted\' '
+            'ORDER BY "registration_id" LIMIT 1) RETURNING *',
+            [p_event_id],
+        ).fetchone()
+    if reg["status"] == "waitlisted" or promoted is not None:
+        conn.execute('UPDATE "events" SET "waitlist_size" = "waitlist_size" - 1 WHERE "event_id" = ?', [p_event_id])
+    else:
+        conn.execute('UPDATE "events" SET "seats_taken" = "seats_taken" - 1 WHERE "event_id" = ?', [p_event_id])
+    return {"cancelled": reg, "promoted": dict(promoted) if promoted is not None else None}
+
+
+def _rpc_set_event_capacity(conn, p_event_id, p_capacity):
+    event = _locked_event(conn, p_event_id)
+    limit = -1 if p_capacity is None else max(p_capacity - event["seats_taken"], 0)
+    promoted = [dict(r) for r in conn.execute(
+        f'UPDATE "event_registrations" SET "status" = \'registered\', "updated_at" = {_NOW} WHERE "registration_id" IN ('
+        'SELECT "registration_id" FROM "event_registrations" WHERE "event_id" = ? AND "status" = \'waitlisted\' '
+        'ORDER BY "registration_id" LIMIT ?) RETURNING *',
+        [p_event_id, limit],
+    )]
+    promoted.sort(key=lambda r: r["registration_id"])
+    event = conn.execute(
+        'UPDATE "events" SET "capacity" = ?, "seats_taken" = "seats_taken" + ?, "waitlist_size" = "waitlist_size" - ?, '
+        f'"updated_at" = {_NOW} WHERE "event_id" = ? RETURNING *',
+        [p_capacity, len(promoted), len(promoted), p_event_id],
+    ).fetchone()
+    return {"event": dict(event), "promoted": promoted}
+
+
+def _rpc_assign_within_capacity(conn, p_rows, p_limits):
+    # the write transaction stands in for locking the mentors; active counts as in _is_active
+    active: Dict[int, int] = {}
+    created, rejected = [], []
+    for row in p_rows:
+        mentor_id = int(row["mentor_id"])
+        if mentor_id not in active:
+            active[mentor_id] = conn.execute(
+                'SELECT COUNT(*) FROM "mentorship_assignments" WHERE "mentor_id" = ? '
+                'AND ("end_date" IS NULL OR "end_date" = \'\' OR "end_date" >= date(\'now\', \'localtime\'))',
+                [mentor_id],
+            ).fetchone()[0]
+        if active[mentor_id] >= int(p_limits.get(str(mentor_id), 0)):
+            rejected.append(row)
+            continue
+        assignment = conn.execute(
+            'INSERT INTO "mentorship_assignments" ("mentor_id", "student_id", "start_date", "end_date") '
+            'VALUES (?, ?, ?, ?) RETURNING *',
+            [mentor_id, row["student_id"], row.get("start_date"), row.get("end_date")],
+        ).fetchone()
+        active[mentor_id] += 1
+        created.append(dict(assignment))
+    return {"created": created, "over_capacity": rejected}
+
+
+_RPC_FUNCTIONS = {
+    "register_for_event": _rpc_register_for_event,
+    "register_many_for_event": _rpc_register_many_for_event,
+    "cancel_registration": _rpc_cancel_registration,
+    "set_event_capacity": _rpc_set_event_capacity,
+    "assign_within_capacity": _rpc_assign_within_capacity,
+}
+
+# columns added after the first schema, so databases created by older versions keep working
+_ADDED_COLUMNS = {
+    "alumni": [("updated_at", "TEXT")],
+    "students": [("updated_at", "TEXT")],
+    "events": [
+        ("capacity", "INTEGER CHECK (capacity IS NULL OR capacity >= 0)"),
+        ("seats_taken", "INTEGER NOT NULL DEFAULT 0"),
+        ("waitlist_size", "INTEGER NOT NULL DEFAULT 0"),
+        ("alumni_count", "INTEGER NOT NULL DEFAULT 0"),
+        ("student_count", "INTEGER NOT NULL DEFAULT 0"),
+        ("updated_at", "TEXT"),
+    ],
+    "mentors": [("updated_at", "TEXT")],
+    "mentorship_assignments": [("updated_at", "TEXT")],
+    "event_registrations": [
+        ("status", "TEXT NOT NULL DEFAULT 'registered' CHECK (status IN ('registered', 'waitlisted'))"),
+        ("updated_at", "TEXT"),
+    ],
+}
+
+# how an added column is filled from the existing rows, per (table, column)
+_BACKFILLS = {
+    # no capacities yet, so every registration holds a seat
+    ("events", "seats_taken"): 'UPDATE "events" SET "seats_taken" = (SELECT COUNT(*) FROM "event_registrations" r '
+                               'WHERE r."event_id" = "events"."event_id")',
+    ("events", "alumni_count"): 'UPDATE "events" SET "alumni_count" = (SELECT COUNT(*) FROM "event_registrations" r '
+                                'WHERE r."event_id" = "events"."event_id" AND r."user_type" = \'alumni\')',
+    ("events", "student_count"): 'UPDATE "events" SET "student_count" = (SELECT COUNT(*) FROM "event_registrations" r '
+                                 'WHERE r."event_id" = "events"."event_id" AND r."user_type" = \'student\')',
+    # ADD COLUMN can't take a strftime default; the schema's insert triggers stamp new rows
+    **{(table, "updated_at"): f'UPDATE "{table}" SET "updated_at" = "created_at"'
+       for table in ("alumni", "students", "events", "mentors", "mentorship_assignments")},
+    ("event_registrations", "updated_at"): 'UPDATE "event_registrations" SET "updated_at" = "registered_at"',
+}
+
+
+class SQLiteRPC:
+    """``client.rpc(fn, params)``: runs one of ``_RPC_FUNCTIONS`` in a single write transaction."""
+
+    def __init__(self, client: "SQLiteClient", fn: str, params: Dict):
+        self._client = client
+        self._fn = fn
+        self._params = params
+
+    def execute(self) -> SQLiteResponse:
+        func = _RPC_FUNCTIONS.get(self._fn)
+        if func is None:
+            raise APIError({"message": f"Could not find the function public.{self._fn}", "code": "PGRST202",
+                            "hint": None, "details": None})
+        try:
+            with self._client.lock:
+                self._client.round_trips += 1
+                conn = self._client.connection
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    data = func(conn, **self._params)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                return SQLiteResponse(data)
+        except sqlite3.Error as exc:
+            raise _api_error(exc) from exc
+
+
+class SQLiteClient:
+    """Drop-in stand-in for ``supabase.Client`` backed by a single SQLite database."""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.lock = threading.RLock()
+        # one per execute(), the SQLite equivalent of an HTTP request
+        self.round_trips = 0
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+        self._add_missing_columns()
+        with open(SCHEMA_PATH, encoding="utf-8") as f:
+            try:
+                self.connection.executescript(f.read())
+            except sqlite3.IntegrityError as e:
+                # only the trailing unique-email indexes can fail, on files with duplicate emails
+                warnings.warn(f"{path}: unique email indexes not created ({e}); duplicates are not rejected")
+        self._foreign_keys = self._load_foreign_keys()
+        self._columns: Dict[str, set] = {}
+
+    def table(self, table_name: str) -> SQLiteQueryBuilder:
+        return SQLiteQueryBuilder(self, table_name)
+
+    def rpc(self, fn: str, params: Optional[Dict] = None) -> SQLiteRPC:
+        return SQLiteRPC(self, fn, params or {})
+
+    def _add_missing_columns(self):
+        conn = self.connection
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {r["name"] for r in conn.execute(f'PRAGMA table_info("{table}")')}
+            if not existing:
+                continue
+            for name, ddl in columns:
+                if name not in existing:
+                    conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {ddl}')
+                    if (table, name) in _BACKFILLS:
+                        conn.execute(_BACKFILLS[(table, name)])
+
+    def from_(self, table_name: str) -> SQLiteQueryBuilder:
+        return self.table(table_name)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def has_column(self, table: str, column: str) -> bool:
+        if table not in self._columns:
+            self._columns[table] = {r["name"] for r in self.connection.execute(f'PRAGMA table_info("{table}")')}
+        return column in self._columns[table]
+
+    def primary_key(self, table: str) -> str:
+        return next(r["name"] for r in self.connection.execute(f'PRAGMA table_info("{table}")') if r["pk"])
+
+    def write(self, sql: str, params: List) -> List[Dict]:
+        conn = self.connection
+        conn.execute("BEGIN")
+        try:
+            rows = [dict(r) for r in conn.execute(sql, params)]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    # --- embedded resources ---
+    def _load_foreign_keys(self) -> Dict[str, Dict[str, Tuple[str, str]]]:
+        tables = [r[0] for r in self.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )]
+        fks = {}
+        for table in tables:
+            fks[table] = {
+                r["from"]: (r["table"], r["to"])
+                for r in self.connection.execute(f'PRAGMA foreign_key_list("{table}")')
+            }
+        return fks
+
+    def _resolve_embed(self, table: str, name: str) -> Tuple[str, str, str, bool]:
+        """Return (local_column, target_table, target_column, to_many) for an embed."""
+        own = self._foreign_keys.get(table, {})
+        if name in own:
+            target, target_col = own[name]
+            return name, target, target_col, False
+        for column, (target, target_col) in own.items():
+            if target == name:
+                return column, target, target_col, False
+        for column, (target, target_col) in self._foreign_keys.get(name, {}).items():
+            if target == table:
+                return target_col, name, column, True
+        raise APIError({
+            "message": f"Could not find a relationship between '{table}' and '{name}'",
+            "code": "PGRST200", "hint": None, "details": None,
+        })
+
+    def _fetch_in(self, table: str, column: str, values: List, where: Optional[List[Tuple]] = None) -> List[Dict]:
+        extra, extra_params = _tree_sql(("and", tuple(where))) if where else ("1", [])
+        rows = []
+        values = list(values)
+        for i in range(0, len(values), 500):
+            chunk = values[i:i + 500]
+            marks = ", ".join("?" for _ in chunk)
+            rows.extend(dict(r) for r in self.connection.execute(
+                f'SELECT * FROM "{table}" WHERE "{column}" IN ({marks}) AND ({extra})', chunk + extra_params
+            ))
+        return rows
+
+    def materialize(self, table: str, rows: List[Dict], spec: List[Tuple],
+                    embed_where: Optional[Dict[str, List[Tuple]]] = None) -> List[Dict]:
+        """Attach embedded resources to full rows, then project them onto the select spec."""
+        embedded: Dict[str, List] = {}
+        for item in spec:
+            if item[0] != "embed":
+                continue
+            _, name, alias, sub_spec = item
+            local_col, target, target_col, to_many = self._resolve_embed(table, name)
+            keys = {r[local_col] for r in rows if r.get(local_col) is not None}
+            where = (embed_where or {}).get(alias)
+            related = self._fetch_in(target, target_col, keys, where) if keys else []
+            if not (to_many and sub_spec == [("count", "count")]):
+                related_out = self.materialize(target, related, sub_spec)
+            else:
+                related_out = related
+            by_key: Dict[Any, List] = {}
+            for full, out in zip(related, related_out):
+                by_key.setdefault(full[target_col], []).append(out)
+            values = []
+            for r in rows:
+                matches = by_key.get(r.get(local_col), [])
+                if to_many and sub_spec == [("count", "count")]:
+                    values.append([{"count": len(matches)}])
+                elif to_many:
+                    values.append(matches)
+                else:
+                    values.append(matches[0] if matches else None)
+            embedded[alias] = values
+
+        result = []
+        for i, row in enumerate(rows):
+            out = {}
+            for item in spec:
+                if item[0] == "star":
+                    out.update(row)
+                elif item[0] == "col":
+                    out[item[2]] = row.get(item[1])
+                elif item[0] == "embed":
+                    out[item[2]] = embedded[item[2]][i]
+                elif item[0] == "count":
+                    out[item[1]] = len(rows)
+            result.append(out)
+        return result
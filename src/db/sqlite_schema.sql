@@ -0,0 +1,293 @@
+-- Embedded SQLite schema mirroring the Supabase tables used by src/dao.
+-- Timestamps are stored as ISO-8601 UTC strings so they sort lexically.
+
+CREATE TABLE IF NOT EXISTS alumni (
+    alumni_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    name            TEXT NOT NULL,
+    email           TEXT NOT NULL,
+    industry        TEXT,
+    graduation_year INTEGER,
+    location        TEXT,
+    created_at      TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at      TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS students (
+    student_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name       TEXT NOT NULL,
+    email      TEXT NOT NULL,
+    course     TEXT,
+    year       INTEGER,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    event_id    INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_name  TEXT NOT NULL,
+    event_date  TEXT NOT NULL,
+    location    TEXT,
+    description TEXT,
+    capacity      INTEGER CHECK (capacity IS NULL OR capacity >= 0),
+    seats_taken   INTEGER NOT NULL DEFAULT 0,
+    waitlist_size INTEGER NOT NULL DEFAULT 0,
+    -- registrations (seat or waitlist) by user type, kept current by the triggers below
+    alumni_count  INTEGER NOT NULL DEFAULT 0,
+    student_count INTEGER NOT NULL DEFAULT 0,
+    created_at  TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at  TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_events_event_date ON events (event_date, event_id);
+
+CREATE TABLE IF NOT EXISTS mentors (
+    mentor_id  INTEGER PRIMARY KEY AUTOINCREMENT,
+    alumni_id  INTEGER NOT NULL REFERENCES alumni (alumni_id) ON DELETE CASCADE,
+    skills     TEXT,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_mentors_alumni_id ON mentors (alumni_id);
+
+CREATE TABLE IF NOT EXISTS mentorship_assignments (
+    assignment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mentor_id     INTEGER NOT NULL REFERENCES mentors (mentor_id) ON DELETE CASCADE,
+    student_id    INTEGER NOT NULL REFERENCES students (student_id) ON DELETE CASCADE,
+    start_date    TEXT,
+    end_date      TEXT,
+    created_at    TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at    TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_assignments_mentor_id ON mentorship_assignments (mentor_id);
+CREATE INDEX IF NOT EXISTS idx_assignments_student_id ON mentorship_assignments (student_id);
+CREATE INDEX IF NOT EXISTS idx_assignments_created_at ON mentorship_assignments (created_at, assignment_id);
+
+CREATE TABLE IF NOT EXISTS event_registrations (
+    registration_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id        INTEGER NOT NULL REFERENCES events (event_id) ON DELETE CASCADE,
+    user_id         INTEGER NOT NULL,
+    user_type       TEXT NOT NULL CHECK (user_type IN ('alumni', 'student')),
+    status          TEXT NOT NULL DEFAULT 'registered' CHECK (status IN ('registered', 'waitlisted')),
+    registered_at   TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at      TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+-- one registration per user and event; also serves lookups by event_id
+CREATE UNIQUE INDEX IF NOT EXISTS uq_registrations_event_user ON event_registrations (event_id, user_id, user_type);
+CREATE INDEX IF NOT EXISTS idx_registrations_user ON event_registrations (user_id, user_type);
+CREATE INDEX IF NOT EXISTS idx_registrations_waitlist ON event_registrations (event_id, registration_id) WHERE status = 'waitlisted';
+
+-- user_id points at alumni or students depending on user_type; mirrors the trigger of migration 003
+CREATE TRIGGER IF NOT EXISTS trg_registrations_user_fkey
+BEFORE INSERT ON event_registrations
+WHEN (NEW.user_type = 'alumni' AND NOT EXISTS (SELECT 1 FROM alumni WHERE alumni_id = NEW.user_id))
+  OR (NEW.user_type = 'student' AND NOT EXISTS (SELECT 1 FROM students WHERE student_id = NEW.user_id))
+BEGIN
+    SELECT RAISE(ABORT, 'FOREIGN KEY constraint failed: unknown registration user');
+END;
+
+-- a deleted user's registrations are cancelled the way cancel_registration does it: a freed
+-- seat goes to the oldest waitlisted user, otherwise seats_taken drops; a waitlist slot just
+-- leaves the waitlist. The counters are read before the promotion changes any status.
+CREATE TRIGGER IF NOT EXISTS trg_alumni_cancel_registrations
+AFTER DELETE ON alumni
+BEGIN
+    UPDATE events SET seats_taken = seats_taken - 1
+    WHERE event_id IN (SELECT r.event_id FROM event_registrations r
+                       WHERE r.user_id = OLD.alumni_id AND r.user_type = 'alumni' AND r.status = 'registered'
+                         AND NOT EXISTS (SELECT 1 FROM event_registrations w
+                                         WHERE w.event_id = r.event_id AND w.status = 'waitlisted'));
+    UPDATE events SET waitlist_size = waitlist_size - 1
+    WHERE event_id IN (SELECT r.event_id FROM event_registrations r
+                       WHERE r.user_id = OLD.alumni_id AND r.user_type = 'alumni'
+                         AND EXISTS (SELECT 1 FROM event_registrations w
+                                     WHERE w.event_id = r.event_id AND w.status = 'waitlisted'));
+    UPDATE event_registrations SET status = 'registered'
+    WHERE registration_id IN (SELECT (SELECT w.registration_id FROM event_registrations w
+                                      WHERE w.event_id = r.event_id AND w.status = 'waitlisted'
+                                      ORDER BY w.registration_id LIMIT 1)
+                              FROM event_registrations r
+                              WHERE r.user_id = OLD.alumni_id AND r.user_type = 'alumni' AND r.status = 'registered');
+    DELETE FROM event_registrations WHERE user_id = OLD.alumni_id AND user_type = 'alumni';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_students_cancel_registrations
+AFTER DELETE ON students
+BEGIN
+    UPDATE events SET seats_taken = seats_taken - 1
+    WHERE event_id IN (SELECT r.event_id FROM event_registrations r
+                       WHERE r.user_id = OLD.student_id AND r.user_type = 'student' AND r.status = 'registered'
+                         AND NOT EXISTS (SELECT 1 FROM event_registrations w
+                                         WHERE w.event_id = r.event_id AND w.status = 'waitlisted'));
+    UPDATE events SET waitlist_size = waitlist_size - 1
+    WHERE event_id IN (SELECT r.event_id FROM event_registrations r
+                       WHERE r.user_id = OLD.student_id AND r.user_type = 'student'
+                         AND EXISTS (SELECT 1 FROM event_registrations w
+                                     WHERE w.event_id = r.event_id AND w.status = 'waitlisted'));
+    UPDATE event_registrations SET status = 'registered'
+    WHERE registration_id IN (SELECT (SELECT w.registration_id FROM event_registrations w
+                                      WHERE w.event_id = r.event_id AND w.status = 'waitlisted'
+                                      ORDER BY w.registration_id LIMIT 1)
+                              FROM event_registrations r
+                              WHERE r.user_id = OLD.student_id AND r.user_type = 'student' AND r.status = 'registered');
+    DELETE FROM event_registrations WHERE user_id = OLD.student_id AND user_type = 'student';
+END;
+
+-- per-event registration counts; mirrors the triggers of migration 004
+CREATE TRIGGER IF NOT EXISTS trg_registrations_count_insert
+AFTER INSERT ON event_registrations
+BEGIN
+    UPDATE events SET alumni_count = alumni_count + (NEW.user_type = 'alumni'),
+                      student_count = student_count + (NEW.user_type = 'student')
+    WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registrations_count_delete
+AFTER DELETE ON event_registrations
+BEGIN
+    UPDATE events SET alumni_count = alumni_count - (OLD.user_type = 'alumni'),
+                      student_count = student_count - (OLD.user_type = 'student')
+    WHERE event_id = OLD.event_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registrations_count_move
+AFTER UPDATE OF event_id, user_type ON event_registrations
+WHEN OLD.event_id IS NOT NEW.event_id OR OLD.user_type IS NOT NEW.user_type
+BEGIN
+    UPDATE events SET alumni_count = alumni_count - (OLD.user_type = 'alumni'),
+                      student_count = student_count - (OLD.user_type = 'student')
+    WHERE event_id = OLD.event_id;
+    UPDATE events SET alumni_count = alumni_count + (NEW.user_type = 'alumni'),
+                      student_count = student_count + (NEW.user_type = 'student')
+    WHERE event_id = NEW.event_id;
+END;
+
+-- change tracking for incremental exports; mirrors migration 005. The client's update builder
+-- sets updated_at itself, so RETURNING shows it; the touch triggers cover raw SQL updates (and
+-- inserts in files that got the column added later). Deletes leave a tombstone.
+CREATE TABLE IF NOT EXISTS deleted_rows (
+    deletion_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name  TEXT NOT NULL,
+    row_id      INTEGER NOT NULL,
+    deleted_at  TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_deleted_rows_table ON deleted_rows (table_name, deleted_at, deletion_id);
+
+CREATE INDEX IF NOT EXISTS idx_alumni_updated_at ON alumni (updated_at, alumni_id);
+CREATE TRIGGER IF NOT EXISTS trg_alumni_touch_update
+AFTER UPDATE ON alumni
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE alumni SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE alumni_id = NEW.alumni_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_alumni_touch_insert
+AFTER INSERT ON alumni
+WHEN NEW.updated_at IS NULL
+BEGIN
+    UPDATE alumni SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE alumni_id = NEW.alumni_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_alumni_deleted
+AFTER DELETE ON alumni
+BEGIN
+    INSERT INTO deleted_rows (table_name, row_id) VALUES ('alumni', OLD.alumni_id);
+END;
+
+CREATE INDEX IF NOT EXISTS idx_students_updated_at ON students (updated_at, student_id);
+CREATE TRIGGER IF NOT EXISTS trg_students_touch_update
+AFTER UPDATE ON students
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE students SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE student_id = NEW.student_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_students_touch_insert
+AFTER INSERT ON students
+WHEN NEW.updated_at IS NULL
+BEGIN
+    UPDATE students SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE student_id = NEW.student_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_students_deleted
+AFTER DELETE ON students
+BEGIN
+    INSERT INTO deleted_rows (table_name, row_id) VALUES ('students', OLD.student_id);
+END;
+
+CREATE INDEX IF NOT EXISTS idx_events_updated_at ON events (updated_at, event_id);
+CREATE TRIGGER IF NOT EXISTS trg_events_touch_update
+AFTER UPDATE ON events
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE events SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE event_id = NEW.event_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_events_touch_insert
+AFTER INSERT ON events
+WHEN NEW.updated_at IS NULL
+BEGIN
+    UPDATE events SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE event_id = NEW.event_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_events_deleted
+AFTER DELETE ON events
+BEGIN
+    INSERT INTO deleted_rows (table_name, row_id) VALUES ('events', OLD.event_id);
+END;
+
+CREATE INDEX IF NOT EXISTS idx_mentors_updated_at ON mentors (updated_at, mentor_id);
+CREATE TRIGGER IF NOT EXISTS trg_mentors_touch_update
+AFTER UPDATE ON mentors
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE mentors SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE mentor_id = NEW.mentor_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_mentors_touch_insert
+AFTER INSERT ON mentors
+WHEN NEW.updated_at IS NULL
+BEGIN
+    UPDATE mentors SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE mentor_id = NEW.mentor_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_mentors_deleted
+AFTER DELETE ON mentors
+BEGIN
+    INSERT INTO deleted_rows (table_name, row_id) VALUES ('mentors', OLD.mentor_id);
+END;
+
+CREATE INDEX IF NOT EXISTS idx_mentorship_assignments_updated_at ON mentorship_assignments (updated_at, assignment_id);
+CREATE TRIGGER IF NOT EXISTS trg_mentorship_assignments_touch_update
+AFTER UPDATE ON mentorship_assignments
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE mentorship_assignments SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE assignment_id = NEW.assignment_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_mentorship_assignments_touch_insert
+AFTER INSERT ON mentorship_assignments
+WHEN NEW.updated_at IS NULL
+BEGIN
+    UPDATE mentorship_assignments SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE assignment_id = NEW.assignment_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_mentorship_assignments_deleted
+AFTER DELETE ON mentorship_assignments
+BEGIN
+    INSERT INTO deleted_rows (table_name, row_id) VALUES ('mentorship_assignments', OLD.assignment_id);
+END;
+
+CREATE INDEX IF NOT EXISTS idx_event_registrations_updated_at ON event_registrations (updated_at, registration_id);
+CREATE TRIGGER IF NOT EXISTS trg_event_registrations_touch_update
+AFTER UPDATE ON event_registrations
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE event_registrations SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE registration_id = NEW.registration_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_event_registrations_touch_insert
+AFTER INSERT ON event_registrations
+WHEN NEW.updated_at IS NULL
+BEGIN
+    UPDATE event_registrations SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE registration_id = NEW.registration_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_event_registrations_deleted
+AFTER DELETE ON event_registrations
+BEGIN
+    INSERT INTO deleted_rows (table_name, row_id) VALUES ('event_registrations', OLD.registration_id);
+END;
+
+-- Unique emails back add_alumni / create_student. Kept last: an old file holding duplicates
+-- fails here, after everything else has been created.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_alumni_email ON alumni (email);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_students_email ON students (email);
+DROP INDEX IF EXISTS idx_alumni_email;
+DROP INDEX IF EXISTS idx_students_email;
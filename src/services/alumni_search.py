@@ -0,0 +1,294 @@
+# src/services/alumni_search.py
+"""In-memory inverted index behind ``AlumniService.search_directory``.
+
+Documents are alumni rows; name, industry, location, email and graduation year are
+tokenized into lowercase terms with per-field weights. A query token matches terms
+exactly, by prefix (``"soft"`` → ``"software"``) or within one edit (``"sofware"``),
+and every query token has to match for a row to be returned. Rows are ranked with a
+BM25-style score, discounted for prefix and fuzzy matches.
+
+Postings are kept as sorted ``array`` pairs (ids, weights): cheap to append to when a
+row changes, and scored at query time as zero-copy NumPy views, so a query over
+hundreds of thousands of alumni stays in the low milliseconds. ``AlumniService`` keeps
+the shared index current on add/update/remove/import.
+"""
+import math
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+FIELD_WEIGHTS = {"name": 3.0, "industry": 2.0, "location": 2.0, "email": 1.0, "graduation_year": 1.0}
+# fields whose alphabetic terms also get fuzzy (edit distance 1) matching
+FUZZY_FIELDS = ("name", "industry", "location")
+
+EXACT, PREFIX, FUZZY = 1.0, 0.7, 0.5
+MIN_PREFIX_LEN = 2
+MIN_FUZZY_LEN = 4
+MAX_EXPANSIONS = 64
+BM25_K1 = 1.2
+
+# Rebuild from the database when the index is older than this many seconds (0 = never)
+ALUMNI_SEARCH_REFRESH = float(os.getenv("ALUMNI_SEARCH_REFRESH", "0"))
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text) -> List[str]:
+    if text is None:
+        return []
+    return _TOKEN.findall(str(text).lower())
+
+
+def _deletes(term: str) -> Set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True when a and b differ by at most one insert, delete, substitution or transposition."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    if la > lb:
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class AlumniSearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._vocab: List[str] = []
+        self._vocab_sorted = True
+        self._deletes: Dict[str, Set[str]] = {}
+        self._fuzzy: Set[str] = set()
+        self.built_at: Optional[float] = None
+        # a write that lands while a build is loading may be missed by it; the build after
+        # that one picks it up
+        self._building = False
+        self._dirty = False
+
+    # building
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    def build(self, rows: Iterable[Dict]):
+        """Replace the index contents with ``rows``."""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._vocab = []
+            self._deletes.clear()
+            self._fuzzy.clear()
+            # sort the vocabulary once at the end instead of per new term
+            self._vocab_sorted = False
+            for row in rows:
+                self._add(row)
+            self._vocab.sort()
+            self._vocab_sorted = True
+            self.built_at = time.monotonic()
+
+    def ensure_built(self, load: Callable[[], Iterable[Dict]]):
+        stale = (ALUMNI_SEARCH_REFRESH > 0 and self.built
+                 and time.monotonic() - self.built_at > ALUMNI_SEARCH_REFRESH)
+        if self.built and not stale and not self._dirty:
+            return
+        with self._lock:
+            if not self.built or stale or self._dirty:
+                self._building, self._dirty = True, False
+                try:
+                    self.build(load())
+                finally:
+                    self._building = False
+
+    # incremental maintenance
+    def add(self, row: Dict):
+        with self._lock:
+            self._remove(row["alumni_id"])
+            self._add(row)
+
+    def remove(self, alumni_id: int):
+        with self._lock:
+            self._remove(alumni_id)
+
+    # For writes made after the rows are committed. An unbuilt index loads them on its first
+    # search; a build already loading may have read past them, so the next search rebuilds.
+    def add_if_built(self, rows: Iterable[Dict]):
+        if self._building:
+            self._dirty = True
+            return
+        with self._lock:
+            if self.built:
+                for row in rows:
+                    self._remove(row["alumni_id"])
+                    self._add(row)
+
+    def remove_if_built(self, alumni_id: int):
+        if self._building:
+            self._dirty = True
+            return
+        with self._lock:
+            if self.built:
+                self._remove(alumni_id)
+
+    def clear(self):
+        with self._lock:
+            self.build([])
+            self.built_at = None
+
+    def _add(self, row: Dict):
+        doc_id = int(row["alumni_id"])
+        weights: Dict[str, float] = {}
+        fuzzy_terms: Set[str] = set()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(row.get(field)):
+                weights[term] = weights.get(term, 0.0) + weight
+                if field in FUZZY_FIELDS and term.isalpha() and len(term) >= MIN_FUZZY_LEN:
+                    fuzzy_terms.add(term)
+        for term, weight in weights.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (array("q"), array("f"))
+                if self._vocab_sorted:
+                    insort(self._vocab, term)
+                else:
+                    self._vocab.append(term)
+            ids, ws = posting
+            pos = bisect_left(ids, doc_id)
+            ids.insert(pos, doc_id)
+            ws.insert(pos, weight)
+        for term in fuzzy_terms - self._fuzzy:
+            self._fuzzy.add(term)
+            for key in _deletes(term) | {term}:
+                self._deletes.setdefault(key, set()).add(term)
+        self._doc_terms[doc_id] = tuple(weights)
+
+    def _remove(self, doc_id: int):
+        terms = self._doc_terms.pop(int(doc_id), None)
+        if not terms:
+            return
+        for term in terms:
+            ids, ws = self._postings[term]
+            pos = bisect_left(ids, doc_id)
+            if pos < len(ids) and ids[pos] == doc_id:
+                del ids[pos]
+                del ws[pos]
+            if not ids:
+                del self._postings[term]
+                self._drop_term(term)
+
+    def _drop_term(self, term: str):
+        pos = bisect_left(self._vocab, term)
+        if pos < len(self._vocab) and self._vocab[pos] == term:
+            del self._vocab[pos]
+        if term not in self._fuzzy:
+            return
+        self._fuzzy.discard(term)
+        for key in _deletes(term) | {term}:
+            bucket = self._deletes.get(key)
+            if bucket is not None:
+                bucket.discard(term)
+                if not bucket:
+                    del self._deletes[key]
+
+    # querying
+    def _expand(self, token: str) -> Dict[str, float]:
+        """Index terms matching ``token`` with their match-type discount."""
+        matches: Dict[str, float] = {}
+        if token in self._postings:
+            matches[token] = EXACT
+        if len(token) >= MIN_PREFIX_LEN:
+            pos = bisect_left(self._vocab, token)
+            while pos < len(self._vocab) and len(matches) < MAX_EXPANSIONS:
+                term = self._vocab[pos]
+                if not term.startswith(token):
+                    break
+                matches.setdefault(term, PREFIX)
+                pos += 1
+        if token.isalpha() and len(token) >= MIN_FUZZY_LEN:
+            candidates: Set[str] = set()
+            for key in _deletes(token) | {token}:
+                candidates |= self._deletes.get(key, set())
+            for term in candidates:
+                if term not in matches and _within_one_edit(token, term):
+                    matches[term] = FUZZY
+        return matches
+
+    def _score_token(self, token: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted unique alumni ids matching ``token`` and each one's best term score."""
+        n_docs = len(self._doc_terms)
+        all_ids, all_scores = [], []
+        for term, discount in self._expand(token).items():
+            ids, ws = self._postings[term]
+            df = len(ids)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            weights = np.frombuffer(ws, dtype=np.float32)
+            all_ids.append(np.frombuffer(ids, dtype=np.int64))
+            all_scores.append((discount * idf) * weights * (BM25_K1 + 1) / (weights + BM25_K1))
+        if not all_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        if len(all_ids) == 1:
+            return all_ids[0].copy(), all_scores[0]
+        ids, scores = np.concatenate(all_ids), np.concatenate(all_scores)
+        # keep the best-scoring term per document
+        order = np.lexsort((-scores, ids))
+        ids, scores = ids[order], scores[order]
+        first = np.ones(len(ids), dtype=bool)
+        first[1:] = ids[1:] != ids[:-1]
+        return ids[first], scores[first]
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[int, float]]:
+        """Return up to ``limit`` (alumni_id, score) pairs, best first."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or limit <= 0:
+            return []
+        with self._lock:
+            # the NumPy views must not outlive the lock: postings may grow afterwards
+            matches = sorted((self._score_token(t) for t in tokens), key=lambda m: len(m[0]))
+            ids, scores = matches[0]
+            for other_ids, other_scores in matches[1:]:
+                if not len(ids):
+                    break
+                pos = np.minimum(np.searchsorted(other_ids, ids), max(len(other_ids) - 1, 0))
+                found = other_ids[pos] == ids if len(other_ids) else np.zeros(len(ids), dtype=bool)
+                ids, scores = ids[found], scores[found] + other_scores[pos[found]]
+            if not len(ids):
+                return []
+            if len(ids) > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                ids, scores = ids[top], scores[top]
+            order = np.lexsort((ids, -scores))
+            return [(int(i), round(float(s), 4)) for i, s in zip(ids[order], scores[order])]
+
+
+_index: Optional[AlumniSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_alumni_index() -> AlumniSearchIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = AlumniSearchIndex()
+    return _index
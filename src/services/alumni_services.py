@@ -1,40 +1,78 @@
 # src/services/alumni_service.py
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Union
+from postgrest.exceptions import APIError
 from src.dao.alumni_dao import AlumniDAO
 from src.dao.event_registrations import EventRegistrationsDAO
+from src.dao.filters import FilterLike, In, as_filter
+from src.dao.records import Alumni
+from src.services import bulk_import
+from src.services.alumni_search import get_alumni_index
+from src.services.bulk_import import ImportReport
 from src.services.event_services import EventService, EventError
+from src.services.record_batch import RecordBatch
+from src.services.replica import get_local_replica, writes
+from src.tracing import traced_service
 
 
 class AlumniError(Exception):
     """Custom exception for Alumni service errors."""
     pass
 
+# alumni.email is unique (migration 003), so a duplicate comes back as a unique violation
+UNIQUE_VIOLATION = "23505"
 
+
+@traced_service
 class AlumniService:
     def __init__(self):
         self.alumni_dao = AlumniDAO()
         self.event_service = EventService()
         self.reg_dao = EventRegistrationsDAO()
+        self.index = get_alumni_index()
+        self.replica = get_local_replica()
 
     # Alumni CRUD
+    @writes("alumni")
     def add_alumni(self, payload: Dict) -> Dict:
         required_fields = ["name", "email", "industry", "graduation_year", "location"]
         for field in required_fields:
             if field not in payload or not payload[field]:
                 raise AlumniError(f"Missing required field: {field}")
 
-        # Check if email already exists
-        existing = self.alumni_dao.search_alumni("email", payload["email"])
-        if existing:
-            raise AlumniError("An alumni with this email already exists")
-
-        return self.alumni_dao.create_alumni(payload)
+        try:
+            alumni = self.alumni_dao.create_alumni(payload)
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise AlumniError("An alumni with this email already exists")
+            raise
+        self.index.add_if_built([alumni])
+        return alumni
 
+    @writes("alumni")
     def update_alumni(self, alumni_id: int, updates: Dict) -> Dict:
-        alumni = self.alumni_dao.get_alumni_by_id(alumni_id)
+        # the UPDATE returns nothing when the row does not exist
+        try:
+            alumni = self.alumni_dao.update_alumni(alumni_id, updates)
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise AlumniError("An alumni with this email already exists")
+            raise
         if not alumni:
             raise AlumniError(f"Alumni with ID {alumni_id} not found")
-        return self.alumni_dao.update_alumni(alumni_id, updates)
+        self.index.add_if_built([alumni])
+        return alumni
+
+    @writes("alumni")
+    def import_alumni(self, path: str, batch_size: int = bulk_import.DEFAULT_BATCH_SIZE,
+                      on_progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+        try:
+            records = bulk_import.read_records(path)
+            return bulk_import.run_import(
+                records, bulk_import.validate_alumni, self.alumni_dao.find_existing_emails,
+                self._create_many, batch_size, on_progress,
+            )
+        except (OSError, ValueError) as e:
+            raise AlumniError(f"Import failed: {e}")
 
     def get_alumni(self, alumni_id: int) -> Dict:
         alumni = self.alumni_dao.get_alumni_by_id(alumni_id)
@@ -42,8 +80,16 @@ class AlumniService:
             raise AlumniError(f"Alumni with ID {alumni_id} not found")
         return alumni
 
-    def list_alumni(self, filters: Optional[Dict] = None) -> List[Dict]:
-        return self.alumni_dao.list_alumni(filters)
+    # served from the local replica when it is enabled and fresh enough;
+    # batch=True packs the rows column-wise, reading the backend page by page
+    def list_alumni(self, filters: FilterLike = None, batch: bool = False) -> Union[List[Alumni], RecordBatch]:
+        rows = self.replica.select("alumni", as_filter(filters, exact=True)) if self.replica else None
+        if not batch:
+            return rows if rows is not None else self.alumni_dao.list_alumni(filters)
+        return RecordBatch.from_rows(Alumni, rows if rows is not None else self.alumni_dao.iter_alumni(filters, prefetch=True))
+
+    def iter_alumni(self, filters: FilterLike = None, page_size: int = 1000, prefetch: bool = True) -> Iterator[Dict]:
+        return self.alumni_dao.iter_alumni(filters, page_size=page_size, prefetch=prefetch)
 
     def search_alumni(self, field: str, value) -> List[Dict]:
         results = self.alumni_dao.search_alumni(field, value)
@@ -51,31 +97,52 @@ class AlumniService:
             raise AlumniError(f"No alumni found with {field} = {value}")
         return results
 
+    def search_directory(self, query: str, limit: int = 20) -> List[Dict]:
+        """Ranked, typo-tolerant search over name, industry, location, email and graduation year."""
+        if not query or not query.strip():
+            raise AlumniError("Search query is empty")
+        self.index.ensure_built(self.alumni_dao.iter_alumni)
+        hits = self.index.search(query, limit)
+        if not hits:
+            raise AlumniError(f"No alumni match '{query}'")
+        rows = {a["alumni_id"]: a for a in self.alumni_dao.list_alumni(In("alumni_id", [i for i, _ in hits]))}
+        return [{**rows[i], "score": score} for i, score in hits if i in rows]
+
+    # the mentor row goes with the alumni, and a trigger cancels their registrations (event counters)
+    @writes("alumni", "mentors", "events")
     def remove_alumni(self, alumni_id: int) -> Dict:
-        alumni = self.alumni_dao.get_alumni_by_id(alumni_id)
+        alumni = self.alumni_dao.delete_alumni(alumni_id)
         if not alumni:
             raise AlumniError(f"Alumni with ID {alumni_id} not found")
-        return self.alumni_dao.delete_alumni(alumni_id)
+        self.index.remove_if_built(alumni_id)
+        return alumni
+
+    def _create_many(self, rows: List[Dict]) -> List[Dict]:
+        created = self.alumni_dao.create_many(rows)
+        self.index.add_if_built(created)
+        return created
 
     # Event-related functions
-    def search_events(self, filters: Dict = None) -> List[Dict]:
+    def search_events(self, filters: FilterLike = None) -> List[Dict]:
         try:
             return self.event_service.list_events(filters)
         except EventError as e:
             raise AlumniError(f"Event search failed: {e}")
 
+    # Take a seat (or a waitlist slot when the event is full) in one request
     def join_event(self, alumni_id: int, event_id: int) -> Dict:
         try:
-            # Ensure event exists
-            self.event_service.get_event(event_id)
-
-            registration = self.reg_dao.register_user(event_id, alumni_id, "alumni")
-            if not registration:
-                raise AlumniError(f"Alumni {alumni_id} could not join event {event_id}.")
-            return registration
+            return self.event_service.register(event_id, alumni_id, "alumni")
         except EventError as e:
             raise AlumniError(f"Join event failed: {e}")
 
+    # Cancel a registration; returns the cancelled row and anyone promoted off the waitlist
+    def leave_event(self, alumni_id: int, event_id: int) -> Dict:
+        try:
+            return self.event_service.cancel_registration(event_id, alumni_id, "alumni")
+        except EventError as e:
+            raise AlumniError(f"Leave event failed: {e}")
+
     def list_my_events(self, alumni_id: int) -> List[Dict]:
         try:
             return self.reg_dao.list_user_events(alumni_id, "alumni") or []
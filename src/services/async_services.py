@@ -0,0 +1,109 @@
+# src/services/async_services.py
+"""Asyncio service layer.
+
+Simple methods run the synchronous service method on the shared DAO thread pool.
+Composite operations are rewritten so that independent lookups run concurrently,
+e.g. ``join_mentorship`` fetches the student and the mentor at the same time:
+
+    service = AsyncStudentService()
+    assignment = asyncio.run(service.join_mentorship(student_id, mentor_id))
+"""
+import asyncio
+import functools
+from typing import Dict, List, Optional
+
+from src.dao.async_dao import (
+    AsyncMentorsDAO,
+    AsyncMentorshipAssignmentsDAO,
+    AsyncStudentsDAO,
+    run_sync,
+)
+from src.services.alumni_services import AlumniService
+from src.services.event_services import EventService
+from src.services.mentorship_services import MentorshipError, MentorshipServices
+from src.services.student_services import StudentError, StudentService
+
+
+class AsyncService:
+    """Delegates every public method of the wrapped sync service to the thread pool."""
+
+    sync_class = None
+
+    def __init__(self, sync_service=None):
+        self.sync = sync_service or self.sync_class()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.sync, name)
+        if name.startswith("_") or name.startswith("iter_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await run_sync(attr, *args, **kwargs)
+
+        return method
+
+
+class AsyncEventService(AsyncService):
+    sync_class = EventService
+
+
+class AsyncMentorshipServices(AsyncService):
+    sync_class = MentorshipServices
+
+    def __init__(self, sync_service=None):
+        super().__init__(sync_service)
+        self.mentors_dao = AsyncMentorsDAO(self.sync.mentors_dao)
+        self.assignments_dao = AsyncMentorshipAssignmentsDAO(self.sync.assignments_dao)
+
+    async def get_mentors(self, mentor_ids: List[int]) -> List[Optional[Dict]]:
+        return await self.mentors_dao.get_many(mentor_ids)
+
+
+class AsyncAlumniService(AsyncService):
+    sync_class = AlumniService
+
+    def __init__(self, sync_service=None, mentorship_service: Optional[AsyncMentorshipServices] = None):
+        super().__init__(sync_service)
+        self.mentorship_service = mentorship_service or AsyncMentorshipServices()
+
+    # Everything the alumni portal lists, fetched concurrently
+    async def load_directory(self) -> Dict[str, List[Dict]]:
+        alumni, events, mentors = await asyncio.gather(
+            self.list_alumni(),
+            self.search_events(),
+            self.mentorship_service.list_mentor_views(),
+        )
+        return {"alumni": alumni, "events": events, "mentors": mentors}
+
+
+class AsyncStudentService(AsyncService):
+    sync_class = StudentService
+
+    def __init__(self, sync_service=None):
+        super().__init__(sync_service)
+        self.dao = AsyncStudentsDAO(self.sync.dao)
+        self.mentorship_service = AsyncMentorshipServices(self.sync.mentorship_service)
+
+    async def join_mentorship(
+        self,
+        student_id: int,
+        mentor_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict:
+        # student and mentor are independent, validate both in one round of latency
+        student, mentor = await asyncio.gather(
+            self.dao.get_student_by_id(student_id),
+            self.mentorship_service.mentors_dao.get_mentor_by_id(mentor_id),
+        )
+        if not student:
+            raise StudentError(f"Cannot join mentorship: Student with ID {student_id} does not exist.")
+        if not mentor:
+            raise StudentError(f"Cannot join mentorship: Mentor with ID {mentor_id} does not exist.")
+
+        # through the service, like the sync path; its mentor check is a cache hit by now
+        try:
+            return await self.mentorship_service.assign_student(mentor_id, student_id, start_date, end_date)
+        except MentorshipError as e:
+            raise StudentError(f"Failed to join mentorship: {e}")
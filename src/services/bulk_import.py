@@ -0,0 +1,162 @@
+# src/services/bulk_import.py
+"""Streaming CSV / NDJSON import used by AlumniService.import_alumni and
+StudentService.import_students.
+
+Rows are validated locally, de-duplicated against the database with one set-based
+email lookup per chunk (plus against earlier rows of the same file), then inserted
+in batches. Bad rows are recorded in the report and never stop the run.
+"""
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from postgrest.exceptions import APIError
+
+DEFAULT_BATCH_SIZE = 500
+
+
+@dataclass
+class ImportReport:
+    processed: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    def summary(self) -> str:
+        return (f"processed {self.processed} rows: {self.inserted} inserted, "
+                f"{self.duplicates} duplicates skipped, {self.failed} errors")
+
+
+def read_records(path: str) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Yield (line_number, row, parse_error) from a .csv or .ndjson/.jsonl file."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8") as f:
+        if ext == ".csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                cleaned = {k.strip(): (v.strip() if isinstance(v, str) else v)
+                           for k, v in row.items() if k is not None}
+                yield reader.line_num, cleaned, None
+        elif ext in (".ndjson", ".jsonl", ".json"):
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, None, f"invalid JSON: {e.msg}"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_no, None, "expected a JSON object"
+                    continue
+                yield line_no, row, None
+        else:
+            raise ValueError(f"Unsupported import format '{ext}' (use .csv, .ndjson or .jsonl)")
+
+
+def _to_int(value, name: str) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+
+
+def validate_alumni(row: Dict) -> Dict:
+    for name in ["name", "email", "industry", "graduation_year", "location"]:
+        if row.get(name) in (None, ""):
+            raise ValueError(f"Missing required field: {name}")
+    if "@" not in str(row["email"]):
+        raise ValueError(f"Invalid email: {row['email']}")
+    return {
+        "name": str(row["name"]).strip(),
+        "email": str(row["email"]).strip(),
+        "industry": str(row["industry"]).strip(),
+        "graduation_year": _to_int(row["graduation_year"], "graduation_year"),
+        "location": str(row["location"]).strip(),
+    }
+
+
+def validate_student(row: Dict) -> Dict:
+    for name in ["name", "email"]:
+        if row.get(name) in (None, ""):
+            raise ValueError(f"Missing required field: {name}")
+    if "@" not in str(row["email"]):
+        raise ValueError(f"Invalid email: {row['email']}")
+    return {
+        "name": str(row["name"]).strip(),
+        "email": str(row["email"]).strip(),
+        "course": (str(row["course"]).strip() or None) if row.get("course") is not None else None,
+        "year": _to_int(row.get("year"), "year"),
+    }
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_import(
+    records: Iterable[Tuple[int, Optional[Dict], Optional[str]]],
+    validate: Callable[[Dict], Dict],
+    find_existing_emails: Callable[[List[str]], Set[str]],
+    insert_many: Callable[[List[Dict]], List[Dict]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_progress: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    report = ImportReport()
+    seen: Set[str] = set()
+    for chunk in _chunks(records, batch_size):
+        valid: List[Tuple[int, Dict]] = []
+        for line_no, row, error in chunk:
+            report.processed += 1
+            if error:
+                report.errors.append((line_no, error))
+                continue
+            try:
+                valid.append((line_no, validate(row)))
+            except ValueError as e:
+                report.errors.append((line_no, str(e)))
+
+        existing = find_existing_emails([r["email"] for _, r in valid]) if valid else set()
+        batch: List[Tuple[int, Dict]] = []
+        for line_no, row in valid:
+            if row["email"] in existing or row["email"] in seen:
+                report.duplicates += 1
+                continue
+            seen.add(row["email"])
+            batch.append((line_no, row))
+
+        if batch:
+            try:
+                report.inserted += len(insert_many([r for _, r in batch]))
+            except Exception:
+                # isolate the offending rows instead of failing the whole batch
+                for line_no, row in batch:
+                    try:
+                        report.inserted += len(insert_many([row]))
+                    except APIError as e:
+                        # inserted by someone else since the email lookup
+                        if e.code == "23505":
+                            report.duplicates += 1
+                        else:
+                            report.errors.append((line_no, str(e)))
+                    except Exception as e:
+                        report.errors.append((line_no, str(e)))
+        if on_progress:
+            on_progress(report)
+    return report
@@ -0,0 +1,304 @@
+# src/services/columnar_export.py
+"""Columnar export files: one directory of ``.npy`` arrays per table, readable memory-mapped.
+
+Layout of an export directory::
+
+    manifest.json                   tables, their current generation, row counts, watermarks
+    <table>/<generation>/<col>.npy  integer column, int64
+    <table>/<generation>/<col>.offsets.npy, <col>.data.npy
+                                    text column: offsets (rows + 1) into UTF-8 bytes, int32
+                                    unless the bytes pass 2 GiB
+    <table>/<generation>/<col>.null.npy
+                                    only for columns holding NULLs: True where the value is NULL
+
+Rows are sorted by the table's key, so a row is found with ``searchsorted`` on the key
+column. A generation is written completely next to the current one, then the manifest is
+swapped in with ``os.replace``; readers that opened the old generation keep their maps.
+
+Writing streams: fetched rows are appended page by page to raw staging files, then merged
+with the previous generation one column at a time (text in row chunks), so memory holds
+about one column rather than the table. One export at a time per directory.
+"""
+import datetime
+import json
+import os
+import shutil
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.services.string_column import StringColumn
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+# rows per chunk when gathering text bytes
+GATHER_CHUNK_ROWS = 65_536
+
+# per table: (integer columns, key first; text columns); timestamps and dates stay ISO text
+EXPORT_TABLES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "alumni": (("alumni_id", "graduation_year"),
+               ("name", "email", "industry", "location", "created_at", "updated_at")),
+    "students": (("student_id", "year"), ("name", "email", "course", "created_at", "updated_at")),
+    "events": (("event_id", "capacity", "seats_taken", "waitlist_size", "alumni_count", "student_count"),
+               ("event_name", "event_date", "location", "description", "created_at", "updated_at")),
+    "mentors": (("mentor_id", "alumni_id"), ("skills", "created_at", "updated_at")),
+    "mentorship_assignments": (("assignment_id", "mentor_id", "student_id"),
+                               ("start_date", "end_date", "created_at", "updated_at")),
+    "event_registrations": (("registration_id", "event_id", "user_id"),
+                            ("user_type", "status", "registered_at", "updated_at")),
+}
+
+
+def _load(path: str, mmap: bool = True) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode="r" if mmap else None)
+    except ValueError:
+        # empty arrays can't be mapped
+        return np.load(path)
+
+
+def _save(path: str, array: np.ndarray):
+    with open(path, "wb") as f:
+        np.lib.format.write_array(f, np.ascontiguousarray(array), allow_pickle=False)
+
+
+# --- reading ---
+class ExportTable:
+    """One table of an export, memory-mapped."""
+
+    def __init__(self, path: str, info: Dict):
+        self.path = path
+        self.info = info
+        self.key = info["key"]
+        self.ints: List[str] = info["ints"]
+        self.texts: List[str] = info["texts"]
+        self._columns: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return self.info["rows"]
+
+    @property
+    def columns(self) -> List[str]:
+        return self.ints + self.texts
+
+    def nulls(self, name: str) -> Optional[np.ndarray]:
+        path = os.path.join(self.path, f"{name}.null.npy")
+        return _load(path) if os.path.exists(path) else None
+
+    def column(self, name: str):
+        """int64 array for integer columns (NULL reads 0, see ``nulls``), ``StringColumn`` for text."""
+        if name not in self._columns:
+            if name in self.ints:
+                self._columns[name] = _load(os.path.join(self.path, f"{name}.npy"))
+            elif name in self.texts:
+                self._columns[name] = StringColumn(_load(os.path.join(self.path, f"{name}.offsets.npy")),
+                                                   _load(os.path.join(self.path, f"{name}.data.npy")),
+                                                   self.nulls(name))
+            else:
+                raise KeyError(name)
+        return self._columns[name]
+
+    def find(self, keys: Sequence[int]) -> np.ndarray:
+        """Row positions of ``keys``, -1 where absent."""
+        ids = self.column(self.key)
+        keys = np.asarray(keys, dtype=np.int64)
+        if not len(ids):
+            return np.full(len(keys), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(ids, keys), len(ids) - 1)
+        return np.where(ids[pos] == keys, pos, -1)
+
+    def rows(self, columns: Optional[Sequence[str]] = None, start: int = 0, stop: Optional[int] = None,
+             chunk_rows: int = GATHER_CHUNK_ROWS) -> Iterator[Dict]:
+        """Rows as dicts, decoded one chunk at a time."""
+        columns = list(columns or self.columns)
+        stop = len(self) if stop is None else min(stop, len(self))
+        for lo in range(start, stop, chunk_rows):
+            hi = min(lo + chunk_rows, stop)
+            values = []
+            for name in columns:
+                col = self.column(name)
+                if name in self.texts:
+                    values.append(col[lo:hi])
+                    continue
+                chunk: List[Any] = col[lo:hi].tolist()
+                nulls = self.nulls(name)
+                if nulls is not None:
+                    for i in np.flatnonzero(nulls[lo:hi]).tolist():
+                        chunk[i] = None
+                values.append(chunk)
+            for row in zip(*values):
+                yield dict(zip(columns, row))
+
+
+def read_manifest(root: str) -> Dict:
+    path = os.path.join(root, MANIFEST)
+    if not os.path.exists(path):
+        return {"format": FORMAT_VERSION, "tables": {}}
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{path}: export format {manifest.get('format')} is not supported")
+    return manifest
+
+
+def open_export(root: str) -> Dict[str, ExportTable]:
+    """Every table of the export at ``root``, memory-mapped."""
+    tables = read_manifest(root)["tables"]
+    return {name: ExportTable(os.path.join(root, name, info["generation"]), info) for name, info in tables.items()}
+
+
+# --- writing ---
+class StagedRows:
+    """Raw append-only column files for the rows fetched by one export run."""
+
+    def __init__(self, path: str, ints: Sequence[str], texts: Sequence[str]):
+        self.path = path
+        self.ints, self.texts = list(ints), list(texts)
+        self.rows = 0
+        os.makedirs(path, exist_ok=True)
+        self._files = {}
+        for name in self.ints:
+            self._files[name] = open(os.path.join(path, f"{name}.i8"), "wb")
+        for name in self.texts:
+            self._files[name] = open(os.path.join(path, f"{name}.len"), "wb")
+            self._files[name + ".data"] = open(os.path.join(path, f"{name}.bytes"), "wb")
+        for name in self.ints + self.texts:
+            self._files[name + ".null"] = open(os.path.join(path, f"{name}.nul"), "wb")
+
+    def append(self, page: List[Dict]):
+        if not page:
+            return
+        for name in self.ints:
+            values = [r.get(name) for r in page]
+            nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+            np.array([0 if v is None else v for v in values], dtype=np.int64).tofile(self._files[name])
+            nulls.tofile(self._files[name + ".null"])
+        for name in self.texts:
+            values = [r.get(name) for r in page]
+            nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+            encoded = [b"" if v is None else str(v).encode("utf-8") for v in values]
+            np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)).tofile(self._files[name])
+            self._files[name + ".data"].write(b"".join(encoded))
+            nulls.tofile(self._files[name + ".null"])
+        self.rows += len(page)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+    def int_column(self, name: str) -> np.ndarray:
+        return np.fromfile(os.path.join(self.path, f"{name}.i8"), dtype=np.int64)
+
+    def nulls(self, name: str) -> np.ndarray:
+        return np.fromfile(os.path.join(self.path, f"{name}.nul"), dtype=bool)
+
+    def text_column(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        lengths = np.fromfile(os.path.join(self.path, f"{name}.len"), dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        path = os.path.join(self.path, f"{name}.bytes")
+        data = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.empty(0, dtype=np.uint8)
+        return offsets, data
+
+
+def _gather_text(sources: List[Tuple[np.ndarray, np.ndarray]], src: np.ndarray, rows: np.ndarray,
+                 path: str) -> np.ndarray:
+    """Write the strings ``sources[src[i]][rows[i]]`` in order to ``<path>.data.npy``; return offsets."""
+    lengths = np.zeros(len(rows), dtype=np.int64)
+    for s, (offsets, _) in enumerate(sources):
+        sel = src == s
+        lengths[sel] = offsets[rows[sel] + 1] - offsets[rows[sel]]
+    out_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=out_offsets[1:])
+    total = int(out_offsets[-1])
+    if not total:
+        _save(f"{path}.data.npy", np.empty(0, dtype=np.uint8))
+        return out_offsets
+    out = np.lib.format.open_memmap(f"{path}.data.npy", mode="w+", dtype=np.uint8, shape=(total,))
+    for lo in range(0, len(rows), GATHER_CHUNK_ROWS):
+        hi = min(lo + GATHER_CHUNK_ROWS, len(rows))
+        for s, (offsets, data) in enumerate(sources):
+            sel = np.flatnonzero(src[lo:hi] == s) + lo
+            lens = lengths[sel]
+            n = int(lens.sum())
+            if not n:
+                continue
+            # byte t of string k comes from start_k + t and goes to dest_k + t
+            within = np.arange(n, dtype=np.int64) - np.repeat(np.cumsum(lens) - lens, lens)
+            out[np.repeat(out_offsets[sel], lens) + within] = data[np.repeat(offsets[rows[sel]], lens) + within]
+    out.flush()
+    del out
+    return out_offsets
+
+
+def write_generation(path: str, ints: Sequence[str], texts: Sequence[str], staged: StagedRows,
+                     previous: Optional[ExportTable] = None, deleted: Iterable[int] = ()) -> int:
+    """Merge ``staged`` rows into ``previous`` (dropping ``deleted`` keys) as a new generation at ``path``.
+
+    A key fetched more than once keeps its last version. Returns the number of rows written.
+    """
+    key = ints[0]
+    os.makedirs(path)
+    new_ids = staged.int_column(key)
+    # last occurrence of every key, in key order
+    _, first_from_end = np.unique(new_ids[::-1], return_index=True)
+    new_rows = len(new_ids) - 1 - first_from_end
+    dropped = np.asarray(list(deleted), dtype=np.int64)
+    new_rows = new_rows[~np.isin(new_ids[new_rows], dropped)]
+    has_previous = previous is not None and len(previous) > 0
+    if has_previous:
+        old_ids = previous.column(key)
+        old_rows = np.flatnonzero(~np.isin(old_ids, new_ids) & ~np.isin(old_ids, dropped))
+    else:
+        old_rows = np.empty(0, dtype=np.int64)
+    # per output row: its source (0 previous generation, 1 staged) and its row there, in key order
+    src = np.concatenate([np.zeros(len(old_rows), dtype=np.int8), np.ones(len(new_rows), dtype=np.int8)])
+    rows = np.concatenate([old_rows, new_rows])
+    ids = np.concatenate([previous.column(key)[old_rows] if has_previous else old_rows, new_ids[new_rows]])
+    order = np.argsort(ids, kind="stable")
+    src, rows = src[order], rows[order]
+    from_old, from_new = src == 0, src == 1
+
+    def pick(old: Optional[np.ndarray], new: np.ndarray) -> np.ndarray:
+        out = np.zeros(len(rows), dtype=new.dtype)
+        out[from_new] = new[rows[from_new]]
+        if old is not None:
+            out[from_old] = old[rows[from_old]]
+        return out
+
+    for name in list(ints) + list(texts):
+        nulls = pick(previous.nulls(name) if has_previous else None, staged.nulls(name))
+        if nulls.any():
+            _save(os.path.join(path, f"{name}.null.npy"), nulls)
+        if name in ints:
+            _save(os.path.join(path, f"{name}.npy"),
+                  pick(previous.column(name) if has_previous else None, staged.int_column(name)))
+            continue
+        old = previous.column(name) if has_previous else StringColumn(np.zeros(1, dtype=np.int64),
+                                                                      np.empty(0, dtype=np.uint8))
+        sources = [(old.offsets, old.data), staged.text_column(name)]
+        offsets = _gather_text(sources, src, rows, os.path.join(path, name))
+        _save(os.path.join(path, f"{name}.offsets.npy"),
+              offsets.astype(np.int32) if offsets[-1] < 2 ** 31 else offsets)
+    return len(rows)
+
+
+def write_manifest(root: str, manifest: Dict):
+    path = os.path.join(root, MANIFEST)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def new_generation() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def remove_generations(table_dir: str, keep: str):
+    """Drop every generation and staging directory of a table except ``keep``."""
+    for entry in os.listdir(table_dir):
+        if entry != keep:
+            shutil.rmtree(os.path.join(table_dir, entry), ignore_errors=True)
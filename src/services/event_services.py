@@ -1,30 +1,74 @@
 # src/services/event_service.py
-from typing import Optional, List, Dict
+from typing import Optional, Iterable, Iterator, List, Dict, Tuple
+from postgrest.exceptions import APIError
+from src.dao.alumni_dao import AlumniDAO
 from src.dao.events_dao import EventsDAO
+from src.dao.event_registrations import EventRegistrationsDAO
+from src.dao.filters import FilterLike, as_filter
+from src.dao.students_dao import StudentsDAO
+from src.services.replica import get_local_replica, writes
+from src.tracing import traced_service
+
+USER_TYPES = ("alumni", "student")
+# kept current by the registration RPCs and triggers, never written directly
+COUNTER_FIELDS = ("seats_taken", "waitlist_size", "alumni_count", "student_count")
+
 
 class EventError(Exception):
     """Custom exception for Event service errors."""
     pass
 
+def _event_error(e: APIError) -> EventError:
+    # P0002 is raised by the registration functions for an unknown event,
+    # 23503 by the registration user check (migration 003) for an unknown user
+    return EventError(e.message if e.code in ("P0002", "23503") else f"Registration failed: {e.message}")
+
+
+@traced_service
 class EventService:
     def __init__(self):
         self.dao = EventsDAO()
+        self.reg_dao = EventRegistrationsDAO()
+        self.alumni_dao = AlumniDAO()
+        self.students_dao = StudentsDAO()
+        self.replica = get_local_replica()
 
     # Create a new event
+    @writes("events")
     def add_event(self, payload: Dict) -> Dict:
         event = self.dao.create_event(payload)
         if not event:
             raise EventError("Failed to create event.")
         return event
 
-    # Update an event by ID
+    # Update an event by ID (a capacity change may promote waitlisted users)
+    @writes("events")
     def update_event(self, event_id: int, updates: Dict) -> Dict:
+        updates = dict(updates)
+        counters = [f for f in COUNTER_FIELDS if f in updates]
+        if counters:
+            raise EventError(f"{', '.join(counters)} cannot be set directly.")
+        if "capacity" in updates:
+            event = self.set_capacity(event_id, updates.pop("capacity"))["event"]
+            if not updates:
+                return event
         event = self.dao.update_event(event_id, updates)
         if not event:
             raise EventError(f"Event with ID {event_id} not found.")
         return event
 
+    # Change capacity (None = unlimited); returns the event and the users promoted off the waitlist
+    @writes("events")
+    def set_capacity(self, event_id: int, capacity: Optional[int]) -> Dict:
+        if capacity is not None and capacity < 0:
+            raise EventError("capacity must not be negative.")
+        try:
+            return self.dao.set_capacity(event_id, capacity)
+        except APIError as e:
+            raise _event_error(e)
+
     # Delete an event by ID
+    @writes("events")
     def delete_event(self, event_id: int) -> Dict:
         event = self.dao.delete_event(event_id)
         if not event:
@@ -38,18 +82,115 @@ class EventService:
             raise EventError(f"Event with ID {event_id} not found.")
         return event
 
-    # List all events (optional filters)
-    def list_events(self, filters: Dict = None) -> List[Dict]:
-        events = self.dao.list_events()
-        if filters:
-            filtered = []
-            for e in events:
-                match = True
-                for k, v in filters.items():
-                    if str(e.get(k)).lower() != str(v).lower():
-                        match = False
-                        break
-                if match:
-                    filtered.append(e)
-            return filtered
-        return events
+    # the event must exist; its counters don't matter
+    def _check_event(self, event_id: int):
+        if not self.dao.get_event_by_id(event_id, fresh_counts=False):
+            raise EventError(f"Event with ID {event_id} not found.")
+
+    # List all events (optional filters, dicts match case-insensitively); from the replica when fresh
+    def list_events(self, filters: FilterLike = None) -> List[Dict]:
+        rows = self.replica.select("events", as_filter(filters)) if self.replica else None
+        return rows if rows is not None else self.dao.list_events(filters)
+
+    # Stream events page by page in event_date order
+    def iter_events(self, filters: FilterLike = None, page_size: int = 1000, prefetch: bool = True) -> Iterator[Dict]:
+        return self.dao.iter_events(filters, page_size=page_size, prefetch=prefetch)
+
+    # Registration counts for many events in one query: {event_id: {alumni, student, total, ...}}
+    def get_registration_counts(self, event_ids: Iterable[int]) -> Dict[int, Dict]:
+        counts = {}
+        for row in self.dao.get_counts(event_ids):
+            counts[row["event_id"]] = {
+                "alumni": row["alumni_count"],
+                "student": row["student_count"],
+                "total": row["alumni_count"] + row["student_count"],
+                "seats_taken": row["seats_taken"],
+                "waitlist_size": row["waitlist_size"],
+                "capacity": row["capacity"],
+            }
+        return counts
+
+    # Take a seat, or a waitlist slot when full; one atomic request, safe to retry
+    @writes("events")
+    def register(self, event_id: int, user_id: int, user_type: str) -> Dict:
+        if user_type not in USER_TYPES:
+            raise EventError(f"Invalid user_type '{user_type}' (expected one of {', '.join(USER_TYPES)})")
+        try:
+            registration = self.reg_dao.register_user(event_id, user_id, user_type)
+        except APIError as e:
+            if e.code == "23503":
+                raise EventError(f"{user_type.capitalize()} with ID {user_id} not found.")
+            raise _event_error(e)
+        if not registration:
+            raise EventError(f"User {user_id} could not join event {event_id}.")
+        return registration
+
+    # Cancel a registration; a freed seat goes to the oldest waitlisted user
+    @writes("events")
+    def cancel_registration(self, event_id: int, user_id: int, user_type: str) -> Dict:
+        try:
+            result = self.reg_dao.cancel_registration(event_id, user_id, user_type)
+        except APIError as e:
+            raise _event_error(e)
+        if not result.get("cancelled"):
+            raise EventError(f"{user_type} {user_id} is not registered for event {event_id}.")
+        return result
+
+    # Write-behind queue metrics: depth, age of the oldest sign-up, flush latency, failures
+    def registration_queue(self) -> Dict:
+        journal = self.reg_dao.journal
+        return journal.metrics() if journal is not None else {"enabled": False}
+
+    # Push journaled sign-ups to the backend now and wait for them
+    def flush_registrations(self, timeout: float = 30.0) -> Dict:
+        journal = self.reg_dao.journal
+        if journal is None:
+            return {"enabled": False}
+        if not journal.flush(timeout):
+            metrics = journal.metrics()
+            raise EventError(f"{metrics['queue_depth']} registrations still pending after {timeout}s "
+                             f"(last error: {metrics['last_error']}).")
+        return journal.metrics()
+
+    # Register a whole cohort at once; re-running with the same users is a no-op
+    @writes("events")
+    def bulk_register(self, event_id: int, users: Iterable[Tuple[int, str]], batch_size: int = 500) -> Dict:
+        self._check_event(event_id)
+        requested = []
+        seen = set()
+        for user_id, user_type in users:
+            if user_type not in USER_TYPES:
+                raise EventError(f"Invalid user_type '{user_type}' for user {user_id} (expected one of {', '.join(USER_TYPES)})")
+            key = (int(user_id), user_type)
+            if key not in seen:
+                seen.add(key)
+                requested.append(key)
+        try:
+            inserted = self.reg_dao.register_many(event_id, requested, batch_size)
+        except APIError as e:
+            raise _event_error(e)
+        new_keys = {(r["user_id"], r["user_type"]) for r in inserted}
+        return {
+            "event_id": event_id,
+            "requested": len(requested),
+            "registered": [{"user_id": u, "user_type": t} for u, t in requested if (u, t) in new_keys],
+            "already_registered": [{"user_id": u, "user_type": t} for u, t in requested if (u, t) not in new_keys],
+            "waitlisted": [{"user_id": r["user_id"], "user_type": r["user_type"]}
+                           for r in inserted if r.get("status") == "waitlisted"],
+        }
+
+    # Registered users with their name and email; one batched lookup per user type
+    def list_event_participants(self, event_id: int) -> List[Dict]:
+        self._check_event(event_id)
+        registrations = self.reg_dao.list_event_participants(event_id)
+        daos = {"alumni": self.alumni_dao, "student": self.students_dao}
+        profiles = {}
+        for user_type, dao in daos.items():
+            ids = [r["user_id"] for r in registrations if r["user_type"] == user_type]
+            if ids:
+                profiles.update(((user_type, i), row) for i, row in zip(ids, dao.get_many(ids)) if row)
+        participants = []
+        for r in registrations:
+            profile = profiles.get((r["user_type"], r["user_id"])) or {}
+            participants.append({**r, "name": profile.get("name"), "email": profile.get("email")})
+        return participants
@@ -0,0 +1,163 @@
+# src/services/export_services.py
+import datetime
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from src.dao.change_feed import ChangeFeedDAO
+from src.dao.pagination import DEFAULT_PAGE_SIZE
+from src.services.columnar_export import (
+    EXPORT_TABLES, ExportTable, StagedRows, new_generation, open_export, read_manifest,
+    remove_generations, write_generation, write_manifest,
+)
+from src.tracing import traced_service
+
+# an incremental export re-reads this many seconds before its watermark, for rows whose
+# updated_at was taken by a transaction that committed after the previous export read past it
+EXPORT_OVERLAP_SECONDS = float(os.getenv("EXPORT_OVERLAP_SECONDS", "60"))
+
+
+class ExportError(Exception):
+    """Custom exception for Export service errors."""
+    pass
+
+
+def _shift(timestamp: str, seconds: float) -> str:
+    """``timestamp`` moved back by ``seconds``, in the same style (``Z`` or ``+00:00``)."""
+    moment = datetime.datetime.fromisoformat(timestamp) - datetime.timedelta(seconds=seconds)
+    if timestamp.endswith("Z"):
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    return moment.isoformat()
+
+
+def _directory_bytes(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+@traced_service
+class ExportService:
+    def __init__(self, overlap: float = EXPORT_OVERLAP_SECONDS):
+        self.feed = ChangeFeedDAO()
+        self.overlap = overlap
+
+    # Export tables to out_dir: everything the first time, then only what changed since the watermark
+    def export(self, out_dir: str, tables: Optional[Sequence[str]] = None, full: bool = False,
+               page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        tables = list(tables or EXPORT_TABLES)
+        unknown = [t for t in tables if t not in EXPORT_TABLES]
+        if unknown:
+            raise ExportError(f"Cannot export {', '.join(unknown)} (expected some of {', '.join(EXPORT_TABLES)})")
+        os.makedirs(out_dir, exist_ok=True)
+        manifest = self._manifest(out_dir)
+        current = open_export(out_dir)
+        summary = {}
+        for table in tables:
+            summary[table] = self._export_table(out_dir, manifest, table, None if full else current.get(table), page_size)
+            # saved per table, so a failure later on keeps the tables already done
+            write_manifest(out_dir, manifest)
+        return {"path": out_dir, "tables": summary}
+
+    # Tables, row counts, watermarks and sizes of an export
+    def export_info(self, out_dir: str) -> Dict:
+        manifest = self._manifest(out_dir)
+        if not manifest["tables"]:
+            raise ExportError(f"No export found in {out_dir}")
+        for table, info in manifest["tables"].items():
+            info["bytes"] = _directory_bytes(os.path.join(out_dir, table, info["generation"]))
+        return manifest
+
+    # Rows of an exported table, read from the memory-mapped files
+    def read_export(self, out_dir: str, table: str, columns: Optional[List[str]] = None,
+                    limit: Optional[int] = None) -> Iterator[Dict]:
+        exported = open_export(out_dir).get(table)
+        if exported is None:
+            raise ExportError(f"Table '{table}' is not in the export at {out_dir}")
+        unknown = [c for c in columns or () if c not in exported.columns]
+        if unknown:
+            raise ExportError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+        return exported.rows(columns, stop=limit)
+
+    def _manifest(self, out_dir: str) -> Dict:
+        try:
+            return read_manifest(out_dir)
+        except ValueError as e:
+            raise ExportError(str(e))
+
+    def _export_table(self, out_dir: str, manifest: Dict, table: str, previous: Optional[ExportTable],
+                      page_size: int) -> Dict:
+        start = time.perf_counter()
+        # the files hold every change committed before this moment
+        checked_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        ints, texts = EXPORT_TABLES[table]
+        info = previous.info if previous is not None else None
+        if info is not None and (info["ints"], info["texts"]) != (list(ints), list(texts)):
+            # the column set changed since the last run: start over
+            previous, info = None, None
+        table_dir = os.path.join(out_dir, table)
+        generation = new_generation()
+
+        deleted: List[int] = []
+        if info is None:
+            # deletes before this point can't be in a full read
+            deleted_watermark = self.feed.latest_deletion(table)
+            since = None
+        else:
+            deleted_watermark = info["deleted_watermark"]
+            since = _shift(info["watermark"], self.overlap) if info["watermark"] else None
+            deleted_since = _shift(deleted_watermark, self.overlap) if deleted_watermark else None
+            for row in self.feed.iter_deleted(table, deleted_since, page_size, prefetch=True):
+                deleted.append(row["row_id"])
+                deleted_watermark = max(deleted_watermark or "", row["deleted_at"])
+
+        staged = StagedRows(os.path.join(table_dir, f".staging-{generation}"), ints, texts)
+        watermark = info["watermark"] if info else None
+        seen: Dict[int, str] = {}
+        page: List[Dict] = []
+        try:
+            for row in self.feed.iter_changed(table, since, ", ".join(ints + texts), page_size, prefetch=True):
+                page.append(row)
+                # rows arrive in updated_at order, so the last one carries the new watermark
+                watermark = max(watermark or "", row["updated_at"])
+                if info is not None:
+                    seen[row[ints[0]]] = row["updated_at"]
+                if len(page) >= page_size:
+                    staged.append(page)
+                    page = []
+            staged.append(page)
+        finally:
+            staged.close()
+
+        if info is not None and not self._changes(previous, seen, deleted):
+            # only the overlap was read again: keep the current generation
+            remove_generations(table_dir, info["generation"])
+            info.update({"watermark": watermark, "deleted_watermark": deleted_watermark, "checked_at": checked_at})
+            manifest["tables"][table] = info
+            return {"mode": "unchanged", "rows": info["rows"], "fetched": staged.rows, "deleted": 0,
+                    "watermark": watermark, "seconds": round(time.perf_counter() - start, 3)}
+
+        rows = write_generation(os.path.join(table_dir, generation), ints, texts, staged, previous, deleted)
+        mode = "full" if info is None else "incremental"
+        manifest["tables"][table] = {
+            "generation": generation, "key": ints[0], "ints": list(ints), "texts": list(texts), "rows": rows,
+            "watermark": watermark, "deleted_watermark": deleted_watermark, "mode": mode,
+            "exported_at": datetime.datetime.now(datetime.timezone.utc).isoformat(), "checked_at": checked_at,
+        }
+        # readers holding the previous generation keep their maps after the unlink
+        remove_generations(table_dir, generation)
+        return {"mode": mode, "rows": rows, "fetched": staged.rows,
+                "deleted": len(deleted), "watermark": watermark,
+                "bytes": _directory_bytes(os.path.join(table_dir, generation)),
+                "seconds": round(time.perf_counter() - start, 3)}
+
+    # whether the fetched rows or tombstones differ from what the previous generation holds
+    def _changes(self, previous: ExportTable, seen: Dict[int, str], deleted: List[int]) -> bool:
+        if deleted and (previous.find(deleted) >= 0).any():
+            return True
+        if not seen:
+            return False
+        ids = np.fromiter(seen, dtype=np.int64, count=len(seen))
+        positions = previous.find(ids)
+        if (positions < 0).any():
+            return True
+        stamps = previous.column("updated_at")
+        return any(stamps[int(p)] != stamp for p, stamp in zip(positions, seen.values()))
@@ -0,0 +1,142 @@
+# src/services/mentor_assignment.py
+"""Capacity-constrained student → mentor assignment for whole cohorts.
+
+``solve_assignment`` maximizes total skill fit subject to per-mentor capacities by
+solving it as a min-cost flow (transportation) problem with successive shortest paths.
+Students with identical fit rows (same course and year) are interchangeable, so they
+are grouped into one supply node first; a 3,000-student intake then collapses to a few
+dozen sources, and each augmentation moves as many students as the path allows.
+
+Every student also has a "no mentor" option costing ``UNASSIGNED_PENALTY``, so students
+are left out only when capacity runs out, and then it is the ones who lose least.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+UNASSIGNED_PENALTY = 1.0
+_INF = np.inf
+_EPS = 1e-9
+
+
+def _transport(cost: np.ndarray, supply: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+    """Min-cost flow from sources (rows) to sinks (columns) by successive shortest paths.
+
+    Shortest paths come from a Bellman-Ford pass vectorized over the whole cost matrix:
+    with few sources each pass is one (sources x sinks) array operation, and a path can
+    revisit at most every source once, so it converges in a handful of passes.
+    """
+    n_src, n_dst = cost.shape
+    flow = np.zeros((n_src, n_dst), dtype=np.int64)
+    supply_left = supply.astype(np.int64).copy()
+    cap_left = capacity.astype(np.int64).copy()
+    cols = np.arange(n_dst)
+    rows = np.arange(n_src)
+
+    while supply_left.sum() > 0:
+        d_src = np.where(supply_left > 0, 0.0, _INF)
+        prev_src = np.full(n_src, -1)   # sink node whose backward edge reached each source
+        d_dst = np.full(n_dst, _INF)
+        prev_dst = np.full(n_dst, -1)
+        for _ in range(n_src + 1):
+            reach = d_src[:, None] + cost
+            best = reach.argmin(axis=0)
+            # move a predecessor only on strict improvement, so ties cannot form a cycle
+            moved = reach[best, cols] < d_dst - _EPS
+            d_dst = np.where(moved, reach[best, cols], d_dst)
+            prev_dst = np.where(moved, best, prev_dst)
+            # residual backward edges sink -> source wherever flow was already sent
+            back = np.where(flow > 0, d_dst[None, :] - cost, _INF)
+            via = back.argmin(axis=1)
+            nd = back[rows, via]
+            improved = nd < d_src - _EPS
+            if not improved.any():
+                break
+            d_src = np.where(improved, nd, d_src)
+            prev_src = np.where(improved, via, prev_src)
+
+        last = int(np.argmin(np.where(cap_left > 0, d_dst, _INF)))
+        # walk back from the sink: each step is a forward edge g -> m, entered through
+        # the backward edge that undoes flow g -> back
+        path = []
+        m = last
+        delta = cap_left[m]
+        while True:
+            g = int(prev_dst[m])
+            back_m = int(prev_src[g])
+            path.append((g, m, back_m))
+            if back_m < 0:
+                delta = min(delta, supply_left[g])
+                break
+            delta = min(delta, flow[g, back_m])
+            m = back_m
+        for g, m, back_m in path:
+            flow[g, m] += delta
+            if back_m >= 0:
+                flow[g, back_m] -= delta
+        supply_left[path[-1][0]] -= delta
+        cap_left[last] -= delta
+    return flow
+
+
+def solve_assignment(fit: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+    """Return, for each row of ``fit`` (students x mentors), the chosen mentor column or -1."""
+    fit = np.asarray(fit, dtype=np.float64)
+    n_students, n_mentors = fit.shape
+    capacity = np.maximum(np.asarray(capacity, dtype=np.int64), 0)
+    result = np.full(n_students, -1, dtype=np.int64)
+    if n_students == 0 or n_mentors == 0 or capacity.sum() == 0:
+        return result
+
+    open_cols = np.flatnonzero(capacity > 0)
+    rows, group_of, counts = np.unique(fit[:, open_cols], axis=0, return_inverse=True, return_counts=True)
+    group_of = group_of.reshape(-1)
+    # costs shifted to be non-negative; the last column is "no mentor" with unlimited room
+    top = max(float(rows.max()), 0.0)
+    cost = np.hstack([top - rows, np.full((len(rows), 1), top + UNASSIGNED_PENALTY)])
+    room = np.append(capacity[open_cols], n_students)
+    flow = _transport(cost, counts, room)
+
+    for g in range(len(rows)):
+        members = np.flatnonzero(group_of == g)
+        cols = np.repeat(np.arange(len(open_cols)), flow[g, :-1])
+        result[members[:len(cols)]] = open_cols[cols]
+    return result
+
+
+def assignment_report(student_ids: List[int], mentor_ids: np.ndarray, fit: np.ndarray,
+                      choice: np.ndarray, capacity: np.ndarray, details: bool = True) -> Dict:
+    """Summary of a solved assignment, suitable for a dry run."""
+    placed = np.flatnonzero(choice >= 0)
+    fits = fit[placed, choice[placed]] if len(placed) else np.empty(0)
+    load = np.bincount(choice[placed], minlength=len(mentor_ids)) if len(placed) else np.zeros(len(mentor_ids), int)
+    used = load > 0
+    report = {
+        "students": len(student_ids),
+        "assigned": int(len(placed)),
+        "unassigned": [int(student_ids[i]) for i in np.flatnonzero(choice < 0)],
+        "mentors_available": int((capacity > 0).sum()),
+        "mentors_used": int(used.sum()),
+        "capacity_total": int(capacity.sum()),
+        "total_fit": round(float(fits.sum()), 4),
+        "mean_fit": round(float(fits.mean()), 4) if len(fits) else None,
+        "zero_fit_assignments": int((fits <= 0).sum()),
+        "load": {"min": int(load[used].min()) if used.any() else 0,
+                 "max": int(load.max()) if len(load) else 0,
+                 "mean": round(float(load[used].mean()), 2) if used.any() else 0.0},
+    }
+    if details:
+        report["assignments"] = [
+            {"student_id": int(student_ids[i]), "mentor_id": int(mentor_ids[choice[i]]),
+             "fit": round(float(fit[i, choice[i]]), 4)}
+            for i in placed
+        ]
+    return report
+
+
+def capacities_for(mentor_ids: np.ndarray, default: int, overrides: Optional[Dict[int, int]],
+                   current_load: Dict[int, int]) -> np.ndarray:
+    """Remaining capacity per mentor: configured limit minus active mentees."""
+    overrides = overrides or {}
+    return np.array([max(0, int(overrides.get(int(m), default)) - current_load.get(int(m), 0))
+                     for m in mentor_ids], dtype=np.int64)
@@ -0,0 +1,287 @@
+# src/services/mentor_matching.py
+"""Skill-based mentor ranking behind ``StudentService.recommend_mentors``.
+
+Free-text skills are normalized into tags (``"ML, Py"`` → ``machine learning``,
+``python``), and every mentor becomes an L2-normalized vector over skill tags plus the
+linked alumni's industry, weighted by inverse document frequency. The vectors are kept
+as a sparse matrix in column-major NumPy arrays, so scoring a student only touches the
+mentors that share at least one feature with them.
+
+A student's profile is derived from course and year: the course maps to skills and
+industries, and later-year students lean more on industry.
+
+The matcher is shared per process and built lazily. Mentors created or edited
+afterwards are marked dirty and re-read in one query on the next recommendation.
+"""
+import math
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+SKILL_SYNONYMS = {
+    "ml": "machine learning", "ai": "artificial intelligence", "dl": "deep learning",
+    "ds": "data science", "data analysis": "data science", "analytics": "data science",
+    "py": "python", "python3": "python", "js": "javascript", "ts": "typescript",
+    "reactjs": "react", "react.js": "react", "node": "nodejs", "node.js": "nodejs",
+    "golang": "go", "k8s": "kubernetes", "aws": "cloud", "gcp": "cloud", "azure": "cloud",
+    "postgres": "sql", "postgresql": "sql", "mysql": "sql", "databases": "sql",
+    "stats": "statistics", "dsa": "algorithms", "data structures": "algorithms",
+    "infosec": "security", "cybersecurity": "security", "cyber security": "security",
+    "pm": "product management", "product": "product management",
+    "ui": "design", "ux": "design", "communication": "public speaking",
+    "swe": "software engineering", "software development": "software engineering",
+}
+
+# course -> (skill tags, industries)
+COURSE_PROFILES = {
+    "cse": (["python", "java", "algorithms", "software engineering", "cloud", "machine learning", "sql"],
+            ["software", "telecom", "research"]),
+    "it": (["python", "java", "cloud", "devops", "sql", "security", "react"],
+           ["software", "telecom", "consulting"]),
+    "data science": (["python", "machine learning", "data science", "statistics", "sql", "deep learning"],
+                     ["software", "research", "finance"]),
+    "ece": (["embedded systems", "signal processing", "python", "iot", "vlsi"],
+            ["telecom", "manufacturing", "research"]),
+    "eee": (["power systems", "embedded systems", "iot", "matlab"], ["energy", "manufacturing"]),
+    "mechanical": (["cad", "design", "robotics", "matlab", "manufacturing"], ["manufacturing", "energy"]),
+    "civil": (["structural engineering", "cad", "project management"], ["government", "manufacturing", "consulting"]),
+    "chemical": (["process engineering", "matlab", "research"], ["energy", "manufacturing", "healthcare"]),
+    "biotech": (["research", "bioinformatics", "python", "statistics"], ["healthcare", "research"]),
+    "mba": (["finance", "marketing", "leadership", "product management", "public speaking", "strategy"],
+            ["finance", "consulting", "retail", "media"]),
+}
+COURSE_ALIASES = {
+    "computer science": "cse", "cs": "cse", "computer science and engineering": "cse",
+    "information technology": "it", "ds": "data science", "electronics": "ece",
+    "electrical": "eee", "mech": "mechanical", "business administration": "mba",
+}
+
+INDUSTRY_WEIGHT = 1.0
+# Rebuild from the database after this many seconds, or once this many mentors changed
+MENTOR_MATCHER_TTL = float(os.getenv("MENTOR_MATCHER_TTL", "600"))
+MAX_PENDING = 1000
+
+_SPLIT = re.compile(r"[,;/|\n]+")
+_CLEAN = re.compile(r"[^a-z0-9+#.\s]")
+
+
+def normalize_tag(raw: str) -> str:
+    tag = " ".join(_CLEAN.sub(" ", raw.lower()).split()).strip(".")
+    return SKILL_SYNONYMS.get(tag, tag)
+
+
+def normalize_skills(text: Optional[str]) -> List[str]:
+    """Split a free-text skills string into de-duplicated canonical tags."""
+    if not text:
+        return []
+    tags = (normalize_tag(part) for part in _SPLIT.split(text))
+    return list(dict.fromkeys(tag for tag in tags if tag))
+
+
+def _normalize(vec: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(w * w for w in vec.values()))
+    return {f: w / norm for f, w in vec.items()} if norm else {}
+
+
+def student_profile(course: Optional[str], year: Optional[int]) -> Dict[str, float]:
+    """Feature vector for a student, from course and year of study."""
+    key = normalize_tag(course or "")
+    key = COURSE_ALIASES.get(key, key)
+    skills, industries = COURSE_PROFILES.get(key, (normalize_skills(course), []))
+    # first-years lean on skills, final-years on the industry they are heading into
+    industry_weight = 0.5 if year is None else min(max(0.3 + 0.15 * (int(year) - 1), 0.3), 0.75)
+    vec = {f"skill:{s}": 1.0 for s in skills}
+    vec.update({f"industry:{i}": industry_weight for i in industries})
+    return _normalize(vec)
+
+
+def mentor_features(row: Dict) -> Tuple[Set[str], Dict]:
+    """Feature set and display fields for a mentor row (optionally with embedded alumni)."""
+    alumni = row.get("alumni") or {}
+    industry = normalize_tag(alumni.get("industry") or "")
+    features = {f"skill:{t}" for t in normalize_skills(row.get("skills"))}
+    if industry:
+        features.add(f"industry:{industry}")
+    info = {"mentor_id": row["mentor_id"], "alumni_id": row.get("alumni_id"), "name": alumni.get("name"),
+            "industry": alumni.get("industry"), "skills": row.get("skills")}
+    return features, info
+
+
+class MentorMatcher:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.built_at: Optional[float] = None
+        self._columns: Dict[str, int] = {}
+        self._idf: Dict[str, float] = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._info: List[Dict] = []
+        self._features: List[Set[str]] = []
+        self._alive = np.empty(0, dtype=bool)
+        self._row_of: Dict[int, int] = {}
+        # column-major sparse matrix: rows/data of column c are indptr[c]:indptr[c + 1]
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._rows = np.empty(0, dtype=np.int32)
+        self._data = np.empty(0, dtype=np.float32)
+        # mentors changed since the build: scored separately until the next rebuild
+        self._pending: Dict[int, Tuple[Dict[str, float], Set[str], Dict]] = {}
+        self._dirty: Set[int] = set()
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    def __len__(self) -> int:
+        return int(self._alive.sum()) + len(self._pending)
+
+    def _idf_of(self, feature: str) -> float:
+        return self._idf.get(feature) or math.log(1 + max(len(self._ids), 1))
+
+    def _vector(self, features: Set[str]) -> Dict[str, float]:
+        return _normalize({f: self._idf_of(f) * (INDUSTRY_WEIGHT if f.startswith("industry:") else 1.0)
+                           for f in features})
+
+    def build(self, rows: Iterable[Dict]):
+        profiles = [mentor_features(row) for row in rows]
+        with self._lock:
+            n = len(profiles)
+            df: Dict[str, int] = {}
+            for features, _ in profiles:
+                for f in features:
+                    df[f] = df.get(f, 0) + 1
+            self._ids = np.array([info["mentor_id"] for _, info in profiles], dtype=np.int64)
+            self._idf = {f: math.log(1 + n / d) for f, d in df.items()}
+            self._columns = {f: i for i, f in enumerate(sorted(df))}
+            self._info = [info for _, info in profiles]
+            self._features = [features for features, _ in profiles]
+            self._row_of = {int(mid): i for i, mid in enumerate(self._ids)}
+            self._alive = np.ones(n, dtype=bool)
+
+            rows_, cols, data = [], [], []
+            for r, (features, _) in enumerate(profiles):
+                for f, w in self._vector(features).items():
+                    rows_.append(r)
+                    cols.append(self._columns[f])
+                    data.append(w)
+            cols = np.asarray(cols, dtype=np.int64)
+            order = np.argsort(cols, kind="stable")
+            self._rows = np.asarray(rows_, dtype=np.int32)[order]
+            self._data = np.asarray(data, dtype=np.float32)[order]
+            self._indptr = np.zeros(len(self._columns) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(cols, minlength=len(self._columns)), out=self._indptr[1:])
+            self._pending.clear()
+            self._dirty.clear()
+            self.built_at = time.monotonic()
+
+    def ensure_built(self, load: Callable[[], Iterable[Dict]]):
+        with self._lock:
+            stale = self.built and (time.monotonic() - self.built_at > MENTOR_MATCHER_TTL
+                                    or len(self._pending) > MAX_PENDING)
+            if not self.built or stale:
+                self.build(load())
+
+    # incremental maintenance
+    def mark_dirty(self, mentor_id: int):
+        if self.built:
+            with self._lock:
+                self._dirty.add(int(mentor_id))
+
+    def take_dirty(self) -> List[int]:
+        with self._lock:
+            dirty, self._dirty = sorted(self._dirty), set()
+            return dirty
+
+    def upsert(self, row: Dict):
+        features, info = mentor_features(row)
+        with self._lock:
+            self._hide(info["mentor_id"])
+            self._pending[int(info["mentor_id"])] = (self._vector(features), features, info)
+
+    def remove(self, mentor_id: int):
+        with self._lock:
+            self._hide(mentor_id)
+            self._pending.pop(int(mentor_id), None)
+
+    def _hide(self, mentor_id: int):
+        row = self._row_of.get(int(mentor_id))
+        if row is not None:
+            self._alive[row] = False
+
+    # scoring
+    def _scores(self, profile: Dict[str, float]) -> np.ndarray:
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        for feature, weight in profile.items():
+            col = self._columns.get(feature)
+            if col is None:
+                continue
+            lo, hi = self._indptr[col], self._indptr[col + 1]
+            scores[self._rows[lo:hi]] += self._data[lo:hi] * weight
+        return scores
+
+    def recommend(self, profile: Dict[str, float], k: int = 5, exclude: Iterable[int] = ()) -> List[Dict]:
+        """Top-k mentors for a student feature vector, best first. Zero-score mentors are dropped."""
+        if k <= 0 or not profile:
+            return []
+        exclude = {int(e) for e in exclude}
+        with self._lock:
+            scores = self._scores(profile)
+            scores[~self._alive] = 0
+            if exclude and len(self._ids):
+                scores[np.isin(self._ids, list(exclude))] = 0
+            candidates: List[Tuple[float, int, Dict, Set[str]]] = []
+            top = np.flatnonzero(scores > 0)
+            if len(top) > k:
+                top = top[np.argpartition(-scores[top], k - 1)[:k]]
+            for r in top:
+                candidates.append((float(scores[r]), int(self._ids[r]), self._info[r], self._features[r]))
+            for mentor_id, (vec, features, info) in self._pending.items():
+                score = sum(w * vec.get(f, 0.0) for f, w in profile.items())
+                if score > 0 and mentor_id not in exclude:
+                    candidates.append((score, mentor_id, info, features))
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        wanted = set(profile)
+        return [{**info, "score": round(score, 4),
+                 "matched": sorted({f.split(":", 1)[1] for f in features & wanted})}
+                for score, _, info, features in candidates[:k]]
+
+
+    def fit_matrix(self, profiles: List[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """(mentor_ids, fit) where fit[i, j] scores student profile i against mentor j."""
+        with self._lock:
+            live = np.flatnonzero(self._alive)
+            features = sorted({f for p in profiles for f in p if f in self._columns})
+            index = {f: k for k, f in enumerate(features)}
+            students = np.zeros((len(profiles), len(features)), dtype=np.float32)
+            for i, profile in enumerate(profiles):
+                for f, w in profile.items():
+                    if f in index:
+                        students[i, index[f]] = w
+            mentors = np.zeros((len(features), len(self._ids)), dtype=np.float32)
+            for k, f in enumerate(features):
+                lo, hi = self._indptr[self._columns[f]], self._indptr[self._columns[f] + 1]
+                mentors[k, self._rows[lo:hi]] = self._data[lo:hi]
+            fit = students @ mentors[:, live]
+            ids = self._ids[live]
+            if self._pending:
+                extra = np.array([[sum(w * vec.get(f, 0.0) for f, w in profile.items())
+                                   for vec, _, _ in self._pending.values()] for profile in profiles],
+                                 dtype=np.float32).reshape(len(profiles), len(self._pending))
+                fit = np.hstack([fit, extra])
+                ids = np.concatenate([ids, np.fromiter(self._pending, dtype=np.int64)])
+            return ids, fit
+
+
+_matcher: Optional[MentorMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_mentor_matcher() -> MentorMatcher:
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = MentorMatcher()
+    return _matcher
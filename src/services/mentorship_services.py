@@ -1,23 +1,67 @@
 # src/services/mentorship_services.py
-from typing import Dict, List, Optional
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from src.dao.mentors_dao import MentorsDAO
 from src.dao.mentorship_assignment_dao import MentorshipAssignmentsDAO
+from src.dao.students_dao import StudentsDAO
+from src.services.mentor_assignment import assignment_report, capacities_for, solve_assignment
+from src.services.mentor_matching import get_mentor_matcher, student_profile
+from src.services.replica import get_local_replica, writes
+from src.tracing import traced_service
+
+
+DEFAULT_MENTOR_CAPACITY = 5
 
 
 class MentorshipError(Exception):
     pass
 
 
+# an assignment is active until its end_date has passed
+def _is_active(end_date, today: str) -> bool:
+    return not end_date or str(end_date) >= today
+
+
+def _mentor_view(row: Dict) -> Dict:
+    view = {k: v for k, v in row.items() if k not in ("alumni", "mentorship_assignments")}
+    alumni = row.get("alumni") or {}
+    for key in ("name", "email", "industry", "location", "graduation_year"):
+        view[key] = alumni.get(key)
+    counts = row.get("mentorship_assignments") or [{}]
+    view["active_mentees"] = counts[0].get("count", 0)
+    return view
+
+
+def _assignment_view(row: Dict, today: str) -> Dict:
+    view = {k: v for k, v in row.items() if k not in ("students", "mentors")}
+    view["active"] = _is_active(row.get("end_date"), today)
+    student = row.get("students") or {}
+    view.update(student_name=student.get("name"), student_email=student.get("email"),
+                course=student.get("course"), year=student.get("year"))
+    mentor = row.get("mentors") or {}
+    alumni = mentor.get("alumni") or {}
+    view.update(mentor_alumni_id=mentor.get("alumni_id"), mentor_name=alumni.get("name"),
+                mentor_email=alumni.get("email"), mentor_industry=alumni.get("industry"),
+                mentor_skills=mentor.get("skills"))
+    return view
+
+
+@traced_service
 class MentorshipServices:
     def __init__(self):
         self.mentors_dao = MentorsDAO()
         self.assignments_dao = MentorshipAssignmentsDAO()
+        self.students_dao = StudentsDAO()
+        self.matcher = get_mentor_matcher()
+        self.replica = get_local_replica()
 
     # Mentor Management
+    @writes("mentors")
     def create_mentor(self, alumni_id: int, skills: Optional[str] = None) -> Dict:
         mentor = self.mentors_dao.create_mentor(alumni_id, skills)
         if not mentor:
             raise MentorshipError("Failed to create mentor")
+        self.matcher.mark_dirty(mentor["mentor_id"])
         return mentor
 
     def get_mentor(self, mentor_id: int) -> Dict:
@@ -27,20 +71,120 @@ class MentorshipServices:
         return mentor
 
     def list_mentors(self) -> List[Dict]:
-        return self.mentors_dao.list_mentors()
+        rows = self.replica.select("mentors") if self.replica else None
+        return rows if rows is not None else self.mentors_dao.list_mentors()
+
+    def iter_mentors(self, page_size: int = 1000, prefetch: bool = True) -> Iterator[Dict]:
+        return self.mentors_dao.iter_mentors(page_size=page_size, prefetch=prefetch)
+
+    # Joined read models: one request each, no per-row lookups
+    def get_mentor_view(self, mentor_id: int) -> Dict:
+        """Mentor with the alumni's profile fields and ``active_mentees``."""
+        mentor = self.mentors_dao.get_mentor_view(mentor_id)
+        if not mentor:
+            raise MentorshipError(f"Mentor with ID {mentor_id} not found")
+        return _mentor_view(mentor)
+
+    def list_mentor_views(self) -> List[Dict]:
+        return [_mentor_view(m) for m in self.mentors_dao.list_mentor_views()]
 
+    @writes("mentors")
     def update_mentor(self, mentor_id: int, updates: Dict) -> Dict:
         mentor = self.mentors_dao.update_mentor(mentor_id, updates)
         if not mentor:
             raise MentorshipError(f"Failed to update mentor {mentor_id}")
+        self.matcher.mark_dirty(mentor_id)
         return mentor
 
+    @writes("mentors")
     def delete_mentor(self, mentor_id: int) -> Dict:
         mentor = self.mentors_dao.delete_mentor(mentor_id)
         if not mentor:
             raise MentorshipError(f"Mentor with ID {mentor_id} not found")
+        self.matcher.remove(mentor_id)
         return mentor
 
+    # Mentor matching
+    def rank_mentors(self, course: Optional[str], year: Optional[int], k: int = 5,
+                     exclude: Iterable[int] = ()) -> List[Dict]:
+        """Top-k mentors for a course/year profile, with score and matched tags."""
+        if k <= 0:
+            raise MentorshipError("k must be positive")
+        self._sync_matcher()
+        return self.matcher.recommend(student_profile(course, year), k, exclude)
+
+    def assign_cohort(self, student_ids: Iterable[int], default_capacity: int = DEFAULT_MENTOR_CAPACITY,
+                      capacities: Optional[Dict[int, int]] = None, skip_assigned: bool = True,
+                      dry_run: bool = False, start_date: Optional[str] = None) -> Dict:
+        """Assign a whole cohort at once, maximizing total skill fit within mentor capacities.
+
+        A mentor's capacity (``capacities`` override or ``default_capacity``) counts their
+        active mentees. With ``dry_run`` nothing is written and the report is returned.
+
+        The plan is solved against the load read at the start; the write re-checks each
+        capacity, so assignments made meanwhile (another cohort run, a student joining) can't
+        take a mentor past it. Planned assignments that no longer fit are left out and listed
+        in ``over_capacity``; running the cohort again places those students.
+        """
+        if default_capacity < 0:
+            raise MentorshipError("default_capacity must not be negative")
+        report, rows = self._solve_cohort(student_ids, default_capacity, capacities, skip_assigned, start_date)
+        report["dry_run"] = dry_run
+        if not dry_run:
+            result = {"created": [], "over_capacity": []}
+            if rows:
+                overrides = capacities or {}
+                limits = {m: int(overrides.get(m, default_capacity)) for m in {r["mentor_id"] for r in rows}}
+                result = self.assignments_dao.assign_within_capacity(rows, limits)
+            report["written"] = len(result["created"])
+            report["over_capacity"] = [{"student_id": r["student_id"], "mentor_id": r["mentor_id"]}
+                                       for r in result["over_capacity"]]
+        return report
+
+    def _solve_cohort(self, student_ids, default_capacity, capacities, skip_assigned, start_date) -> Tuple[Dict, List[Dict]]:
+        ids = list(dict.fromkeys(int(i) for i in student_ids))
+        if not ids:
+            raise MentorshipError("Cohort is empty")
+        students = {i: row for i, row in zip(ids, self.students_dao.get_many(ids)) if row}
+
+        # active assignments: mentor load, and students who already have a mentor
+        today = date.today().isoformat()
+        load: Dict[int, int] = {}
+        has_mentor = set()
+        for a in self.assignments_dao.iter_assignment_links():
+            if not _is_active(a.get("end_date"), today):
+                continue
+            load[a["mentor_id"]] = load.get(a["mentor_id"], 0) + 1
+            has_mentor.add(a["student_id"])
+        already = [i for i in ids if i in students and i in has_mentor] if skip_assigned else []
+        skip = set(already)
+        cohort = [i for i in ids if i in students and i not in skip]
+
+        self._sync_matcher()
+        profiles = [student_profile(students[i].get("course"), students[i].get("year")) for i in cohort]
+        mentor_ids, fit = self.matcher.fit_matrix(profiles)
+        capacity = capacities_for(mentor_ids, default_capacity, capacities, load)
+        choice = solve_assignment(fit, capacity)
+
+        report = assignment_report(cohort, mentor_ids, fit, choice, capacity)
+        report["missing_students"] = [i for i in ids if i not in students]
+        report["already_assigned"] = already
+        rows = [{"mentor_id": a["mentor_id"], "student_id": a["student_id"], "start_date": start_date}
+                for a in report["assignments"]]
+        return report, rows
+
+    # bring the shared matcher up to date with mentors changed since it was built
+    def _sync_matcher(self):
+        self.matcher.ensure_built(lambda: self.mentors_dao.iter_mentor_profiles(prefetch=True))
+        dirty = self.matcher.take_dirty()
+        if dirty:
+            found = {m["mentor_id"]: m for m in self.mentors_dao.list_mentor_profiles(dirty)}
+            for mentor_id in dirty:
+                if mentor_id in found:
+                    self.matcher.upsert(found[mentor_id])
+                else:
+                    self.matcher.remove(mentor_id)
+
     # Mentorship Assignments
     def assign_student(
         self,
@@ -70,12 +214,30 @@ class MentorshipServices:
     def list_assignments(self) -> List[Dict]:
         return self.assignments_dao.list_assignments()
 
+    def iter_assignments(self, page_size: int = 1000, prefetch: bool = True) -> Iterator[Dict]:
+        return self.assignments_dao.iter_assignments(page_size=page_size, prefetch=prefetch)
+
     def list_students_by_mentor(self, mentor_id: int) -> List[Dict]:
         return self.assignments_dao.list_students_by_mentor(mentor_id)
 
     def list_mentors_by_student(self, student_id: int) -> List[Dict]:
         return self.assignments_dao.list_mentors_by_student(student_id)
 
+    def get_assignment_view(self, assignment_id: int) -> Dict:
+        """Assignment with the student's and the mentor's profile fields flattened in."""
+        assignment = self.assignments_dao.get_assignment_view(assignment_id)
+        if not assignment:
+            raise MentorshipError(f"Assignment with ID {assignment_id} not found")
+        return _assignment_view(assignment, date.today().isoformat())
+
+    def list_mentee_views(self, mentor_id: int) -> List[Dict]:
+        today = date.today().isoformat()
+        return [_assignment_view(a, today) for a in self.assignments_dao.list_assignment_views_by_mentor(mentor_id)]
+
+    def list_mentor_views_by_student(self, student_id: int) -> List[Dict]:
+        today = date.today().isoformat()
+        return [_assignment_view(a, today) for a in self.assignments_dao.list_assignment_views_by_student(student_id)]
+
     def update_assignment(self, assignment_id: int, updates: Dict) -> Dict:
         assignment = self.assignments_dao.update_assignment(assignment_id, updates)
         if not assignment:
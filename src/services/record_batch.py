@@ -0,0 +1,181 @@
+# src/services/record_batch.py
+"""Column-wise container for large list results.
+
+A RecordBatch holds rows of one record type (see src/dao/records.py) as NumPy columns:
+integers in int64 arrays, with a NULL mask only where a column has NULLs, and text
+packed as UTF-8 bytes plus offsets (a StringColumn, as in the export files). Indexing or
+iterating builds records on the fly, a chunk at a time, so code written against a list
+of rows keeps working. Code that wants a whole column calls ``column(name)`` and skips
+the records.
+
+It is built from any iterable of rows, packing ``BUILD_CHUNK_ROWS`` at a time. The
+service ``list_*(batch=True)`` calls feed it a page stream, so the full result never
+exists as dicts.
+"""
+from collections.abc import Sequence
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Type, Union
+
+import numpy as np
+
+from src.dao.records import Record
+from src.services.string_column import StringColumn
+
+# rows packed at a time while building; their dicts are the only ones held at once
+BUILD_CHUNK_ROWS = 10_000
+# rows turned back into records at a time while reading
+READ_CHUNK_ROWS = 65_536
+
+
+def _ints(values: List[Optional[int]]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    if None not in values:
+        return np.array(values, dtype=np.int64), None
+    nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    return np.array([0 if v is None else v for v in values], dtype=np.int64), nulls
+
+
+def _texts(values: List[Optional[str]]) -> Tuple[np.ndarray, bytes, Optional[np.ndarray]]:
+    nulls = None
+    if None in values:
+        nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+        values = ["" if v is None else v for v in values]
+    blob = "".join(values)
+    data = blob.encode("utf-8")
+    if len(data) == len(blob):
+        # ASCII: one byte per character
+        lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    else:
+        lengths = np.fromiter((len(v.encode("utf-8")) for v in values), dtype=np.int64, count=len(values))
+    return lengths, data, nulls
+
+
+def _join_nulls(parts: List[Optional[np.ndarray]], sizes: List[int]) -> Optional[np.ndarray]:
+    if all(p is None for p in parts):
+        return None
+    return np.concatenate([np.zeros(n, dtype=bool) if p is None else p for p, n in zip(parts, sizes)])
+
+
+class RecordBatch(Sequence):
+    """Rows of ``record_type`` held column-wise; see the module docstring."""
+
+    def __init__(self, record_type: Type[Record], columns: Dict[str, Union[np.ndarray, StringColumn]],
+                 nulls: Dict[str, np.ndarray], length: int):
+        self.record_type = record_type
+        self.columns = list(columns)
+        self._columns = columns
+        self._nulls = nulls
+        self._length = length
+
+    @classmethod
+    def from_rows(cls, record_type: Type[Record], rows: Iterable[Mapping],
+                  chunk_rows: int = BUILD_CHUNK_ROWS) -> "RecordBatch":
+        """Pack ``rows``, which must all have the columns of the first (the columns of one select)."""
+        rows = iter(rows)
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return cls(record_type, {}, {}, 0)
+        unknown = [n for n in chunk[0] if n not in record_type._field_set]
+        if unknown:
+            raise ValueError(f"{record_type.__name__} has no column(s) {', '.join(unknown)}")
+        # declared order when every column is there, so records come from the positional __init__
+        complete = len(chunk[0]) == len(record_type.FIELDS)
+        names = list(record_type.FIELDS) if complete else list(chunk[0])
+        getter = record_type._values if complete else itemgetter(*names)
+        ints = set(record_type.INT_FIELDS)
+        parts: Dict[str, List[Tuple]] = {n: [] for n in names}
+        sizes: List[int] = []
+        while chunk:
+            if any(len(row) != len(names) for row in chunk):
+                raise ValueError("rows of a RecordBatch must all have the same columns")
+            transposed = zip(*map(getter, chunk)) if len(names) > 1 else ([getter(row) for row in chunk],)
+            for name, values in zip(names, transposed):
+                values = list(values)
+                parts[name].append(_ints(values) if name in ints else _texts(values))
+            sizes.append(len(chunk))
+            chunk = list(islice(rows, chunk_rows))
+
+        columns: Dict[str, Union[np.ndarray, StringColumn]] = {}
+        nulls: Dict[str, np.ndarray] = {}
+        for name in names:
+            mask = _join_nulls([p[-1] for p in parts[name]], sizes)
+            if name in ints:
+                columns[name] = np.concatenate([p[0] for p in parts[name]])
+            else:
+                lengths = np.concatenate([p[0] for p in parts[name]])
+                offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+                np.cumsum(lengths, out=offsets[1:])
+                data = np.frombuffer(b"".join(p[1] for p in parts[name]), dtype=np.uint8)
+                columns[name] = StringColumn(offsets, data, mask)
+            if mask is not None:
+                nulls[name] = mask
+            # drop the chunk arrays as soon as the column is joined
+            del parts[name]
+        return cls(record_type, columns, nulls, sum(sizes))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            lo, hi, step = i.indices(self._length)
+            if step != 1:
+                return [self[j] for j in range(lo, hi, step)]
+            return list(self._records(lo, max(lo, hi)))
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("RecordBatch index out of range")
+        return next(self._records(i, i + 1))
+
+    def __iter__(self) -> Iterator[Record]:
+        return self._records(0, self._length)
+
+    def __repr__(self) -> str:
+        return f"RecordBatch({self.record_type.__name__}, {self._length} rows)"
+
+    def column(self, name: str) -> Union[np.ndarray, List[Optional[str]]]:
+        """An integer column as an int64 array (see ``nulls``), a text column as a list of str."""
+        if name not in self._columns:
+            raise KeyError(name)
+        col = self._columns[name]
+        return col.tolist() if isinstance(col, StringColumn) else col
+
+    def nulls(self, name: str) -> Optional[np.ndarray]:
+        """True where the column is NULL; None when it has no NULLs."""
+        return self._nulls.get(name)
+
+    @property
+    def nbytes(self) -> int:
+        total = 0
+        for col in self._columns.values():
+            if isinstance(col, StringColumn):
+                total += col.offsets.nbytes + col.data.nbytes
+            else:
+                total += col.nbytes
+        return total + sum(mask.nbytes for mask in self._nulls.values())
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [record.to_dict() for record in self]
+
+    def _records(self, start: int, stop: int, chunk_rows: int = READ_CHUNK_ROWS) -> Iterator[Record]:
+        make = self.record_type
+        complete = tuple(self.columns) == make.FIELDS
+        for lo in range(start, stop, chunk_rows):
+            hi = min(lo + chunk_rows, stop)
+            values = []
+            for name in self.columns:
+                col = self._columns[name]
+                if isinstance(col, StringColumn):
+                    values.append(col[lo:hi])
+                    continue
+                chunk: List[Any] = col[lo:hi].tolist()
+                nulls = self._nulls.get(name)
+                if nulls is not None:
+                    for i in np.flatnonzero(nulls[lo:hi]).tolist():
+                        chunk[i] = None
+                values.append(chunk)
+            if complete:
+                yield from (make(*row) for row in zip(*values))
+            else:
+                yield from (make.from_row(dict(zip(self.columns, row))) for row in zip(*values))
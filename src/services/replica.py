@@ -0,0 +1,244 @@
+# src/services/replica.py
+"""Optional local read replica of the directory tables, for the portal apps.
+
+The replica is a columnar export (see columnar_export) kept in ``REPLICA_PATH``, plus the
+rows of each table decoded in memory. ``start`` loads whatever is on disk, so a restarted
+app has its lists right away. A background thread then applies deltas every
+``REPLICA_REFRESH_AFTER`` seconds, through ExportService's incremental export and its
+``updated_at`` watermarks.
+
+Reads are bounded by ``REPLICA_MAX_STALENESS``. ``select`` returns None, and the caller
+reads the backend, when:
+
+* the table has not been synced within that bound;
+* this process wrote to the table after the last sync began (read-your-writes).
+
+Between ``REPLICA_REFRESH_AFTER`` and the bound, reads serve the current rows while a
+refresh runs (stale-while-revalidate). Services mark their writes with ``@writes``.
+
+Processes sharing a path take turns with a file lock, and each reloads the tables
+another process has moved to a new generation.
+"""
+import atexit
+import datetime
+import functools
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from src.dao.filters import Filter
+from src.dao.records import RECORD_TYPES, Record
+from src.services.columnar_export import open_export
+
+try:
+    import fcntl
+except ImportError:  # Windows: give each process its own REPLICA_PATH
+    fcntl = None
+
+REPLICA_ENABLED = os.getenv("REPLICA_ENABLED", "0").lower() in ("1", "true", "yes", "on")
+REPLICA_PATH = os.getenv("REPLICA_PATH", ".replica")
+# serve stale rows past this age, but start a refresh
+REPLICA_REFRESH_AFTER = float(os.getenv("REPLICA_REFRESH_AFTER", "30"))
+# never serve rows older than this; fall back to the backend instead
+REPLICA_MAX_STALENESS = float(os.getenv("REPLICA_MAX_STALENESS", "300"))
+# wait after a failed refresh, doubling up to this
+MAX_RETRY_DELAY = 60.0
+
+# replicated tables and the columns their lists are ordered by (the key breaks ties)
+REPLICA_TABLES: Dict[str, Tuple[str, ...]] = {
+    "alumni": ("alumni_id",),
+    "events": ("event_date", "event_id"),
+    "mentors": ("mentor_id",),
+}
+
+
+def _sort_key(columns: Tuple[str, ...]) -> Callable[[Dict], Tuple]:
+    # NULLs last, as Postgres orders ascending lists
+    return lambda row: tuple((row[c] is None, "" if row[c] is None else row[c]) for c in columns)
+
+
+def _epoch(timestamp: Optional[str]) -> float:
+    return datetime.datetime.fromisoformat(timestamp).timestamp() if timestamp else 0.0
+
+
+class _View:
+    """Decoded rows of one generation of a table, as records in list order."""
+
+    def __init__(self, generation: str, rows: List[Record], synced_at: float):
+        self.generation = generation
+        self.rows = rows
+        self.synced_at = synced_at
+
+
+class LocalReplica:
+    def __init__(self, path: str, tables: Dict[str, Tuple[str, ...]] = REPLICA_TABLES,
+                 refresh_after: float = REPLICA_REFRESH_AFTER, max_staleness: float = REPLICA_MAX_STALENESS,
+                 exporter=None):
+        if exporter is None:
+            from src.services.export_services import ExportService
+            exporter = ExportService()
+        self.path = path
+        self.tables = dict(tables)
+        self.refresh_after = refresh_after
+        self.max_staleness = max_staleness
+        self.exporter = exporter
+        self._views: Dict[str, _View] = {}
+        self._written: Dict[str, float] = {}
+        self._wake = threading.Event()
+        self._closing = False
+        self._refreshing = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._last_error: Optional[str] = None
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_failures": 0, "reloads": 0}
+        self._refresh_ms: List[float] = []
+
+    # Load the on-disk snapshot and start the refresher thread
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._file_lock():
+            self._reload()
+        self._thread = threading.Thread(target=self._run, name="replica-refresh", daemon=True)
+        self._thread.start()
+
+    # Copies of the table's rows matching `flt`, or None when they can't be served
+    def select(self, table: str, flt: Optional[Filter] = None) -> Optional[List[Record]]:
+        view = self._views.get(table)
+        now = time.time()
+        if view is None or now - view.synced_at > self.max_staleness or self._written.get(table, 0.0) >= view.synced_at:
+            self.counters["misses"] += 1
+            self._wake.set()
+            return None
+        if now - view.synced_at > self.refresh_after:
+            self.counters["stale_hits"] += 1
+            self._wake.set()
+        else:
+            self.counters["hits"] += 1
+        return [row.copy() for row in view.rows if flt is None or flt.matches(row)]
+
+    # This process changed `tables`: bypass them until a sync that began afterwards
+    def note_write(self, *tables: str):
+        now = time.time()
+        for table in tables:
+            if table in self.tables:
+                self._written[table] = now
+        self._wake.set()
+
+    # One delta sync of every table; returns the export summary
+    def refresh(self) -> Dict:
+        with self._refreshing:
+            started = time.time()
+            with self._file_lock():
+                result = self.exporter.export(self.path, list(self.tables))
+                self._reload(started)
+            self.counters["refreshes"] += 1
+            self._refresh_ms.append((time.time() - started) * 1000)
+            del self._refresh_ms[:-100]
+            return result
+
+    def close(self):
+        self._closing = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def metrics(self) -> Dict:
+        now = time.time()
+        return {
+            "path": self.path,
+            "tables": {t: {"rows": len(v.rows), "age_seconds": round(now - v.synced_at, 3), "generation": v.generation,
+                           "bypassed": self._written.get(t, 0.0) >= v.synced_at}
+                       for t, v in self._views.items()},
+            "refresh_after": self.refresh_after,
+            "max_staleness": self.max_staleness,
+            **self.counters,
+            "last_refresh_ms": round(self._refresh_ms[-1], 3) if self._refresh_ms else None,
+            "last_error": self._last_error,
+        }
+
+    def _reload(self, synced_at: Optional[float] = None):
+        """Decode tables whose generation changed; mark every table synced at ``synced_at``."""
+        exported = open_export(self.path)
+        for table, order in self.tables.items():
+            current = exported.get(table)
+            if current is None:
+                continue
+            view = self._views.get(table)
+            # on startup the manifest says when the files were last brought up to date
+            synced = synced_at if synced_at is not None else _epoch(current.info.get("checked_at"))
+            if view is not None and view.generation == current.info["generation"]:
+                view.synced_at = max(view.synced_at, synced)
+                continue
+            rows = sorted(RECORD_TYPES[table].decode(current.rows()), key=_sort_key(order))
+            self._views[table] = _View(current.info["generation"], rows, synced)
+            self.counters["reloads"] += 1
+
+    def _file_lock(self):
+        os.makedirs(self.path, exist_ok=True)
+        return _FileLock(os.path.join(self.path, ".lock"))
+
+    def _run(self):
+        delay = self.refresh_after
+        while not self._closing:
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._closing:
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                self._last_error = f"{type(e).__name__}: {e}"
+                self.counters["refresh_failures"] += 1
+                delay = min(max(delay * 2, 1.0), MAX_RETRY_DELAY)
+                continue
+            delay = self.refresh_after
+
+
+class _FileLock:
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        self._file = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        return False
+
+
+_replica: Optional[LocalReplica] = None
+_replica_lock = threading.Lock()
+
+
+def get_local_replica() -> Optional[LocalReplica]:
+    """The process-wide replica, started on first use; None unless REPLICA_ENABLED is set."""
+    global _replica
+    if not REPLICA_ENABLED:
+        return None
+    if _replica is None:
+        with _replica_lock:
+            if _replica is None:
+                replica = LocalReplica(REPLICA_PATH)
+                replica.start()
+                atexit.register(replica.close)
+                _replica = replica
+    return _replica
+
+
+def writes(*tables: str):
+    """Mark a service method as writing ``tables``, so the replica stops serving them until its next sync."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if _replica is not None:
+                    _replica.note_write(*tables)
+        return wrapper
+    return decorate
@@ -0,0 +1,79 @@
+# src/services/report_services.py
+import os
+import threading
+import time
+from typing import Dict, Optional
+from src.dao.alumni_dao import AlumniDAO
+from src.dao.event_registrations import EventRegistrationsDAO
+from src.dao.events_dao import EventsDAO
+from src.dao.mentors_dao import MentorsDAO
+from src.dao.mentorship_assignment_dao import MentorshipAssignmentsDAO
+from src.dao.students_dao import StudentsDAO
+from src.services import reporting
+from src.services.reporting import ALUMNI_GROUPINGS, TABLE_COLUMNS, Snapshot
+from src.tracing import traced_service
+
+# seconds a loaded snapshot is reused before reports reload it
+REPORT_SNAPSHOT_TTL = float(os.getenv("REPORT_SNAPSHOT_TTL", "300"))
+
+
+class ReportError(Exception):
+    """Custom exception for Report service errors."""
+    pass
+
+
+def _columns(table: str) -> str:
+    ints, texts = TABLE_COLUMNS[table]
+    return ", ".join(ints + texts)
+
+
+@traced_service
+class ReportService:
+    def __init__(self, ttl: float = REPORT_SNAPSHOT_TTL):
+        self.alumni_dao = AlumniDAO()
+        self.students_dao = StudentsDAO()
+        self.mentors_dao = MentorsDAO()
+        self.assignments_dao = MentorshipAssignmentsDAO()
+        self.events_dao = EventsDAO()
+        self.reg_dao = EventRegistrationsDAO()
+        self.ttl = ttl
+        self._snap: Optional[Snapshot] = None
+        self._snap_time = 0.0
+        self._lock = threading.Lock()
+
+    # Alumni per industry, location or graduation year, with mentoring and event participation
+    def alumni_report(self, by: str = "industry", top: Optional[int] = None, refresh: bool = False) -> Dict:
+        if by not in ALUMNI_GROUPINGS:
+            raise ReportError(f"Cannot group alumni by '{by}' (expected one of {', '.join(ALUMNI_GROUPINGS)})")
+        snap = self._snapshot(refresh)
+        return {"snapshot": snap.info(), **reporting.alumni_breakdown(snap, by, top)}
+
+    # Mentor load, idle mentors, and student coverage per course and industry
+    def mentor_coverage_report(self, refresh: bool = False) -> Dict:
+        snap = self._snapshot(refresh)
+        return {"snapshot": snap.info(), **reporting.mentor_coverage(snap)}
+
+    # Registrations per event and month, split by user type
+    def event_attendance_report(self, top: Optional[int] = 20, refresh: bool = False) -> Dict:
+        snap = self._snapshot(refresh)
+        return {"snapshot": snap.info(), **reporting.event_attendance(snap, top)}
+
+    # Alumni cohorts by graduation year and students by year of study
+    def cohort_report(self, refresh: bool = False) -> Dict:
+        snap = self._snapshot(refresh)
+        return {"snapshot": snap.info(), **reporting.cohort_trends(snap)}
+
+    # one pass over every table, shared by all reports until the TTL runs out
+    def _snapshot(self, refresh: bool = False) -> Snapshot:
+        with self._lock:
+            if refresh or self._snap is None or time.monotonic() - self._snap_time > self.ttl:
+                self._snap = reporting.load_snapshot({
+                    "alumni": self.alumni_dao.iter_alumni(prefetch=True, columns=_columns("alumni")),
+                    "students": self.students_dao.iter_students(prefetch=True, columns=_columns("students")),
+                    "mentors": self.mentors_dao.iter_mentors(prefetch=True, columns=_columns("mentors")),
+                    "assignments": self.assignments_dao.iter_assignment_links(prefetch=True),
+                    "events": self.events_dao.iter_events(prefetch=True, columns=_columns("events")),
+                    "registrations": self.reg_dao.iter_registrations(prefetch=True, columns=_columns("registrations")),
+                })
+                self._snap_time = time.monotonic()
+            return self._snap
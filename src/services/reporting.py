@@ -0,0 +1,336 @@
+# src/services/reporting.py
+"""Columnar in-memory snapshot of the network, and the aggregations behind admin-cli report.
+
+``load_snapshot`` streams each table once through the DAOs' keyset iterators into NumPy
+arrays. Integer columns become int64 (-1 for NULL). Text columns are dictionary-encoded:
+int32 codes into the sorted array of distinct values, with NULL stored as "".
+
+Reports are group-bys over those codes: ``np.bincount`` on one code column, or on several
+combined with ``np.ravel_multi_index``. Joins between tables are lookups on the id columns:
+a table indexed by id when the ids are serial, ``searchsorted`` otherwise. Per-value work (a date prefix, a comparison with today) runs once per
+distinct value on the dictionary, then fans out through the codes. A report is a handful
+of passes over contiguous arrays, whatever the number of rows or groups.
+"""
+import datetime
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NULL_LABEL = "(unknown)"
+
+# per table: (integer columns, text columns) kept in the snapshot
+TABLE_COLUMNS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "alumni": (("alumni_id", "graduation_year"), ("industry", "location")),
+    "students": (("student_id", "year"), ("course",)),
+    "mentors": (("mentor_id", "alumni_id"), ()),
+    "assignments": (("mentor_id", "student_id"), ("end_date",)),
+    "events": (("event_id",), ("event_name", "event_date")),
+    "registrations": (("event_id", "user_id"), ("user_type", "status")),
+}
+ALUMNI_GROUPINGS = ("industry", "location", "graduation_year")
+# mentee-load buckets: 0, 1, 2, 3-5, 6+
+_LOAD_EDGES = np.array([1, 2, 3, 6])
+_LOAD_LABELS = ("0", "1", "2", "3-5", "6+")
+
+
+class TextColumn:
+    """Dictionary-encoded strings: ``values[codes]`` is the column; NULL is stored as ""."""
+
+    def __init__(self, codes: np.ndarray, values: np.ndarray):
+        self.codes = codes
+        self.values = values
+
+    @classmethod
+    def encode(cls, raw: Sequence[Optional[str]]) -> "TextColumn":
+        if not len(raw):
+            return cls(np.empty(0, dtype=np.int32), np.array([], dtype=str))
+        values, codes = np.unique(np.array([v or "" for v in raw], dtype=str), return_inverse=True)
+        return cls(codes.reshape(-1).astype(np.int32), values)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def labels(self) -> List[str]:
+        return [v or NULL_LABEL for v in self.values.tolist()]
+
+    def code_of(self, value: str) -> int:
+        i = int(np.searchsorted(self.values, value))
+        return i if i < len(self.values) and self.values[i] == value else -1
+
+    def mask(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        """Per-row booleans, evaluating ``predicate`` once per distinct value."""
+        hit = np.fromiter((bool(predicate(v)) for v in self.values.tolist()), dtype=bool, count=len(self.values))
+        return hit[self.codes]
+
+    def derive(self, fn: Callable[[str], str]) -> "TextColumn":
+        """A new column ``fn(value)``, computed on the dictionary only."""
+        derived = np.array([fn(v) for v in self.values.tolist()], dtype=str)
+        values, remap = np.unique(derived, return_inverse=True)
+        return TextColumn(remap.reshape(-1).astype(np.int32)[self.codes], values)
+
+
+class Snapshot:
+    """Columns per table, as loaded at ``loaded_at``."""
+
+    def __init__(self, tables: Dict[str, Dict[str, Any]], loaded_at: str, load_seconds: float):
+        self.tables = tables
+        self.loaded_at = loaded_at
+        self.load_seconds = load_seconds
+
+    def rows(self, table: str) -> int:
+        return len(next(iter(self.tables[table].values())))
+
+    def info(self) -> Dict:
+        return {"loaded_at": self.loaded_at, "load_seconds": round(self.load_seconds, 3),
+                "rows": {t: self.rows(t) for t in self.tables}}
+
+
+def columnar(rows: Iterable[Dict], ints: Sequence[str], texts: Sequence[str]) -> Dict[str, Any]:
+    """Turn streamed row dicts into int64 arrays and ``TextColumn``s."""
+    buffers: Dict[str, List] = {c: [] for c in (*ints, *texts)}
+    appends = [(c, buffers[c].append) for c in buffers]
+    for row in rows:
+        for c, append in appends:
+            append(row.get(c))
+    columns: Dict[str, Any] = {}
+    for c in ints:
+        columns[c] = np.fromiter((-1 if v is None else v for v in buffers.pop(c)), dtype=np.int64)
+    for c in texts:
+        columns[c] = TextColumn.encode(buffers.pop(c))
+    return columns
+
+
+def load_snapshot(sources: Dict[str, Iterable[Dict]]) -> Snapshot:
+    """``sources`` maps each table of TABLE_COLUMNS to an iterable of its rows."""
+    start = time.perf_counter()
+    loaded_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    tables = {name: columnar(sources[name], *TABLE_COLUMNS[name]) for name in TABLE_COLUMNS}
+    return Snapshot(tables, loaded_at, time.perf_counter() - start)
+
+
+# --- vectorized building blocks ---
+def positions(ids: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Row index of each key in ``ids``, or -1 where it is missing (a vectorized join)."""
+    if not len(ids):
+        return np.full(len(keys), -1, dtype=np.int64)
+    low, high = int(ids.min()), int(ids.max())
+    if high - low < 4 * len(ids) + 1024:
+        # serial ids: a lookup table indexed by id beats a binary search per key
+        table = np.full(high - low + 1, -1, dtype=np.int64)
+        table[ids[::-1] - low] = np.arange(len(ids) - 1, -1, -1)
+        inside = (keys >= low) & (keys <= high)
+        return np.where(inside, table[np.where(inside, keys - low, 0)], -1)
+    order = np.argsort(ids, kind="stable")
+    sorted_ids = ids[order]
+    pos = np.minimum(np.searchsorted(sorted_ids, keys), len(ids) - 1)
+    return np.where(sorted_ids[pos] == keys, order[pos], -1)
+
+
+def group_count(keys: Sequence[Tuple[np.ndarray, int]], weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Counts (or sums of ``weights``) per combination of codes, shaped (n1, n2, ...)."""
+    dims = tuple(n for _, n in keys)
+    if not all(dims):
+        return np.zeros(dims)
+    flat = np.ravel_multi_index(tuple(codes for codes, _ in keys), dims)
+    counts = np.bincount(flat, weights=weights, minlength=int(np.prod(dims)))
+    return counts.reshape(dims)
+
+
+def _flags(n: int, rows: np.ndarray) -> np.ndarray:
+    flags = np.zeros(n, dtype=bool)
+    flags[rows[rows >= 0]] = True
+    return flags
+
+
+def _share(part, whole) -> float:
+    return round(float(part) / float(whole), 4) if whole else 0.0
+
+
+def _int_groups(values: np.ndarray) -> Tuple[np.ndarray, List]:
+    """Codes and labels for an integer column (NULL = -1 becomes NULL_LABEL)."""
+    uniq, codes = np.unique(values, return_inverse=True)
+    return codes.reshape(-1), [int(v) if v >= 0 else NULL_LABEL for v in uniq.tolist()]
+
+
+def _mentor_alumni(snap: Snapshot) -> np.ndarray:
+    return positions(snap.tables["alumni"]["alumni_id"], snap.tables["mentors"]["alumni_id"])
+
+
+def _participants(snap: Snapshot, user_type: str) -> np.ndarray:
+    """Per-row flag on alumni / students: registered for at least one event."""
+    regs = snap.tables["registrations"]
+    table, key = ("alumni", "alumni_id") if user_type == "alumni" else ("students", "student_id")
+    of_type = regs["user_type"].codes == regs["user_type"].code_of(user_type)
+    ids = snap.tables[table][key]
+    return _flags(len(ids), positions(ids, regs["user_id"][of_type]))
+
+
+def _active_assignments(snap: Snapshot, today: str) -> np.ndarray:
+    return snap.tables["assignments"]["end_date"].mask(lambda end: not end or end >= today)
+
+
+# --- reports ---
+def alumni_breakdown(snap: Snapshot, by: str = "industry", top: Optional[int] = None) -> Dict:
+    """Alumni per industry, location or graduation year, with mentoring and event participation."""
+    alumni = snap.tables["alumni"]
+    n = len(alumni["alumni_id"])
+    if by == "graduation_year":
+        codes, labels = _int_groups(alumni["graduation_year"])
+    else:
+        codes, labels = alumni[by].codes, alumni[by].labels()
+    k = len(labels)
+    total = np.bincount(codes, minlength=k)
+    mentors = np.bincount(codes[_flags(n, _mentor_alumni(snap))], minlength=k)
+    active = np.bincount(codes[_participants(snap, "alumni")], minlength=k)
+    # years read best in order, categories by size
+    order = np.arange(k) if by == "graduation_year" else np.argsort(-total, kind="stable")
+    groups = [{by: labels[i], "alumni": int(total[i]), "share": _share(total[i], n),
+               "mentors": int(mentors[i]), "mentor_share": _share(mentors[i], total[i]),
+               "event_participants": int(active[i]), "participation": _share(active[i], total[i])}
+              for i in order if total[i]]
+    return {"by": by, "alumni": n, "groups": groups[:top] if top else groups}
+
+
+def mentor_coverage(snap: Snapshot, today: Optional[str] = None) -> Dict:
+    """How much mentoring capacity there is, where it sits, and which students it reaches."""
+    today = today or datetime.date.today().isoformat()
+    alumni, students, mentors = snap.tables["alumni"], snap.tables["students"], snap.tables["mentors"]
+    assignments = snap.tables["assignments"]
+    active = _active_assignments(snap, today)
+    n_mentors, n_students = len(mentors["mentor_id"]), len(students["student_id"])
+
+    mentor_rows = positions(mentors["mentor_id"], assignments["mentor_id"][active])
+    load = np.bincount(mentor_rows[mentor_rows >= 0], minlength=n_mentors)
+    mentored = _flags(n_students, positions(students["student_id"], assignments["student_id"][active]))
+    buckets = np.bincount(np.searchsorted(_LOAD_EDGES, load, side="right"), minlength=len(_LOAD_LABELS))
+
+    course = students["course"]
+    per_course = group_count([(course.codes, len(course.values)), (mentored.astype(np.int64), 2)])
+    by_course = [{"course": label, "students": int(row.sum()), "mentored": int(row[1]),
+                  "coverage": _share(row[1], row.sum())}
+                 for label, row in zip(course.labels(), per_course) if row.sum()]
+    by_course.sort(key=lambda g: (g["coverage"], -g["students"]))
+
+    industry = alumni["industry"]
+    mentor_alumni = _mentor_alumni(snap)
+    known = mentor_alumni >= 0
+    mentor_industry = industry.codes[mentor_alumni[known]]
+    k = len(industry.values)
+    alumni_per = np.bincount(industry.codes, minlength=k)
+    mentors_per = np.bincount(mentor_industry, minlength=k)
+    mentees_per = np.bincount(mentor_industry, weights=load[known], minlength=k)
+    by_industry = [{"industry": label, "alumni": int(alumni_per[i]), "mentors": int(mentors_per[i]),
+                    "mentor_share": _share(mentors_per[i], alumni_per[i]), "active_mentees": int(mentees_per[i]),
+                    "mentees_per_mentor": round(float(mentees_per[i] / mentors_per[i]), 2) if mentors_per[i] else 0.0}
+                   for i, label in enumerate(industry.labels()) if alumni_per[i]]
+    by_industry.sort(key=lambda g: -g["mentors"])
+
+    return {
+        "today": today,
+        "mentors": {
+            "total": n_mentors,
+            "with_active_mentees": int((load > 0).sum()),
+            "idle": int((load == 0).sum()),
+            "active_mentees_per_mentor": {"mean": round(float(load.mean()), 2) if n_mentors else 0.0,
+                                          "max": int(load.max()) if n_mentors else 0,
+                                          "distribution": dict(zip(_LOAD_LABELS, map(int, buckets)))},
+        },
+        "students": {"total": n_students, "mentored": int(mentored.sum()), "coverage": _share(mentored.sum(), n_students)},
+        "assignments": {"total": len(active), "active": int(active.sum())},
+        "by_course": by_course,
+        "by_industry": by_industry,
+    }
+
+
+def event_attendance(snap: Snapshot, top: Optional[int] = 20) -> Dict:
+    """Registrations per event, month and user type."""
+    events, regs = snap.tables["events"], snap.tables["registrations"]
+    n_events = len(events["event_id"])
+    event_rows = positions(events["event_id"], regs["event_id"])
+    known = event_rows >= 0
+    user_type = regs["user_type"]
+    is_alumni = user_type.codes == user_type.code_of("alumni")
+    is_student = user_type.codes == user_type.code_of("student")
+    waitlisted = regs["status"].codes == regs["status"].code_of("waitlisted")
+
+    per_event = group_count([(event_rows[known], n_events), (is_alumni[known].astype(np.int64), 2)])
+    alumni_per, students_per = per_event[:, 1], per_event[:, 0]
+    total_per = alumni_per + students_per
+    waitlist_per = np.bincount(event_rows[known & waitlisted], minlength=n_events)
+
+    month = events["event_date"].derive(lambda d: d[:7])
+    months = month.labels()
+    reg_month = month.codes[event_rows[known]]
+    per_month = group_count([(reg_month, len(months)), (is_alumni[known].astype(np.int64), 2)])
+    events_per_month = np.bincount(month.codes, minlength=len(months))
+
+    names, dates = events["event_name"], events["event_date"]
+    name_labels, date_labels = names.labels(), dates.labels()
+    order = np.argsort(-total_per, kind="stable")[:top] if top else np.argsort(-total_per, kind="stable")
+    return {
+        "registrations": int(len(event_rows)),
+        "alumni_registrations": int(is_alumni.sum()),
+        "student_registrations": int(is_student.sum()),
+        "waitlisted": int(waitlisted.sum()),
+        "distinct_attendees": {"alumni": int(_participants(snap, "alumni").sum()),
+                               "student": int(_participants(snap, "student").sum())},
+        "events": n_events,
+        "events_without_registrations": int((total_per == 0).sum()),
+        "mean_registrations_per_event": round(float(total_per.mean()), 2) if n_events else 0.0,
+        "by_month": [{"month": label, "events": int(events_per_month[i]), "alumni": int(per_month[i, 1]),
+                      "students": int(per_month[i, 0])}
+                     for i, label in enumerate(months) if events_per_month[i]],
+        "top_events": [{"event_id": int(events["event_id"][i]), "event_name": name_labels[names.codes[i]],
+                        "event_date": date_labels[dates.codes[i]], "registrations": int(total_per[i]),
+                        "alumni": int(alumni_per[i]), "students": int(students_per[i]),
+                        "waitlisted": int(waitlist_per[i])}
+                       for i in order if total_per[i]],
+    }
+
+
+def cohort_trends(snap: Snapshot, today: Optional[str] = None, top_industries: int = 3) -> Dict:
+    """Alumni per graduation year and students per year of study, with their engagement."""
+    today = today or datetime.date.today().isoformat()
+    alumni, students = snap.tables["alumni"], snap.tables["students"]
+    n_alumni, n_students = len(alumni["alumni_id"]), len(students["student_id"])
+
+    year_codes, years = _int_groups(alumni["graduation_year"])
+    industry = alumni["industry"]
+    mix = group_count([(year_codes, len(years)), (industry.codes, len(industry.values))])
+    size = mix.sum(axis=1)
+    mentors = np.bincount(year_codes[_flags(n_alumni, _mentor_alumni(snap))], minlength=len(years))
+    active = np.bincount(year_codes[_participants(snap, "alumni")], minlength=len(years))
+    industries = industry.labels()
+    alumni_cohorts = []
+    for i, year in enumerate(years):
+        leaders = np.argsort(-mix[i], kind="stable")[:top_industries]
+        alumni_cohorts.append({
+            "graduation_year": year, "alumni": int(size[i]),
+            "change": int(size[i] - size[i - 1]) if i else None,
+            "mentor_share": _share(mentors[i], size[i]), "participation": _share(active[i], size[i]),
+            "top_industries": [{"industry": industries[j], "share": _share(mix[i, j], size[i])}
+                               for j in leaders if mix[i, j]],
+        })
+
+    study_codes, study_years = _int_groups(students["year"])
+    assignments = snap.tables["assignments"]
+    active_links = _active_assignments(snap, today)
+    mentored = _flags(n_students, positions(students["student_id"], assignments["student_id"][active_links]))
+    student_size = np.bincount(study_codes, minlength=len(study_years))
+    student_mentored = np.bincount(study_codes[mentored], minlength=len(study_years))
+    student_active = np.bincount(study_codes[_participants(snap, "student")], minlength=len(study_years))
+    course = students["course"]
+    course_year = group_count([(course.codes, len(course.values)), (study_codes, len(study_years))])
+
+    return {
+        "alumni": n_alumni,
+        "alumni_by_graduation_year": alumni_cohorts,
+        "students": n_students,
+        "students_by_year": [{"year": year, "students": int(student_size[i]),
+                              "mentored_share": _share(student_mentored[i], student_size[i]),
+                              "participation": _share(student_active[i], student_size[i])}
+                             for i, year in enumerate(study_years)],
+        "students_by_course_and_year": {label: {str(y): int(n) for y, n in zip(study_years, row) if n}
+                                        for label, row in zip(course.labels(), course_year) if row.sum()},
+    }
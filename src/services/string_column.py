@@ -0,0 +1,45 @@
+# src/services/string_column.py
+"""Text column held as UTF-8 bytes plus offsets, the in-memory form shared by the columnar
+export files (columnar_export) and in-memory list results (record_batch)."""
+from typing import List, Optional, Union
+
+import numpy as np
+
+
+class StringColumn:
+    """Text column over offsets and UTF-8 bytes, mapped or in memory; decodes only what is read."""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray, nulls: Optional[np.ndarray] = None):
+        self.offsets = offsets
+        self.data = data
+        self.nulls = nulls
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            lo, hi, step = i.indices(len(self))
+            if step != 1:
+                return [self[j] for j in range(lo, hi, step)]
+            hi = max(lo, hi)
+            start = self.offsets[lo]
+            nulls = self.nulls[lo:hi] if self.nulls is not None else None
+            return StringColumn(self.offsets[lo:hi + 1] - start, self.data[start:self.offsets[hi]], nulls).tolist()
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def tolist(self) -> List[Optional[str]]:
+        blob = bytes(self.data).decode("utf-8") if len(self.data) else ""
+        if blob.isascii():
+            bounds = self.offsets.tolist()
+        else:
+            # offsets count bytes; map them to character positions once
+            widths = np.frombuffer(bytes(self.data), dtype=np.uint8) & 0xC0 != 0x80
+            bounds = np.concatenate([[0], np.cumsum(widths)])[self.offsets].tolist()
+        values = [blob[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        if self.nulls is not None:
+            for i in np.flatnonzero(self.nulls).tolist():
+                values[i] = None
+        return values
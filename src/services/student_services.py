@@ -1,15 +1,27 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Union
+from postgrest.exceptions import APIError
 from src.dao.students_dao import StudentsDAO
 from src.dao.event_registrations import EventRegistrationsDAO
+from src.dao.filters import FilterLike
+from src.dao.records import Student
+from src.services import bulk_import
+from src.services.bulk_import import ImportReport
 from src.services.event_services import EventService, EventError
 from src.services.mentorship_services import MentorshipServices, MentorshipError
+from src.services.record_batch import RecordBatch
+from src.services.replica import writes
+from src.tracing import traced_service
 
 
 class StudentError(Exception):
     """Custom exception for Student service errors."""
     pass
 
+# students.email is unique (migration 003), so a duplicate comes back as a unique violation
+UNIQUE_VIOLATION = "23505"
 
+
+@traced_service
 class StudentService:
     def __init__(self):
         self.dao = StudentsDAO()
@@ -19,59 +31,76 @@ class StudentService:
 
     # --- Student CRUD ---
     def create_student(self, name: str, email: str, course: str = None, year: int = None) -> Dict:
-        existing = self.dao.get_student_by_email(email)
-        if existing:
-            raise StudentError(f"Student with email {email} already exists.")
-        return self.dao.create_student(name, email, course, year)
+        try:
+            return self.dao.create_student(name, email, course, year)
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise StudentError(f"Student with email {email} already exists.")
+            raise
+
+    def import_students(self, path: str, batch_size: int = bulk_import.DEFAULT_BATCH_SIZE,
+                        on_progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+        try:
+            records = bulk_import.read_records(path)
+            return bulk_import.run_import(
+                records, bulk_import.validate_student, self.dao.find_existing_emails,
+                self.dao.create_many, batch_size, on_progress,
+            )
+        except (OSError, ValueError) as e:
+            raise StudentError(f"Import failed: {e}")
 
     def get_student(self, student_id: int) -> Optional[Dict]:
         return self.dao.get_student_by_id(student_id)
 
-    def list_students(self, filters: Dict = None) -> List[Dict]:
-        students = self.dao.list_students()
-        if filters:
-            filtered = []
-            for s in students:
-                match = True
-                for k, v in filters.items():
-                    if str(s.get(k)).lower() != str(v).lower():
-                        match = False
-                        break
-                if match:
-                    filtered.append(s)
-            return filtered
-        return students
+    # batch=True packs the rows column-wise, reading the backend page by page
+    def list_students(self, filters: FilterLike = None, batch: bool = False) -> Union[List[Student], RecordBatch]:
+        if batch:
+            return RecordBatch.from_rows(Student, self.dao.iter_students(filters, prefetch=True))
+        return self.dao.list_students(filters)
+
+    def iter_students(self, filters: FilterLike = None, page_size: int = 1000, prefetch: bool = True) -> Iterator[Dict]:
+        return self.dao.iter_students(filters, page_size=page_size, prefetch=prefetch)
 
     def update_student(self, student_id: int, fields: Dict) -> Optional[Dict]:
-        student = self.dao.get_student_by_id(student_id)
+        try:
+            student = self.dao.update_student(student_id, fields)
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise StudentError(f"Student with email {fields.get('email')} already exists.")
+            raise
         if not student:
             raise StudentError(f"Student ID {student_id} does not exist.")
-        return self.dao.update_student(student_id, fields)
+        return student
 
+    # a trigger cancels the student's registrations, which moves event counters
+    @writes("events")
     def delete_student(self, student_id: int) -> Optional[Dict]:
-        student = self.dao.get_student_by_id(student_id)
+        student = self.dao.delete_student(student_id)
         if not student:
             raise StudentError(f"Student ID {student_id} does not exist.")
-        return self.dao.delete_student(student_id)
+        return student
 
     # --- Event-related functions ---
-    def search_events(self, filters: Dict = None) -> List[Dict]:
+    def search_events(self, filters: FilterLike = None) -> List[Dict]:
         try:
             return self.event_service.list_events(filters)
         except EventError as e:
             raise StudentError(f"Event search failed: {e}")
 
+    # Take a seat (or a waitlist slot when the event is full) in one request
     def join_event(self, student_id: int, event_id: int) -> Dict:
         try:
-            # Ensure event exists
-            self.event_service.get_event(event_id)
-            registration = self.reg_dao.register_user(event_id, student_id, "student")
-            if not registration:
-                raise StudentError(f"Student {student_id} could not join event {event_id}.")
-            return registration
+            return self.event_service.register(event_id, student_id, "student")
         except EventError as e:
             raise StudentError(f"Join event failed: {e}")
 
+    # Cancel a registration; returns the cancelled row and anyone promoted off the waitlist
+    def leave_event(self, student_id: int, event_id: int) -> Dict:
+        try:
+            return self.event_service.cancel_registration(event_id, student_id, "student")
+        except EventError as e:
+            raise StudentError(f"Leave event failed: {e}")
+
     def list_my_events(self, student_id: int) -> List[Dict]:
         try:
             return self.reg_dao.list_user_events(student_id, "student") or []
@@ -85,6 +114,9 @@ class StudentService:
         except MentorshipError as e:
             raise StudentError(f"Could not list mentors: {e}")
 
+    def iter_all_mentors(self, page_size: int = 1000) -> Iterator[Dict]:
+        return self.mentorship_service.iter_mentors(page_size=page_size)
+
     def join_mentorship(
         self,
         student_id: int,
@@ -110,8 +142,19 @@ class StudentService:
         except MentorshipError as e:
             raise StudentError(f"Failed to join mentorship: {e}")
 
+    def recommend_mentors(self, student_id: int, k: int = 5) -> List[Dict]:
+        """Best-matching mentors for the student's course and year, skipping current mentors."""
+        student = self.dao.get_student_by_id(student_id)
+        if not student:
+            raise StudentError(f"Student with ID {student_id} not found")
+        try:
+            current = [a["mentor_id"] for a in self.mentorship_service.list_mentors_by_student(student_id)]
+            return self.mentorship_service.rank_mentors(student.get("course"), student.get("year"), k, current)
+        except MentorshipError as e:
+            raise StudentError(f"Could not recommend mentors: {e}")
+
     def list_my_mentors(self, student_id: int) -> List[Dict]:
         try:
-            return self.mentorship_service.list_mentors_by_student(student_id)
+            return self.mentorship_service.list_mentor_views_by_student(student_id)
         except MentorshipError as e:
             raise StudentError(f"Cannot list mentors: {e}")
@@ -0,0 +1,256 @@
+# src/tracing.py
+"""Per-query tracing for backend calls.
+
+``config.get_client()`` hands the DAOs a ``TracedClient``. While the tracer is disabled
+it returns the real query builders untouched; once enabled every ``execute()`` becomes a
+span recording table, operation, filters, latency, rows and response size. Spans are
+grouped under the outermost service method that issued them (``@traced_service``).
+
+The response size is the body bytes httpx received (compressed, as on the wire), taken
+from the response that ``note_response`` saw. The SQLite backend sends nothing over the
+wire, so its spans have ``response_bytes`` None.
+
+    tracer = get_tracer()
+    tracer.enable()
+    AlumniService().join_event(1, 2)
+    print(tracer.report())
+"""
+import contextvars
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+MAX_SPANS = 50000
+
+_current_method: contextvars.ContextVar = contextvars.ContextVar("service_method", default=None)
+# last HTTP response of the execute() running in this context
+_last_response: contextvars.ContextVar = contextvars.ContextVar("http_response", default=None)
+
+_ACTIONS = {"select", "insert", "update", "delete", "upsert", "rpc"}
+_IGNORED = {"execute"}
+
+
+class Tracer:
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._spans = deque(maxlen=max_spans)
+        self._calls = deque(maxlen=max_spans)
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self._calls.clear()
+
+    def record_span(self, span: Dict):
+        with self._lock:
+            self._spans.append(span)
+
+    def record_call(self, method: str, duration_ms: float, error: Optional[str]):
+        with self._lock:
+            self._calls.append({"method": method, "duration_ms": duration_ms, "error": error})
+
+    def spans(self) -> List[Dict]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> List[Dict]:
+        """One row per service method: calls, queries, backend time and wall time."""
+        with self._lock:
+            spans, calls = list(self._spans), list(self._calls)
+        groups: Dict[str, Dict[str, Any]] = {}
+        for call in calls:
+            g = groups.setdefault(call["method"], {"method": call["method"], "calls": 0, "queries": 0,
+                                                   "db_ms": 0.0, "wall_ms": 0.0, "rows": 0, "bytes": None})
+            g["calls"] += 1
+            g["wall_ms"] += call["duration_ms"]
+        for span in spans:
+            method = span["service_method"] or "(no service)"
+            g = groups.setdefault(method, {"method": method, "calls": 0, "queries": 0,
+                                           "db_ms": 0.0, "wall_ms": 0.0, "rows": 0, "bytes": None})
+            g["queries"] += 1
+            g["db_ms"] += span["latency_ms"]
+            g["rows"] += span["rows"]
+            if span["response_bytes"] is not None:
+                g["bytes"] = (g["bytes"] or 0) + span["response_bytes"]
+        rows = sorted(groups.values(), key=lambda g: g["db_ms"], reverse=True)
+        for g in rows:
+            g["db_ms"] = round(g["db_ms"], 3)
+            g["wall_ms"] = round(g["wall_ms"], 3)
+            g["queries_per_call"] = round(g["queries"] / g["calls"], 2) if g["calls"] else None
+        return rows
+
+    def report(self) -> str:
+        lines = [f"{'service method':42} {'calls':>5} {'queries':>7} {'q/call':>6} {'db ms':>9} {'rows':>7} {'bytes':>9}"]
+        for g in self.summary():
+            qpc = "-" if g["queries_per_call"] is None else f"{g['queries_per_call']:.2f}"
+            size = "-" if g["bytes"] is None else g["bytes"]
+            lines.append(f"{g['method'][:42]:42} {g['calls']:>5} {g['queries']:>7} {qpc:>6} "
+                         f"{g['db_ms']:>9.2f} {g['rows']:>7} {size:>9}")
+        return "\n".join(lines)
+
+    def dump_jsonl(self, path: str) -> int:
+        spans = self.spans()
+        with open(path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span, default=str) + "\n")
+        return len(spans)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def note_response(response):
+    """httpx response hook (see config.ClientRegistry): keep the response for its span."""
+    if _tracer.enabled:
+        _last_response.set(response)
+
+
+def traced_service(cls):
+    """Class decorator: group the spans of every public method under ``Class.method``."""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not callable(attr):
+            continue
+        setattr(cls, name, _traced_method(f"{cls.__name__}.{name}", attr))
+    return cls
+
+
+def _traced_method(label: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # nested service calls stay attributed to the outermost method
+        if not _tracer.enabled or _current_method.get() is not None:
+            return fn(*args, **kwargs)
+        token = _current_method.set(label)
+        start = time.perf_counter()
+        error = None
+        result = None
+        try:
+            result = fn(*args, **kwargs)
+            return _traced_steps(label, result, start) if inspect.isgenerator(result) else result
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            _current_method.reset(token)
+            if not inspect.isgenerator(result):
+                _tracer.record_call(label, (time.perf_counter() - start) * 1000, error)
+    return wrapper
+
+
+def _traced_steps(label: str, gen, start: float):
+    # iter_* methods run lazily, so attribute each step of the generator as well
+    error = None
+    try:
+        while True:
+            token = _current_method.set(label)
+            try:
+                item = next(gen)
+            except StopIteration:
+                return
+            finally:
+                _current_method.reset(token)
+            yield item
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        gen.close()
+        _tracer.record_call(label, (time.perf_counter() - start) * 1000, error)
+
+
+def _describe(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set)) and len(value) > 10:
+        return f"<{len(value)} values>"
+    return value
+
+
+class TracedQuery:
+    """Wraps a query builder, remembering how it was built until execute()."""
+
+    def __init__(self, builder, table: str, operation: str = "select"):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+        self._filters: List[str] = []
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        if not callable(attr) or name in _IGNORED:
+            return attr
+
+        def call(*args, **kwargs):
+            if name in _ACTIONS:
+                self._operation = name
+            else:
+                rendered = ", ".join([repr(_describe(a)) for a in args] +
+                                     [f"{k}={_describe(v)!r}" for k, v in kwargs.items()])
+                self._filters.append(f"{name}({rendered})")
+            self._builder = attr(*args, **kwargs)
+            return self
+        return call
+
+    def execute(self):
+        start = time.perf_counter()
+        error = None
+        resp = None
+        response_token = _last_response.set(None)
+        try:
+            resp = self._builder.execute()
+            return resp
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            latency = (time.perf_counter() - start) * 1000
+            data = getattr(resp, "data", None)
+            rows = len(data) if isinstance(data, list) else (1 if data else 0)
+            http_response = _last_response.get()
+            _last_response.reset(response_token)
+            _tracer.record_span({
+                "ts": time.time(),
+                "service_method": _current_method.get(),
+                "table": self._table,
+                "operation": self._operation,
+                "filters": self._filters,
+                "latency_ms": round(latency, 3),
+                "rows": rows,
+                "response_bytes": http_response.num_bytes_downloaded if http_response is not None else None,
+                "error": error,
+            })
+
+
+class TracedClient:
+    """Backend client proxy; builders are only wrapped while tracing is enabled."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, table_name: str):
+        builder = self._client.table(table_name)
+        return TracedQuery(builder, table_name) if _tracer.enabled else builder
+
+    def from_(self, table_name: str):
+        return self.table(table_name)
+
+    # stored functions are recorded under their function name
+    def rpc(self, fn: str, params=None):
+        builder = self._client.rpc(fn, params)
+        return TracedQuery(builder, fn, "rpc") if _tracer.enabled else builder
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
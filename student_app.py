@@ -1,12 +1,47 @@
+import asyncio
 import streamlit as st
+from src.client.profile_panel import render_profile_panel, start_profile_panel
+from src.services.async_services import AsyncStudentService
 from src.services.student_services import StudentService, StudentError
 from src.services.event_services import EventService, EventError
 
 st.set_page_config(page_title="Student Portal", page_icon="🎓")
 st.title("🎓 Student Dashboard")
 
-student_service = StudentService()
-event_service = EventService()
+# Services are built once per process; list results are cached briefly and cleared
+# by the form whose write changes them.
+LIST_TTL_SECONDS = 30
+
+
+@st.cache_resource
+def get_services():
+    student = StudentService()
+    return student, EventService(), AsyncStudentService(student)
+
+
+student_service, event_service, async_student_service = get_services()
+profiling = start_profile_panel()
+
+
+@st.cache_data(ttl=LIST_TTL_SECONDS, show_spinner=False)
+def load_events():
+    return event_service.list_events()
+
+
+@st.cache_data(ttl=LIST_TTL_SECONDS, show_spinner=False)
+def load_my_events(student_id: int):
+    return student_service.list_my_events(student_id)
+
+
+@st.cache_data(ttl=LIST_TTL_SECONDS, show_spinner=False)
+def load_my_mentors(student_id: int):
+    return student_service.list_my_mentors(student_id)
+
+
+@st.cache_data(ttl=LIST_TTL_SECONDS, show_spinner=False)
+def load_recommended_mentors(student_id: int):
+    return student_service.recommend_mentors(student_id, k=5)
+
 
 tabs = st.tabs([
     "Register Student",
@@ -35,17 +70,29 @@ with tabs[0]:
 with tabs[1]:
     st.subheader("Browse and Join Events")
     try:
-        events = event_service.list_events()
+        events = load_events()
         if events:
             for e in events:
                 with st.expander(f"{e['event_name']} — {e['event_date']}"):
                     st.write(e["description"])
                     st.write(f"📍 {e['location']}")
+                    st.write(f"👥 {e['alumni_count']} alumni and {e['student_count']} students registered")
+                    if e.get("capacity") is not None:
+                        st.write(f"🎟️ {e['seats_taken']}/{e['capacity']} seats taken, {e['waitlist_size']} on the waitlist")
                     student_id = st.number_input("Your Student ID", min_value=1, step=1, key=f"join_{e['event_id']}")
                     if st.button(f"Join Event {e['event_id']}", key=f"btn_{e['event_id']}"):
                         try:
                             result = student_service.join_event(student_id, e['event_id'])
-                            st.success("Joined successfully!")
+                            load_my_events.clear()
+                            load_events.clear()
+                            if not result.get("created"):
+                                st.info(f"You are already {result['status']} for this event.")
+                            elif result["status"] == "pending":
+                                st.success("Sign-up received, your seat is confirmed shortly.")
+                            elif result["status"] == "waitlisted":
+                                st.warning("The event is full, you are on the waitlist.")
+                            else:
+                                st.success("Joined successfully!")
                         except StudentError as e:
                             st.error(f"Error: {e}")
         else:
@@ -57,10 +104,25 @@ with tabs[1]:
 with tabs[2]:
     st.subheader("Join Mentorship Program")
     student_id = st.number_input("Your Student ID", min_value=1, step=1, key="join_mentorship_sid")
-    mentor_id = st.number_input("Mentor ID", min_value=1, step=1, key="join_mentorship_mid")
+    try:
+        suggestions = load_recommended_mentors(student_id)
+    except StudentError:
+        suggestions = []
+    mentor_id = None
+    if suggestions:
+        st.caption("Recommended for your course and year")
+        st.table([{k: m[k] for k in ("mentor_id", "name", "industry", "skills", "score")} for m in suggestions])
+        options = {f"{m['mentor_id']} - {m['name'] or 'Mentor'} ({', '.join(m['matched'])})": m["mentor_id"]
+                   for m in suggestions}
+        options["Other (enter ID)"] = None
+        mentor_id = options[st.selectbox("Mentor", list(options), key="join_mentorship_pick")]
+    if mentor_id is None:
+        mentor_id = st.number_input("Mentor ID", min_value=1, step=1, key="join_mentorship_mid")
     if st.button("Join Mentorship"):
         try:
-            data = student_service.join_mentorship(student_id, mentor_id)
+            data = asyncio.run(async_student_service.join_mentorship(student_id, mentor_id))
+            load_my_mentors.clear()
+            load_recommended_mentors.clear()
             st.success("Mentorship joined successfully!")
         except StudentError as e:
             st.error(f"Error: {e}")
@@ -71,9 +133,13 @@ with tabs[3]:
     student_id = st.number_input("Enter Student ID", min_value=1, step=1, key="mentor_list")
     if st.button("Show Mentors"):
         try:
-            mentors = student_service.get_student_mentors(student_id)
+            mentors = load_my_mentors(student_id)
             if mentors:
-                st.table(mentors)
+                st.table([
+                    {k: m[k] for k in ("mentor_id", "mentor_name", "mentor_email", "mentor_industry",
+                                       "mentor_skills", "start_date", "end_date", "active")}
+                    for m in mentors
+                ])
             else:
                 st.info("No mentors assigned yet.")
         except StudentError as e:
@@ -85,10 +151,12 @@ with tabs[4]:
     student_id = st.number_input("Enter Student ID", min_value=1, step=1, key="event_list")
     if st.button("Show My Events"):
         try:
-            events = student_service.list_my_events(student_id)
+            events = load_my_events(student_id)
             if events:
                 st.table(events)
             else:
                 st.info("No events joined yet.")
         except StudentError as e:
             st.error(f"Error: {e}")
+
+render_profile_panel(profiling)